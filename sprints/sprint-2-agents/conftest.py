@@ -0,0 +1,48 @@
+"""
+Test setup for every agent in the sprint (run pytest from this directory).
+
+Each agent imports its own modules as top-level names, as it does when run
+from its directory, and several agents have a top-level "tools". Before a
+tests/ directory's modules are imported, its agent goes first on sys.path and
+any "tools" imported from a sibling agent is dropped.
+"""
+
+import os
+import sys
+from typing import Optional
+
+SPRINT_DIR = os.path.dirname(os.path.abspath(__file__))
+# The agents import the shared helpers as the "shared" package from the sprint root
+if SPRINT_DIR not in sys.path:
+    sys.path.append(SPRINT_DIR)
+
+
+def _provides_tools(entry: str) -> bool:
+    return os.path.exists(os.path.join(entry, "tools.py")) or os.path.isdir(os.path.join(entry, "tools"))
+
+
+def _locations(module) -> list:
+    """Directories a module or package was imported from"""
+    if hasattr(module, "__path__"):
+        return [os.path.dirname(os.path.abspath(path)) for path in module.__path__]
+    return [os.path.dirname(os.path.abspath(module.__file__))]
+
+
+def _agent_dir(path) -> Optional[str]:
+    """The agent directory whose tests/ directory holds `path`"""
+    for parent in [path, *path.parents]:
+        if parent.name == "tests":
+            return str(parent.parent)
+    return None
+
+
+def pytest_collectstart(collector):
+    agent_dir = _agent_dir(collector.path) if getattr(collector, "path", None) else None
+    if agent_dir is None or not _provides_tools(agent_dir):
+        return
+    sys.path[:] = [entry for entry in sys.path if not (entry and _provides_tools(os.path.abspath(entry)))]
+    sys.path.insert(0, agent_dir)
+    loaded = sys.modules.get("tools")
+    if loaded is not None and agent_dir not in _locations(loaded):
+        for name in [name for name in sys.modules if name == "tools" or name.startswith("tools.")]:
+            del sys.modules[name]
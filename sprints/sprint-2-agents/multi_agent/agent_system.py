@@ -3,29 +3,72 @@ Agent System for Multi-Agent System
 Manages the coordination and interaction between all agents
 """
 
+import copy
+import time
 import asyncio
 from autogen_agentchat.teams import RoundRobinGroupChat
 
+from shared.rate_limiter import RateLimitedChatClient
+from model_tiers import ModelTierConfig, UsageMeter, MeteredChatClient
+from console_output import ConsoleEventPrinter
+from budget import ProjectBudget
+
 from agents.planner import PlannerAgent
 from agents.executor import ExecutorAgent
 from agents.critic import CriticAgent
 from agents.summariser import SummariserAgent
 
+# Workflow names accepted by stream_workflow, mapped to the coroutines implementing them
+WORKFLOWS = {
+    "complete_pipeline": "_complete_pipeline",
+    "collaborative": "_collaborative_workflow",
+    "iterative": "_iterative_improvement",
+    "speculative_pipeline": "_speculative_pipeline"
+}
+
+# Tool listings echoed back by agents that are not worth reporting as messages
+SKIPPED_MESSAGE_PREFIXES = ('[Function', 'Pending tasks:', 'Completed tasks:')
+
 class FourAgentSystem:
     """Complete four-agent system: Planner, Executor, Critic, Summariser"""
     
-    def __init__(self, model_client, memory, tools):
-        """Initialize the agent system with model client, memory, and tools"""
+    def __init__(self, model_client, memory, tools, rate_limiter=None, tier_config=None, model_clients=None, budget=None):
+        """Initialize the agent system with model client, memory, tools, an optional shared rate limiter,
+        an optional per-role model tier config (with one client per model name in model_clients)
+        and an optional default ProjectBudget for every project"""
         self.memory = memory
+        self.default_budget = budget
+        self.budget = None
+        self.rate_limiter = rate_limiter
+        self.tier_config = tier_config or ModelTierConfig()
+        self.model_clients = model_clients or {}
+        self.usage_meter = UsageMeter()
+        self._event_queue = None
+        self._workflow_name = None
         self.setup_agents(model_client, tools)
     
+    def _client_for(self, role: str, model: str, default_client):
+        """Metered (and rate limited) client for a role"""
+        client = self.model_clients.get(model, default_client)
+        client = MeteredChatClient(client, self.usage_meter, role, model)
+        # Every agent goes through the same limiter so concurrent phases share one budget
+        if self.rate_limiter is not None:
+            client = RateLimitedChatClient(client, self.rate_limiter)
+        return client
+    
     def setup_agents(self, model_client, tools):
         """Create all four specialized agents"""
+        tiers = self.tier_config
+        executor_tools = [tools["get_pending_tasks_tool"], tools["complete_task_tool"], tools["get_stats_tool"]]
+        
         # Create agent instances
-        planner_agent = PlannerAgent(model_client, [tools["create_task_tool"], tools["get_stats_tool"]])
-        executor_agent = ExecutorAgent(model_client, [tools["get_pending_tasks_tool"], tools["complete_task_tool"], tools["get_stats_tool"]])
-        critic_agent = CriticAgent(model_client, [tools["get_completed_tasks_tool"], tools["review_task_tool"], tools["get_stats_tool"]])
-        summariser_agent = SummariserAgent(model_client, [
+        planner_tools = [tools["create_task_tool"], tools["get_stats_tool"]]
+        planner_tools += [tools[name] for name in ["revise_task_tool", "cancel_task_tool"] if name in tools]
+        self._executor_client = self._client_for("Executor", tiers.model_for("Executor"), model_client)
+        planner_agent = PlannerAgent(self._client_for("Planner", tiers.model_for("Planner"), model_client), planner_tools)
+        executor_agent = ExecutorAgent(self._executor_client, executor_tools)
+        critic_agent = CriticAgent(self._client_for("Critic", tiers.model_for("Critic"), model_client), [tools["get_completed_tasks_tool"], tools["review_task_tool"], tools["get_stats_tool"]])
+        summariser_agent = SummariserAgent(self._client_for("Summariser", tiers.model_for("Summariser"), model_client), [
             tools["get_reviewed_tasks_tool"], 
             tools["create_summary_tool"], 
             tools["generate_insight_tool"], 
@@ -38,17 +81,185 @@ class FourAgentSystem:
         self.executor = executor_agent.get_agent()
         self.critic = critic_agent.get_agent()
         self.summariser = summariser_agent.get_agent()
+        
+        # Stronger Executor for tasks the Critic scores below the escalation threshold
+        self.escalation_executor = None
+        if tiers.escalation_model:
+            self.escalation_executor = ExecutorAgent(
+                self._client_for("Executor", tiers.escalation_model, model_client),
+                executor_tools
+            ).get_agent()
     
-    async def run_complete_pipeline(self, goal: str):
-        """Complete 4-agent pipeline: Planner → Executor → Critic → Summariser"""
-        print(f"\n{'='*70}")
-        print(f"🎯 GOAL: {goal}")
-        print(f"🏗️ WORKFLOW: Complete Pipeline (4 agents)")
-        print(f"{'='*70}")
+    async def stream_workflow(self, workflow: str, goal: str, budget=None, **options):
+        """Run a workflow and yield its structured events as they happen
+        
+        Events are dicts with a "type" (workflow_start, project_started, phase_start,
+        agent_message, tool_call, tool_result, task_state, phase_end, cycle_start, budget,
+        metrics, results, workflow_end, workflow_error) plus timestamp, workflow and
+        project_id fields. `budget` (a ProjectBudget) overrides the system's default budget.
+        """
+        if workflow not in WORKFLOWS:
+            raise ValueError(f"Unknown workflow '{workflow}' (expected one of {list(WORKFLOWS)})")
+        
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        finished = object()
+        self._event_queue = queue
+        self._workflow_name = workflow
+        # Copy so enforcement actions from one project never leak into the next
+        budget = budget or self.default_budget
+        self.budget = ProjectBudget.from_dict(budget.to_dict()) if budget else None
+        
+        # Task changes happen in tool threads, so hand them to the loop thread-safely
+        def on_task_event(event, task):
+            if task.get("project_id") == self.memory.current_project_id:
+                loop.call_soon_threadsafe(
+                    self._emit, "task_state",
+                    task_id=task["id"], state=event, status=task["status"], description=task["description"]
+                )
         
+        async def run():
+            started = time.monotonic()
+            try:
+                await getattr(self, WORKFLOWS[workflow])(goal, **options)
+                self._emit("workflow_end", goal=goal, duration_seconds=round(time.monotonic() - started, 2))
+            except Exception as e:
+                self._emit("workflow_error", goal=goal, error=f"{type(e).__name__}: {e}")
+                raise
+            finally:
+                queue.put_nowait(finished)
+        
+        self.memory.add_task_listener(on_task_event)
+        runner = asyncio.create_task(run())
+        try:
+            while True:
+                event = await queue.get()
+                if event is finished:
+                    break
+                yield event
+            # Re-raise workflow errors to the consumer
+            await runner
+        finally:
+            self.memory.remove_task_listener(on_task_event)
+            if not runner.done():
+                runner.cancel()
+            self._event_queue = None
+    
+    async def run_workflow(self, workflow: str, goal: str, on_event=None, budget=None, **options):
+        """Run a workflow, passing each event to on_event (console output by default); returns the project id"""
+        on_event = on_event or ConsoleEventPrinter()
+        project_id = None
+        async for event in self.stream_workflow(workflow, goal, budget=budget, **options):
+            if event["type"] == "project_started":
+                project_id = event["project_id"]
+            on_event(event)
+        return project_id
+    
+    async def run_complete_pipeline(self, goal: str, on_event=None):
+        """Complete 4-agent pipeline: Planner → Executor → Critic → Summariser"""
+        return await self.run_workflow("complete_pipeline", goal, on_event)
+    
+    async def run_collaborative_workflow(self, goal: str, on_event=None):
+        """All four agents working together in a structured sequence"""
+        return await self.run_workflow("collaborative", goal, on_event)
+    
+    async def run_iterative_improvement(self, goal: str, on_event=None):
+        """Iterative workflow with multiple improvement cycles"""
+        return await self.run_workflow("iterative", goal, on_event)
+    
+    async def run_speculative_pipeline(self, goal: str, on_event=None, max_workers: int = 3):
+        """Pipeline where Executor workers start on each task as soon as the Planner creates it"""
+        return await self.run_workflow("speculative_pipeline", goal, on_event, max_workers=max_workers)
+    
+    def _emit(self, event_type: str, **fields):
+        """Publish an event to the active stream (no-op outside stream_workflow)"""
+        if self._event_queue is None:
+            return
+        self._event_queue.put_nowait({
+            "type": event_type,
+            "timestamp": time.time(),
+            "workflow": self._workflow_name,
+            "project_id": self.memory.current_project_id,
+            **fields
+        })
+    
+    def _start_project(self, goal: str, workflow_type: str):
+        """Start project tracking and reset per-project model usage"""
+        self.usage_meter.reset()
+        self._emit("workflow_start", goal=goal, project_id=None)
+        if self.budget is not None:
+            self.budget.start()
+        project = self.memory.start_project(goal, workflow_type, budget=self.budget.to_dict() if self.budget else None)
+        self._emit("project_started", goal=goal)
+        return project
+    
+    def _budget_action(self, message: str):
+        """Record and publish a budget enforcement decision"""
+        self.budget.record_action(message)
+        self._emit("budget", message=message, remaining_fraction=round(self.budget.remaining_fraction(self.usage_meter), 3))
+    
+    def _budget_allows(self, phase_name: str, optional: bool = False) -> bool:
+        """Whether a phase may start: nothing runs once the budget is exhausted, optional phases stop when it is low"""
+        if self.budget is None:
+            return True
+        if self.budget.is_exhausted(self.usage_meter):
+            self._budget_action(f"Skipped {phase_name}: budget exhausted")
+            return False
+        if optional and self.budget.is_low(self.usage_meter):
+            self._budget_action(f"Skipped optional {phase_name}: budget low")
+            return False
+        return True
+    
+    def _summary_task(self, instructions: str) -> str:
+        """Summariser instructions, restricted to the executive summary when the budget is low"""
+        if self.budget is not None and self.budget.is_low(self.usage_meter):
+            self._budget_action("Limited summaries to the Executive summary: budget low")
+            return f"{instructions}\n\nThe project budget is nearly spent: create ONLY the Executive summary and skip Technical and Quality summaries."
+        return instructions
+    
+    async def _run_escalation(self, goal: str):
+        """Re-execute low-scoring tasks on the escalation model and review them again"""
+        if self.escalation_executor is None or not self._budget_allows("ESCALATION", optional=True):
+            return
+        threshold = self.tier_config.escalation_threshold
+        escalated_total = 0
+        for round_number in range(1, self.tier_config.max_escalation_rounds + 1):
+            low_scores = [t for t in self.memory.get_reviewed_tasks() if t["review_score"] is not None and t["review_score"] < threshold]
+            if not low_scores:
+                break
+            for task in low_scores:
+                self.memory.reopen_task(task["id"], f"Score {task['review_score']} below escalation threshold {threshold}")
+            escalated_total += len(low_scores)
+            
+            await self._run_agent_phase(
+                self.escalation_executor, 
+                f"Re-execute all pending tasks for goal: {goal}. Earlier attempts scored below {threshold}/100, so deliver substantially more complete and rigorous results", 
+                f"ESCALATED EXECUTION ({self.tier_config.escalation_model}, ROUND {round_number})", 
+                "🚀", 
+                optional=True
+            )
+            await self._run_agent_phase(
+                self.critic, 
+                "Review all completed tasks that were re-executed after escalation with detailed scoring and feedback", 
+                f"ESCALATED REVIEW (ROUND {round_number})", 
+                "🔍"
+            )
+        self.memory.update_project_metrics({"tasks_escalated": escalated_total})
+    
+    def _record_model_usage(self, project_id: str):
+        """Store per-role cost/latency and savings versus a single-model run in project metrics"""
+        metrics = {"model_usage": self.usage_meter.report(self.tier_config.baseline_model)}
+        if self.budget is not None:
+            metrics["budget"] = self.budget.report(self.usage_meter)
+        self.memory.update_project_metrics(metrics, project_id)
+        project_data = self.memory.get_project_data(project_id)
+        if project_data:
+            self._emit("metrics", metrics=copy.deepcopy(project_data["project"].get("metrics", {})))
+    
+    async def _complete_pipeline(self, goal: str):
+        """Complete 4-agent pipeline: Planner → Executor → Critic → Summariser"""
         # Start project tracking
-        project = self.memory.start_project(goal, "complete_pipeline")
-        print(f"📂 Started project: {project['id']}")
+        project = self._start_project(goal, "complete_pipeline")
         
         # Phase 1: Strategic Planning
         await self._run_agent_phase(
@@ -74,150 +285,211 @@ class FourAgentSystem:
             "🔍"
         )
         
+        # Escalate low-scoring work to the stronger Executor model
+        await self._run_escalation(goal)
+        
         # Phase 4: Synthesis & Reporting
         await self._run_agent_phase(
             self.summariser, 
-            "Create comprehensive project summary with executive insights and strategic recommendations", 
+            self._summary_task("Create comprehensive project summary with executive insights and strategic recommendations"), 
             "SYNTHESIS & REPORTING", 
             "📊"
         )
         
         # Show complete results
-        self._show_complete_results(project["id"])
+        self._record_model_usage(project["id"])
+        self._emit_results(project["id"])
     
-    async def run_collaborative_workflow(self, goal: str):
-        """All four agents working together in a structured sequence"""
-        print(f"\n{'='*70}")
-        print(f"🎯 GOAL: {goal}")
-        print(f"🤝 WORKFLOW: Collaborative (Structured Sequence)")
-        print(f"{'='*70}")
+    def _speculative_executor(self, task: dict):
+        """Fresh Executor bound to one task version so stale results are discarded"""
+        memory = self.memory
+        version = task.get("version", 0)
+        
+        def complete_task_tool(task_id: str, result: str) -> str:
+            """Tool for Executor to complete tasks"""
+            if task_id != task["id"]:
+                return f"❌ Only task {task['id']} can be completed by this worker"
+            if memory.complete_task(task_id, result, expected_version=version):
+                return f"✅ Completed task: {task_id}"
+            return f"❌ Discarded result for {task_id}: task was revised or cancelled"
+        
+        return ExecutorAgent(self._executor_client, [complete_task_tool]).get_agent()
+    
+    async def _speculative_pipeline(self, goal: str, max_workers: int = 3):
+        """Pipeline where Executor workers start on each task as soon as the Planner creates it"""
+        project = self._start_project(goal, "speculative_pipeline")
         
-        # Start project tracking
-        project = self.memory.start_project(goal, "collaborative")
+        # Task events arrive from tool threads, so hand them to the loop thread-safely
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
         
-        # Define agent emojis for consistent display
-        agent_emojis = {
-            "Planner": "📋", 
-            "Executor": "⚡", 
-            "Critic": "🔍", 
-            "Summariser": "📊"
-        }
+        def on_task_event(event, task):
+            if task.get("project_id") == project["id"] and event in ["created", "revised", "cancelled"]:
+                loop.call_soon_threadsafe(events.put_nowait, (event, task))
         
-        print(f"\n{agent_emojis['Planner']} PLANNING PHASE")
-        print("-" * 50)
+        workers = asyncio.Semaphore(max_workers)
+        in_flight = {}
+        stats = {"speculative_started": 0, "speculative_cancelled": 0, "speculative_failed": 0}
         
-        # STEP 1: Planner creates tasks
-        planner_task = f"Create 3-5 comprehensive tasks to achieve this goal: {goal}\n\nCreate tasks using create_task_tool and ensure they cover all aspects needed."
-        
-        # Use a single-agent chat for the Planner
-        planner_chat = RoundRobinGroupChat([self.planner])
-        planner_messages = []
-        
-        # Run the Planner phase
-        async for message in planner_chat.run_stream(task=planner_task):
-            if hasattr(message, 'content') and message.content:
-                content = message.content
-                if isinstance(content, list):
-                    content = str(content)
-                
-                if not content.startswith('[Function'):
-                    print(f"{agent_emojis['Planner']} Planner: {content}")
-                    planner_messages.append(content)
-                    
-                    # Break after a reasonable number of messages or when planning is complete
-                    if len(planner_messages) >= 5 or "Planning complete" in content:
-                        break
+        async def execute(task):
+            async with workers:
+                await self._run_agent_phase(
+                    self._speculative_executor(task), 
+                    f"Execute only this task with comprehensive, production-ready results, then call complete_task_tool with task_id {task['id']}:\n{task['description']}", 
+                    f"SPECULATIVE EXECUTION ({task['id']})", 
+                    "⚡"
+                )
         
-        # STEP 2: Executor executes tasks
-        print(f"\n{agent_emojis['Executor']} EXECUTION PHASE")
-        print("-" * 50)
+        stopped = []
         
-        executor_task = f"Execute all pending tasks for goal: {goal}\n\nUse get_pending_tasks_tool to see tasks and complete_task_tool to execute each one with comprehensive results."
+        def cancel_worker(task_id):
+            worker = in_flight.pop(task_id, None)
+            if worker and not worker.done():
+                worker.cancel()
+                stopped.append(worker)
+                stats["speculative_cancelled"] += 1
         
-        # Use a single-agent chat for the Executor
-        executor_chat = RoundRobinGroupChat([self.executor])
-        executor_messages = []
+        def reap(worker):
+            # A failed worker leaves its task pending for the catch-up execution below
+            if not worker.cancelled() and worker.exception() is not None:
+                stats["speculative_failed"] += 1
         
-        # Run the Executor phase
-        async for message in executor_chat.run_stream(task=executor_task):
-            if hasattr(message, 'content') and message.content:
-                content = message.content
-                if isinstance(content, list):
-                    content = str(content)
+        self.memory.add_task_listener(on_task_event)
+        planner = asyncio.create_task(self._run_agent_phase(
+            self.planner, 
+            f"Create a comprehensive plan to achieve: {goal}", 
+            "SPECULATIVE PLANNING", 
+            "📋"
+        ))
+        try:
+            while not (planner.done() and events.empty() and not in_flight):
+                next_event = asyncio.create_task(events.get())
+                # A finished planner would end every wait at once, so only wait on it while it runs
+                waiting = [next_event, *in_flight.values()] + ([] if planner.done() else [planner])
+                await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
                 
-                if not content.startswith('[Function'):
-                    print(f"{agent_emojis['Executor']} Executor: {content}")
-                    executor_messages.append(content)
-                    
-                    # Break after a reasonable number of messages or when execution is complete
-                    if len(executor_messages) >= 10 or "Execution complete" in content:
-                        break
+                if next_event.done():
+                    event, task = next_event.result()
+                    if event in ["revised", "cancelled"]:
+                        cancel_worker(task["id"])
+                    if event in ["created", "revised"]:
+                        in_flight[task["id"]] = asyncio.create_task(execute(task))
+                        stats["speculative_started"] += 1
+                else:
+                    next_event.cancel()
+                
+                for task_id, worker in list(in_flight.items()):
+                    if worker.done():
+                        del in_flight[task_id]
+                        reap(worker)
+            
+            # Surface planner errors
+            await planner
+        finally:
+            self.memory.remove_task_listener(on_task_event)
+            for task_id in list(in_flight):
+                cancel_worker(task_id)
+            if not planner.done():
+                planner.cancel()
+                await asyncio.gather(planner, return_exceptions=True)
+            # Let cancelled workers finish unwinding (and emit phase_end) and retrieve their errors
+            for outcome in await asyncio.gather(*stopped, return_exceptions=True):
+                if isinstance(outcome, Exception):
+                    stats["speculative_failed"] += 1
+        
+        self.memory.update_project_metrics(stats)
+        
+        # Pick up anything a worker failed to complete
+        if self.memory.get_pending_tasks():
+            await self._run_agent_phase(
+                self.executor, 
+                "Execute all pending tasks with comprehensive, production-ready results", 
+                "EXECUTION (REMAINING TASKS)", 
+                "⚡"
+            )
         
-        # STEP 3: Critic reviews tasks
-        print(f"\n{agent_emojis['Critic']} REVIEW PHASE")
-        print("-" * 50)
+        await self._run_agent_phase(
+            self.critic, 
+            "Conduct thorough quality review of all completed tasks with detailed scoring and feedback", 
+            "QUALITY ASSURANCE", 
+            "🔍"
+        )
         
-        critic_task = f"Review all completed tasks for goal: {goal}\n\nUse get_completed_tasks_tool to see completed tasks and review_task_tool to provide detailed feedback and scores (0-100) for each task."
+        # Escalate low-scoring work to the stronger Executor model
+        await self._run_escalation(goal)
         
-        # Use a single-agent chat for the Critic
-        critic_chat = RoundRobinGroupChat([self.critic])
-        critic_messages = []
+        await self._run_agent_phase(
+            self.summariser, 
+            self._summary_task("Create comprehensive project summary with executive insights and strategic recommendations"), 
+            "SYNTHESIS & REPORTING", 
+            "📊"
+        )
         
-        # Run the Critic phase
-        async for message in critic_chat.run_stream(task=critic_task):
-            if hasattr(message, 'content') and message.content:
-                content = message.content
-                if isinstance(content, list):
-                    content = str(content)
-                
-                if not content.startswith('[Function'):
-                    print(f"{agent_emojis['Critic']} Critic: {content}")
-                    critic_messages.append(content)
-                    
-                    # Break after a reasonable number of messages or when review is complete
-                    if len(critic_messages) >= 10 or "Review complete" in content:
-                        break
+        self._record_model_usage(project["id"])
+        self._emit_results(project["id"])
+    
+    async def _collaborative_workflow(self, goal: str):
+        """All four agents working together in a structured sequence"""
+        # Start project tracking
+        project = self._start_project(goal, "collaborative")
         
-        # STEP 4: Summariser creates summary
-        print(f"\n{agent_emojis['Summariser']} SUMMARY PHASE")
-        print("-" * 50)
+        # STEP 1: Planner creates tasks
+        await self._run_agent_phase(
+            self.planner, 
+            f"Create 3-5 comprehensive tasks to achieve this goal: {goal}\n\nCreate tasks using create_task_tool and ensure they cover all aspects needed.", 
+            "PLANNING", 
+            "📋", 
+            max_messages=5, 
+            stop_phrase="planning complete", 
+            record_conversation=False
+        )
         
-        summariser_task = f"Create a comprehensive summary for goal: {goal}\n\nUse get_reviewed_tasks_tool to see reviewed tasks and create_summary_tool to generate an executive summary with key insights."
+        # STEP 2: Executor executes tasks
+        await self._run_agent_phase(
+            self.executor, 
+            f"Execute all pending tasks for goal: {goal}\n\nUse get_pending_tasks_tool to see tasks and complete_task_tool to execute each one with comprehensive results.", 
+            "EXECUTION", 
+            "⚡", 
+            max_messages=10, 
+            stop_phrase="execution complete", 
+            record_conversation=False
+        )
         
-        # Use a single-agent chat for the Summariser
-        summariser_chat = RoundRobinGroupChat([self.summariser])
-        summariser_messages = []
+        # STEP 3: Critic reviews tasks
+        await self._run_agent_phase(
+            self.critic, 
+            f"Review all completed tasks for goal: {goal}\n\nUse get_completed_tasks_tool to see completed tasks and review_task_tool to provide detailed feedback and scores (0-100) for each task.", 
+            "REVIEW", 
+            "🔍", 
+            max_messages=10, 
+            stop_phrase="review complete", 
+            record_conversation=False
+        )
         
-        # Run the Summariser phase
-        async for message in summariser_chat.run_stream(task=summariser_task):
-            if hasattr(message, 'content') and message.content:
-                content = message.content
-                if isinstance(content, list):
-                    content = str(content)
-                
-                if not content.startswith('[Function'):
-                    print(f"{agent_emojis['Summariser']} Summariser: {content}")
-                    summariser_messages.append(content)
-                    
-                    # Break after a reasonable number of messages or when summary is complete
-                    if len(summariser_messages) >= 5 or "Summary complete" in content:
-                        break
+        # Escalate low-scoring work to the stronger Executor model
+        await self._run_escalation(goal)
+        
+        # STEP 4: Summariser creates summary
+        await self._run_agent_phase(
+            self.summariser, 
+            self._summary_task(f"Create a comprehensive summary for goal: {goal}\n\nUse get_reviewed_tasks_tool to see reviewed tasks and create_summary_tool to generate an executive summary with key insights."), 
+            "SUMMARY", 
+            "📊", 
+            max_messages=5, 
+            stop_phrase="summary complete", 
+            record_conversation=False
+        )
         
         # Complete project
         memory_summary = "Structured collaborative workflow completed with all four agents"
         self.memory.end_project(memory_summary)
-        self._show_complete_results(project['id'])
+        self._record_model_usage(project['id'])
+        self._emit_results(project['id'])
     
-    async def run_iterative_improvement(self, goal: str):
+    async def _iterative_improvement(self, goal: str):
         """Iterative workflow with multiple improvement cycles"""
-        print(f"\n{'='*70}")
-        print(f"🎯 GOAL: {goal}")
-        print(f"🏗️ WORKFLOW: Iterative Improvement")
-        print(f"{'='*70}")
-        
         # Start project tracking
-        project = self.memory.start_project(goal, "iterative")
-        print(f"📂 Started project: {project['id']}")
+        project = self._start_project(goal, "iterative")
         
         # Initial planning phase
         await self._run_agent_phase(
@@ -229,9 +501,12 @@ class FourAgentSystem:
         
         # Run 3 improvement cycles
         for cycle in range(1, 4):
-            print(f"\n{'='*70}")
-            print(f"🔄 IMPROVEMENT CYCLE {cycle}")
-            print(f"{'='*70}")
+            # Fewer cycles when the budget is running out
+            if cycle > 1 and self.budget is not None and self.budget.is_low(self.usage_meter):
+                self._budget_action(f"Reduced improvement cycles to {cycle - 1}: budget low")
+                break
+            
+            self._emit("cycle_start", cycle=cycle)
             
             # Execution phase
             await self._run_agent_phase(
@@ -256,100 +531,107 @@ class FourAgentSystem:
                     self.planner, 
                     f"Based on the critic's feedback, create improved tasks for cycle {cycle+1}", 
                     f"RE-PLANNING (CYCLE {cycle+1})", 
-                    "📋"
+                    "📋", 
+                    optional=True
                 )
         
+        # Escalate whatever is still below threshold after the last cycle
+        await self._run_escalation(goal)
+        
         # Final synthesis
         await self._run_agent_phase(
             self.summariser, 
-            "Create comprehensive project summary with insights from all improvement cycles", 
+            self._summary_task("Create comprehensive project summary with insights from all improvement cycles"), 
             "FINAL SYNTHESIS", 
             "📊"
         )
         
         # Show complete results
-        self._show_complete_results(project["id"])
+        self._record_model_usage(project["id"])
+        self._emit_results(project["id"])
     
-    async def _run_agent_phase(self, agent, task_description: str, phase_name: str, emoji: str):
+    async def _run_agent_phase(self, agent, task_description: str, phase_name: str, emoji: str,
+                               max_messages: int = 6, stop_phrase: str = "complete!", record_conversation: bool = True,
+                               optional: bool = False):
         """Run a single agent phase with enhanced monitoring"""
-        print(f"\n{emoji} {phase_name} PHASE")
-        print(f"{'-'*50}")
+        if not self._budget_allows(phase_name, optional):
+            return ""
+        
+        self._emit("phase_start", phase=phase_name, agent=agent.name, emoji=emoji)
+        started = time.monotonic()
         
         # Create a team with just this agent
         team = RoundRobinGroupChat([agent])
         
-        print(f"{agent.name} is working...")
         message_count = 0
         response = ""
         
-        # Run the agent using the team's run_stream method
-        async for message in team.run_stream(task=task_description):
-            if hasattr(message, 'content') and message.content:
-                content = message.content
-                if isinstance(content, list):
-                    content = str(content)
-                
-                if not content.startswith('[Function') and not content.startswith('Pending tasks:') and not content.startswith('Completed tasks:'):
-                    print(f"{emoji} {agent.name}: {content}")
-                    response = content
-                    message_count += 1
-                if "complete!" in content.lower() or message_count >= 6:
-                    break
-        
-        # Store the conversation
-        self.memory.add_conversation(agent.name, response)
-        print(f"{'-'*50}")
+        # phase_end is emitted even when the phase fails or is cancelled (e.g. a revised speculative task)
+        status, error = "failed", None
+        try:
+            # Run the agent using the team's run_stream method
+            async for message in team.run_stream(task=task_description):
+                if hasattr(message, 'content') and message.content:
+                    content = message.content
+                    if isinstance(content, list):
+                        self._emit_tool_events(agent.name, phase_name, content)
+                        content = str(content)
+                    
+                    if not content.startswith(SKIPPED_MESSAGE_PREFIXES):
+                        self._emit(
+                            "agent_message", 
+                            phase=phase_name, agent=agent.name, emoji=emoji, 
+                            source=getattr(message, 'source', agent.name), content=content
+                        )
+                        response = content
+                        message_count += 1
+                    if stop_phrase in content.lower() or message_count >= max_messages:
+                        break
+                    # Stop gracefully mid-phase once the budget is spent
+                    if self.budget is not None and self.budget.is_exhausted(self.usage_meter):
+                        self._budget_action(f"Stopped {phase_name} early: budget exhausted")
+                        break
+            
+            # Store the conversation
+            if record_conversation:
+                self.memory.add_conversation(agent.name, response)
+            status = "completed"
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._emit(
+                "phase_end", 
+                phase=phase_name, agent=agent.name, emoji=emoji, status=status, error=error, 
+                messages=message_count, duration_seconds=round(time.monotonic() - started, 2)
+            )
         
         return response
     
-    def _show_complete_results(self, project_id: str):
-        """Show comprehensive project results"""
+    def _emit_tool_events(self, agent_name: str, phase_name: str, items: list):
+        """Publish tool calls and tool results found in a message's content"""
+        for item in items:
+            if hasattr(item, 'arguments'):
+                self._emit(
+                    "tool_call", 
+                    phase=phase_name, agent=agent_name, 
+                    tool=item.name, arguments=item.arguments, call_id=getattr(item, 'id', None)
+                )
+            elif hasattr(item, 'call_id'):
+                self._emit(
+                    "tool_result", 
+                    phase=phase_name, agent=agent_name, 
+                    tool=getattr(item, 'name', None), call_id=item.call_id, 
+                    content=str(item.content), is_error=getattr(item, 'is_error', False)
+                )
+    
+    def _emit_results(self, project_id: str):
+        """Publish the complete project results"""
         project_data = self.memory.get_project_data(project_id)
-        if not project_data:
-            print("❌ Project data not found")
-            return
-        
-        project = project_data["project"]
-        tasks = project_data["tasks"]
-        reviews = project_data["reviews"]
-        summaries = project_data["summaries"]
-        
-        print(f"\n{'='*70}")
-        print(f"📊 PROJECT RESULTS: {project['goal']}")
-        print(f"{'='*70}")
-        
-        # Show tasks
-        print(f"\n📋 TASKS ({len(tasks)})")
-        print(f"{'-'*50}")
-        for task in tasks:
-            status_emoji = "✅" if task["status"] == "reviewed" else "🔄" if task["status"] == "completed" else "⏳"
-            print(f"{status_emoji} {task['description']}")
-            if task.get("review_score"):
-                print(f"   Score: {task['review_score']}/100")
-        
-        # Show summaries
-        if summaries:
-            print(f"\n📑 SUMMARIES ({len(summaries)})")
-            print(f"{'-'*50}")
-            for summary in summaries:
-                print(f"📄 {summary['type']} Summary:")
-                print(f"{summary['content'][:300]}...")
-                if summary.get("insights"):
-                    print(f"\nKey Insights:")
-                    for i, insight in enumerate(summary['insights'], 1):
-                        print(f"{i}. {insight}")
-        
-        # Show metrics
-        if project.get("metrics"):
-            metrics = project["metrics"]
-            print(f"\n📈 METRICS")
-            print(f"{'-'*50}")
-            print(f"Tasks Created: {metrics.get('tasks_created', 0)}")
-            print(f"Tasks Completed: {metrics.get('tasks_completed', 0)}")
-            print(f"Completion Rate: {metrics.get('completion_rate', 0):.1f}%")
-            print(f"Average Quality: {metrics.get('average_score', 0):.1f}/100")
-        
-        print(f"\n{'='*70}")
+        self._emit("results", project_data=copy.deepcopy(project_data))
     
     def show_enterprise_dashboard(self):
         """Show enterprise-level dashboard"""
@@ -393,4 +675,14 @@ class FourAgentSystem:
         print(f"Summaries: {activity['summaries']}")
         print(f"Insights: {activity['insights']}")
         
+        # Model call throttling
+        if self.rate_limiter is not None:
+            limiter_stats = self.rate_limiter.get_stats()
+            print(f"\n🚦 MODEL RATE LIMITER")
+            print(f"{'-'*50}")
+            print(f"Requests: {limiter_stats['requests']} ({limiter_stats['rate_limited']} rate limited)")
+            print(f"Queue Depth: {limiter_stats['queue_depth']} | In Flight: {limiter_stats['in_flight']}")
+            print(f"Average Wait: {limiter_stats['average_wait_seconds']:.2f}s | Max Wait: {limiter_stats['max_wait_seconds']:.2f}s")
+            print(f"Effective Limits: {limiter_stats['effective_requests_per_minute']} req/min, {limiter_stats['effective_tokens_per_minute']} tokens/min")
+        
         print(f"\n{'='*70}")
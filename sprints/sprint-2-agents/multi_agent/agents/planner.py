@@ -17,6 +17,8 @@ class PlannerAgent:
 
 Your tools:
 - create_task_tool: Create specific, actionable tasks
+- revise_task_tool: Rewrite a task you created if it needs correcting
+- cancel_task_tool: Cancel a task that turned out redundant
 - get_stats_tool: Check comprehensive system statistics
 
 When given a goal:
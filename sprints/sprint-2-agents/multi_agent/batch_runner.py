@@ -0,0 +1,199 @@
+"""
+Batch Runner for Multi-Agent System
+Runs many goals concurrently on a bounded pool of FourAgentSystem pipelines and streams results to JSONL
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Run as a script: the rate limiter lives in the sprint-level shared package
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+load_dotenv()
+
+from memory_manager import ComprehensiveMemory
+from tools import build_tools
+from agent_system import FourAgentSystem, WORKFLOWS
+from model_tiers import ModelTierConfig, build_model_clients
+from budget import ProjectBudget
+from shared.rate_limiter import get_shared_rate_limiter
+
+def load_goals(path: str, default_workflow: str = "complete_pipeline"):
+    """Read goals from a JSONL file ({"goal": ..., "workflow": ..., "budget": {...}}) or a text file ("workflow | goal" or "goal" per line)"""
+    jobs = []
+    with open(path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            budget = None
+            if line.startswith("{"):
+                entry = json.loads(line)
+                goal = entry["goal"]
+                workflow = entry.get("workflow", default_workflow)
+                budget = entry.get("budget")
+            elif "|" in line:
+                workflow, goal = map(str.strip, line.split("|", 1))
+            else:
+                goal, workflow = line, default_workflow
+            if workflow not in WORKFLOWS:
+                raise ValueError(f"Line {line_number}: unknown workflow '{workflow}' (expected one of {list(WORKFLOWS)})")
+            jobs.append({"index": len(jobs), "goal": goal, "workflow": workflow, "budget": budget})
+    return jobs
+
+class BatchRunner:
+    """Runs goals on a bounded pool of isolated pipelines that share model clients and one rate limiter"""
+
+    def __init__(self, model_clients, tier_config, memory, report_path: str, concurrency: int = 4, rate_limiter=None,
+                 default_budget=None):
+        self.model_clients = model_clients
+        self.tier_config = tier_config
+        self.memory = memory
+        self.report_path = report_path
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.default_budget = default_budget
+        self.stats = {"total": 0, "completed": 0, "failed": 0}
+
+    def _write_report(self, report, record: dict):
+        """Append one JSON line and flush so progress survives a crash"""
+        report.write(json.dumps(record, default=str) + "\n")
+        report.flush()
+
+    async def _run_job(self, job: dict, report):
+        """Run one goal on its own pipeline and memory scope"""
+        project_memory = self.memory.scoped()
+        started = time.monotonic()
+        self._write_report(report, {"event": "started", "timestamp": datetime.now().isoformat(), **job})
+        try:
+            # Built inside the try so a bad budget or missing model client fails only this job
+            system = FourAgentSystem(
+                self.model_clients[self.tier_config.default_model],
+                project_memory,
+                build_tools(project_memory),
+                rate_limiter=self.rate_limiter,
+                tier_config=self.tier_config,
+                model_clients=self.model_clients,
+                budget=ProjectBudget.from_dict(job["budget"]) or self.default_budget
+            )
+            # Consume the structured event stream directly; nothing is printed per message
+            project_id = None
+            async for event in system.stream_workflow(job["workflow"], job["goal"]):
+                if event["type"] == "project_started":
+                    project_id = event["project_id"]
+                elif event["type"] == "phase_end":
+                    self._write_report(report, {
+                        "event": "phase_completed",
+                        "timestamp": datetime.now().isoformat(),
+                        "project_id": project_id,
+                        "phase": event["phase"],
+                        "duration_seconds": event["duration_seconds"],
+                        **job
+                    })
+            project_data = project_memory.get_project_data(project_id)
+            self.stats["completed"] += 1
+            record = {
+                "event": "completed",
+                "project_id": project_id,
+                "metrics": project_data["project"].get("metrics", {}) if project_data else {},
+                "summaries": len(project_data["summaries"]) if project_data else 0
+            }
+            status = "✅"
+        except Exception as e:
+            self.stats["failed"] += 1
+            record = {"event": "failed", "error": f"{type(e).__name__}: {e}"}
+            status = "❌"
+
+        duration = time.monotonic() - started
+        self._write_report(report, {
+            **record,
+            "timestamp": datetime.now().isoformat(),
+            "duration_seconds": round(duration, 2),
+            "rate_limiter": self.rate_limiter.get_stats(),
+            **job
+        })
+        done = self.stats["completed"] + self.stats["failed"]
+        print(f"[{done}/{self.stats['total']}] {status} {job['workflow']}: {job['goal']} ({duration:.1f}s)", file=sys.stderr)
+
+    async def run(self, jobs):
+        """Run all jobs with at most `concurrency` pipelines in flight"""
+        self.stats["total"] = len(jobs)
+        queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+
+        async def worker():
+            while True:
+                try:
+                    job = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self._run_job(job, report)
+
+        started = time.monotonic()
+        with open(self.report_path, 'a') as report:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(jobs)) or 1)))
+            self.memory.flush()
+            elapsed = time.monotonic() - started
+            summary = {
+                "event": "batch_completed",
+                "timestamp": datetime.now().isoformat(),
+                **self.stats,
+                "elapsed_seconds": round(elapsed, 2),
+                "goals_per_hour": round(len(jobs) / elapsed * 3600, 1) if elapsed else 0,
+                "rate_limiter": self.rate_limiter.get_stats()
+            }
+            self._write_report(report, summary)
+        return summary
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run a file of goals through the four-agent workflows concurrently")
+    parser.add_argument("goals_file", help="JSONL ({\"goal\": ..., \"workflow\": ...}) or text file ('workflow | goal' per line)")
+    parser.add_argument("--workflow", default="complete_pipeline", choices=list(WORKFLOWS), help="Workflow for lines that do not name one")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum pipelines running at once")
+    parser.add_argument("--report", default="batch_report.jsonl", help="JSONL file progress and results are appended to")
+    parser.add_argument("--memory", default="batch_memory.json", help="Memory store shared by all batch projects")
+    parser.add_argument("--max-tokens", type=int, help="Default per-project token budget")
+    parser.add_argument("--max-usd", type=float, help="Default per-project cost budget in USD")
+    parser.add_argument("--max-seconds", type=float, help="Default per-project wall-time budget")
+    args = parser.parse_args()
+
+    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    if not OPENAI_API_KEY:
+        print("❌ Please set OPENAI_API_KEY in your .env file")
+        exit(1)
+
+    jobs = load_goals(args.goals_file, args.workflow)
+    tier_config = ModelTierConfig.from_env(default_model="gpt-4o-mini")
+    model_clients = build_model_clients(tier_config, OPENAI_API_KEY)
+
+    runner = BatchRunner(
+        model_clients,
+        tier_config,
+        ComprehensiveMemory(args.memory),
+        args.report,
+        concurrency=args.concurrency,
+        default_budget=ProjectBudget.from_dict({
+            "max_tokens": args.max_tokens,
+            "max_usd": args.max_usd,
+            "max_wall_seconds": args.max_seconds
+        }) if (args.max_tokens or args.max_usd or args.max_seconds) else ProjectBudget.from_env()
+    )
+    print(f"🚀 Running {len(jobs)} goals with concurrency {args.concurrency} → {args.report}", file=sys.stderr)
+    try:
+        summary = await runner.run(jobs)
+    finally:
+        for client in model_clients.values():
+            await client.close()
+
+    print(f"🏁 {summary['completed']} completed, {summary['failed']} failed in {summary['elapsed_seconds']}s "
+          f"({summary['goals_per_hour']} goals/hour)", file=sys.stderr)
+
+if __name__ == "__main__":
+    asyncio.run(main())
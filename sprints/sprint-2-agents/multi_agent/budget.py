@@ -0,0 +1,103 @@
+"""
+Project Budgets for Multi-Agent System
+Token, cost and wall-time limits that workflows check between and during phases
+"""
+
+import os
+import time
+from typing import Dict, Any, Optional
+
+class ProjectBudget:
+    """Per-project limits on tokens, USD and wall time
+
+    `low` is reached when less than `reserve_fraction` of any limit remains;
+    workflows then skip optional work. `exhausted` means a limit is used up and
+    expensive phases stop.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, max_usd: Optional[float] = None,
+                 max_wall_seconds: Optional[float] = None, reserve_fraction: float = 0.2):
+        self.max_tokens = max_tokens
+        self.max_usd = max_usd
+        self.max_wall_seconds = max_wall_seconds
+        self.reserve_fraction = reserve_fraction
+        self.started_at = None
+        self.actions = []
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]):
+        """Build a budget from a dict with max_tokens / max_usd / max_wall_seconds (None if empty)"""
+        if not data:
+            return None
+        return cls(
+            max_tokens=data.get("max_tokens"),
+            max_usd=data.get("max_usd"),
+            max_wall_seconds=data.get("max_wall_seconds"),
+            reserve_fraction=data.get("reserve_fraction", 0.2)
+        )
+
+    @classmethod
+    def from_env(cls):
+        """Build a budget from PROJECT_MAX_TOKENS, PROJECT_MAX_USD and PROJECT_MAX_SECONDS (None if unset)"""
+        max_tokens = os.getenv("PROJECT_MAX_TOKENS")
+        max_usd = os.getenv("PROJECT_MAX_USD")
+        max_seconds = os.getenv("PROJECT_MAX_SECONDS")
+        if not (max_tokens or max_usd or max_seconds):
+            return None
+        return cls(
+            max_tokens=int(max_tokens) if max_tokens else None,
+            max_usd=float(max_usd) if max_usd else None,
+            max_wall_seconds=float(max_seconds) if max_seconds else None
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Limits as stored on the project"""
+        return {
+            "max_tokens": self.max_tokens,
+            "max_usd": self.max_usd,
+            "max_wall_seconds": self.max_wall_seconds,
+            "reserve_fraction": self.reserve_fraction
+        }
+
+    def start(self):
+        """Start the wall clock and clear recorded actions"""
+        self.started_at = time.monotonic()
+        self.actions = []
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at if self.started_at is not None else 0.0
+
+    def remaining_fraction(self, meter) -> float:
+        """Smallest remaining share across all configured limits (1.0 when unlimited)"""
+        totals = meter.totals()
+        fractions = []
+        if self.max_tokens:
+            fractions.append(1 - (totals["prompt_tokens"] + totals["completion_tokens"]) / self.max_tokens)
+        if self.max_usd:
+            fractions.append(1 - totals["cost_usd"] / self.max_usd)
+        if self.max_wall_seconds:
+            fractions.append(1 - self.elapsed() / self.max_wall_seconds)
+        return max(0.0, min(fractions)) if fractions else 1.0
+
+    def is_exhausted(self, meter) -> bool:
+        return self.remaining_fraction(meter) <= 0
+
+    def is_low(self, meter) -> bool:
+        return self.remaining_fraction(meter) < self.reserve_fraction
+
+    def record_action(self, action: str):
+        """Remember an enforcement decision for the project metrics"""
+        self.actions.append(action)
+
+    def report(self, meter) -> Dict[str, Any]:
+        """Limits, spend and enforcement actions for the project metrics"""
+        totals = meter.totals()
+        return {
+            **self.to_dict(),
+            "spent_tokens": totals["prompt_tokens"] + totals["completion_tokens"],
+            "spent_usd": round(totals["cost_usd"], 6),
+            "elapsed_seconds": round(self.elapsed(), 2),
+            "remaining_fraction": round(self.remaining_fraction(meter), 3),
+            "exhausted": self.is_exhausted(meter),
+            "actions": list(self.actions)
+        }
@@ -0,0 +1,127 @@
+"""
+Console Output for Multi-Agent System
+Renders the structured workflow events from FourAgentSystem as terminal output
+"""
+
+WORKFLOW_TITLES = {
+    "complete_pipeline": "🏗️ WORKFLOW: Complete Pipeline (4 agents)",
+    "collaborative": "🤝 WORKFLOW: Collaborative (Structured Sequence)",
+    "iterative": "🏗️ WORKFLOW: Iterative Improvement",
+    "speculative_pipeline": "🏎️ WORKFLOW: Speculative Pipeline (planning and execution overlap)"
+}
+
+class ConsoleEventPrinter:
+    """Event consumer that prints workflow progress and results"""
+
+    def __call__(self, event: dict):
+        """Print one event (unknown event types are ignored)"""
+        handler = getattr(self, f"_on_{event['type']}", None)
+        if handler:
+            handler(event)
+
+    def _on_workflow_start(self, event):
+        print(f"\n{'='*70}")
+        print(f"🎯 GOAL: {event['goal']}")
+        print(WORKFLOW_TITLES.get(event["workflow"], f"WORKFLOW: {event['workflow']}"))
+        print(f"{'='*70}")
+
+    def _on_project_started(self, event):
+        print(f"📂 Started project: {event['project_id']}")
+
+    def _on_cycle_start(self, event):
+        print(f"\n{'='*70}")
+        print(f"🔄 IMPROVEMENT CYCLE {event['cycle']}")
+        print(f"{'='*70}")
+
+    def _on_phase_start(self, event):
+        print(f"\n{event['emoji']} {event['phase']} PHASE")
+        print(f"{'-'*50}")
+        print(f"{event['agent']} is working...")
+
+    def _on_agent_message(self, event):
+        print(f"{event['emoji']} {event['agent']}: {event['content']}")
+
+    def _on_phase_end(self, event):
+        if event.get("status") == "cancelled":
+            print(f"⏹️ {event['phase']} cancelled")
+        elif event.get("status") == "failed":
+            print(f"❌ {event['phase']} failed: {event['error']}")
+        print(f"{'-'*50}")
+
+    def _on_budget(self, event):
+        print(f"💸 Budget: {event['message']} ({event['remaining_fraction']:.0%} remaining)")
+
+    def _on_results(self, event):
+        project_data = event["project_data"]
+        if not project_data:
+            print("❌ Project data not found")
+            return
+
+        project = project_data["project"]
+        tasks = project_data["tasks"]
+        summaries = project_data["summaries"]
+
+        print(f"\n{'='*70}")
+        print(f"📊 PROJECT RESULTS: {project['goal']}")
+        print(f"{'='*70}")
+
+        # Show tasks
+        print(f"\n📋 TASKS ({len(tasks)})")
+        print(f"{'-'*50}")
+        for task in tasks:
+            status_emoji = "✅" if task["status"] == "reviewed" else "🔄" if task["status"] == "completed" else "⏳"
+            print(f"{status_emoji} {task['description']}")
+            if task.get("review_score"):
+                print(f"   Score: {task['review_score']}/100")
+
+        # Show summaries
+        if summaries:
+            print(f"\n📑 SUMMARIES ({len(summaries)})")
+            print(f"{'-'*50}")
+            for summary in summaries:
+                print(f"📄 {summary['type']} Summary:")
+                print(f"{summary['content'][:300]}...")
+                if summary.get("insights"):
+                    print(f"\nKey Insights:")
+                    for i, insight in enumerate(summary['insights'], 1):
+                        print(f"{i}. {insight}")
+
+        # Show metrics
+        if project.get("metrics"):
+            metrics = project["metrics"]
+            print(f"\n📈 METRICS")
+            print(f"{'-'*50}")
+            print(f"Tasks Created: {metrics.get('tasks_created', 0)}")
+            print(f"Tasks Completed: {metrics.get('tasks_completed', 0)}")
+            print(f"Completion Rate: {metrics.get('completion_rate', 0):.1f}%")
+            print(f"Average Quality: {metrics.get('average_score', 0):.1f}/100")
+            if metrics.get("duplicates_rejected"):
+                print(f"Duplicates Rejected: {metrics['duplicates_rejected']} ({metrics.get('llm_calls_saved', 0)} LLM calls saved)")
+            if metrics.get("tasks_escalated"):
+                print(f"Tasks Escalated: {metrics['tasks_escalated']}")
+
+            usage = metrics.get("model_usage")
+            if usage:
+                print(f"\n💰 MODEL COST & LATENCY")
+                print(f"{'-'*50}")
+                for entry in usage["by_role"].values():
+                    print(f"{entry['role']} ({entry['model']}): {entry['calls']} calls, "
+                          f"{entry['prompt_tokens'] + entry['completion_tokens']} tokens, "
+                          f"${entry['cost_usd']:.4f}, {entry['latency_seconds']:.1f}s")
+                print(f"Total: ${usage['total_cost_usd']:.4f}, {usage['total_latency_seconds']:.1f}s")
+                print(f"Single-model ({usage['baseline_model']}): ${usage['baseline_cost_usd']:.4f} "
+                      f"→ savings ${usage['cost_savings_usd']:.4f}")
+                if usage["latency_savings_seconds"] is not None:
+                    print(f"Estimated latency savings: {usage['latency_savings_seconds']:.1f}s")
+
+            budget = metrics.get("budget")
+            if budget:
+                print(f"\n💸 BUDGET")
+                print(f"{'-'*50}")
+                print(f"Tokens: {budget['spent_tokens']} / {budget['max_tokens'] or '∞'}")
+                print(f"Cost: ${budget['spent_usd']:.4f} / {('$' + format(budget['max_usd'], '.2f')) if budget['max_usd'] else '∞'}")
+                print(f"Wall Time: {budget['elapsed_seconds']:.1f}s / {(format(budget['max_wall_seconds'], '.0f') + 's') if budget['max_wall_seconds'] else '∞'}")
+                for action in budget["actions"]:
+                    print(f"- {action}")
+
+        print(f"\n{'='*70}")
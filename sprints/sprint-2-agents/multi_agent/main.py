@@ -4,9 +4,13 @@ Orchestrates the multi-agent system with modular components
 """
 
 import os
+import sys
 import asyncio
 from dotenv import load_dotenv
 
+# Run from multi_agent/: the sprint root holds the shared package
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
 # Load environment variables
 load_dotenv()
 
@@ -14,7 +18,9 @@ load_dotenv()
 from memory_manager import ComprehensiveMemory
 from tools import *
 from agent_system import FourAgentSystem
-from autogen_ext.models.openai import OpenAIChatCompletionClient
+from model_tiers import ModelTierConfig, build_model_clients
+from budget import ProjectBudget
+from shared.rate_limiter import get_shared_rate_limiter
 
 # Initialize memory
 memory = ComprehensiveMemory()
@@ -37,15 +43,18 @@ async def main():
         print("❌ Please set OPENAI_API_KEY in your .env file")
         exit(1)
     
-    # Create model client
-    model_client = OpenAIChatCompletionClient(
-        model="gpt-4o-mini",
-        api_key=OPENAI_API_KEY,
-    )
+    # Per-role models (PLANNER_MODEL, EXECUTOR_MODEL, ..., ESCALATION_MODEL) default to gpt-4o-mini
+    tier_config = ModelTierConfig.from_env(default_model="gpt-4o-mini")
+    
+    # Create one model client per distinct model (429 retries are handled by the shared rate limiter)
+    model_clients = build_model_clients(tier_config, OPENAI_API_KEY)
+    model_client = model_clients[tier_config.default_model]
     
     # Create tools dictionary for agent system
     tools = {
         "create_task_tool": create_task_tool,
+        "revise_task_tool": revise_task_tool,
+        "cancel_task_tool": cancel_task_tool,
         "get_pending_tasks_tool": get_pending_tasks_tool,
         "complete_task_tool": complete_task_tool,
         "get_completed_tasks_tool": get_completed_tasks_tool,
@@ -58,7 +67,14 @@ async def main():
     }
     
     # Initialize the agent system
-    system = FourAgentSystem(model_client, memory, tools)
+    system = FourAgentSystem(
+        model_client, memory, tools,
+        rate_limiter=get_shared_rate_limiter(),
+        tier_config=tier_config,
+        model_clients=model_clients,
+        # Optional per-project limits from PROJECT_MAX_TOKENS / PROJECT_MAX_USD / PROJECT_MAX_SECONDS
+        budget=ProjectBudget.from_env()
+    )
     
     sample_goals = [
         "develop a comprehensive marketing strategy",
@@ -72,13 +88,14 @@ async def main():
         print("1. Complete Pipeline (Planner → Executor → Critic → Summariser)")
         print("2. Collaborative Workflow (All 4 agents together)")
         print("3. Iterative Improvement (Multi-cycle refinement)")
-        print("4. Try sample enterprise goal")
-        print("5. Enterprise Dashboard (System overview)")
-        print("6. Project History Analysis")
-        print("7. Clear memory (reset)")
-        print("8. Exit")
+        print("4. Speculative Pipeline (Execution starts while planning)")
+        print("5. Try sample enterprise goal")
+        print("6. Enterprise Dashboard (System overview)")
+        print("7. Project History Analysis")
+        print("8. Clear memory (reset)")
+        print("9. Exit")
         
-        choice = input(f"\nSelect workflow (1-8): ").strip()
+        choice = input(f"\nSelect workflow (1-9): ").strip()
         
         if choice == "1":
             goal = input("Enter your goal: ").strip()
@@ -96,6 +113,11 @@ async def main():
                 await system.run_iterative_improvement(goal)
         
         elif choice == "4":
+            goal = input("Enter your goal: ").strip()
+            if goal:
+                await system.run_speculative_pipeline(goal)
+        
+        elif choice == "5":
             print("\nEnterprise Sample Goals:")
             for i, goal in enumerate(sample_goals, 1):
                 print(f"{i}. {goal}")
@@ -103,20 +125,22 @@ async def main():
             try:
                 sample_choice = int(input("Choose sample (1-4): ")) - 1
                 if 0 <= sample_choice < len(sample_goals):
-                    workflow = input("Complete Pipeline (1), Collaborative (2), or Iterative (3)? ").strip()
+                    workflow = input("Complete Pipeline (1), Collaborative (2), Iterative (3), or Speculative (4)? ").strip()
                     if workflow == "1":
                         await system.run_complete_pipeline(sample_goals[sample_choice])
                     elif workflow == "2":
                         await system.run_collaborative_workflow(sample_goals[sample_choice])
                     elif workflow == "3":
                         await system.run_iterative_improvement(sample_goals[sample_choice])
+                    elif workflow == "4":
+                        await system.run_speculative_pipeline(sample_goals[sample_choice])
             except ValueError:
                 print("Invalid choice")
         
-        elif choice == "5":
+        elif choice == "6":
             system.show_enterprise_dashboard()
         
-        elif choice == "6":
+        elif choice == "7":
             # Show project history
             projects = memory.data["projects"]
             if projects:
@@ -133,7 +157,7 @@ async def main():
             else:
                 print("No project history found.")
         
-        elif choice == "7":
+        elif choice == "8":
             memory.data = {
                 "projects": [],
                 "tasks": [],
@@ -152,7 +176,7 @@ async def main():
             memory.save()
             print("✅ Enterprise memory cleared!")
         
-        elif choice == "8":
+        elif choice == "9":
             print("🎊 Congratulations! You've mastered advanced multi-agent systems!")
             break
         
@@ -5,16 +5,97 @@ Handles state persistence across sessions and stores conversations, tasks, and o
 
 import os
 import json
+import atexit
+import threading
+import functools
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+def synchronized(method):
+    """Run a memory method under the store lock (tools execute in worker threads)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+class DebouncedSaver:
+    """Writes a memory store from a background timer, at most once per `delay` seconds
+    
+    Every mutation only marks the store dirty, so a burst of changes from many
+    concurrent projects costs one write instead of one full rewrite each, and
+    the file I/O happens off the event loop and outside the store lock.
+    """
+    
+    def __init__(self, memory, delay: float):
+        self.memory = memory
+        self.delay = delay
+        self.dirty = False
+        self.writes = 0
+        self._timer: Optional[threading.Timer] = None
+        self._timer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        atexit.register(self.flush)
+    
+    def schedule(self):
+        """Mark the store dirty and start the timer if it is not already running"""
+        with self._timer_lock:
+            self.dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def flush(self):
+        """Write pending changes now (must not be called while holding the store lock)"""
+        with self._timer_lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        with self._write_lock:
+            # Snapshot under the store lock, write outside it
+            with self.memory._lock:
+                if not self.dirty:
+                    return
+                self.dirty = False
+                text = json.dumps(self.memory.data, indent=2, default=str)
+            # Write to a temporary file first so a crash never leaves a truncated store
+            temp_filename = f"{self.memory.filename}.tmp"
+            with open(temp_filename, 'w') as f:
+                f.write(text)
+            os.replace(temp_filename, self.memory.filename)
+            self.writes += 1
+
 class ComprehensiveMemory:
-    """Comprehensive memory with project tracking and insights"""
+    """Comprehensive memory with project tracking and insights
+    
+    Changes are written to `filename` by a DebouncedSaver at most once per
+    `save_delay` seconds (and at exit); call flush() to write them immediately,
+    or pass save_delay=0 to write on every change.
+    """
     
-    def __init__(self, filename="four_agent_memory.json"):
+    def __init__(self, filename="four_agent_memory.json", save_delay: float = 1.0):
         self.filename = filename
         self.data = self.load()
         self.current_project_id = None
+        self.task_listeners = []
+        self._lock = threading.RLock()
+        self._saver = DebouncedSaver(self, save_delay) if save_delay > 0 else None
+    
+    def scoped(self):
+        """New handle on the same store with its own current project and listeners
+        
+        Concurrent projects each use their own scoped handle, so they never
+        overwrite each other's current_project_id.
+        """
+        view = object.__new__(ComprehensiveMemory)
+        view.filename = self.filename
+        view.data = self.data
+        view.current_project_id = None
+        view.task_listeners = []
+        view._lock = self._lock
+        view._saver = self._saver
+        return view
         
     def load(self):
         """Load memory from file"""
@@ -37,13 +118,40 @@ class ComprehensiveMemory:
             "system_insights": []
         }
     
+    @synchronized
     def save(self):
-        """Save memory to file"""
-        with open(self.filename, 'w') as f:
+        """Save memory to file (scheduled on the debounced saver unless save_delay is 0)"""
+        if self._saver is not None:
+            self._saver.schedule()
+            return
+        # Write to a temporary file first so a crash never leaves a truncated store
+        temp_filename = f"{self.filename}.tmp"
+        with open(temp_filename, 'w') as f:
             json.dump(self.data, f, indent=2, default=str)
+        os.replace(temp_filename, self.filename)
     
-    def start_project(self, goal: str, workflow_type: str):
-        """Start a new project tracking"""
+    def flush(self):
+        """Write any scheduled changes to the file now"""
+        if self._saver is not None:
+            self._saver.flush()
+    
+    def add_task_listener(self, callback):
+        """Register callback(event, task) for task state changes (created, revised, cancelled, completed, reviewed, reopened)"""
+        self.task_listeners.append(callback)
+    
+    def remove_task_listener(self, callback):
+        """Unregister a task listener"""
+        if callback in self.task_listeners:
+            self.task_listeners.remove(callback)
+    
+    def _notify_task_event(self, event: str, task: Dict[str, Any]):
+        """Tell listeners about a task state change"""
+        for callback in list(self.task_listeners):
+            callback(event, dict(task))
+    
+    @synchronized
+    def start_project(self, goal: str, workflow_type: str, budget: Dict[str, Any] = None):
+        """Start a new project tracking (budget holds optional max_tokens / max_usd / max_wall_seconds limits)"""
         project = {
             "id": f"proj_{int(datetime.now().timestamp())}_{len(self.data['projects'])}",
             "goal": goal,
@@ -51,6 +159,7 @@ class ComprehensiveMemory:
             "start_time": datetime.now().isoformat(),
             "end_time": None,
             "status": "active",
+            "budget": budget,
             "tasks": [],
             "metrics": {
                 "tasks_created": 0,
@@ -64,6 +173,7 @@ class ComprehensiveMemory:
         self.save()
         return project
     
+    @synchronized
     def end_project(self, summary: str, insights: List[str] = None):
         """End current project with summary"""
         if self.current_project_id:
@@ -81,6 +191,7 @@ class ComprehensiveMemory:
                     reviewed_tasks = [t for t in project_tasks if t.get("review_score") is not None]
                     
                     project["metrics"] = {
+                        **project.get("metrics", {}),
                         "tasks_created": len(project_tasks),
                         "tasks_completed": len(completed_tasks),
                         "completion_rate": (len(completed_tasks) / len(project_tasks) * 100) if project_tasks else 0,
@@ -90,6 +201,7 @@ class ComprehensiveMemory:
                     break
         self.save()
     
+    @synchronized
     def add_task(self, task_id: str, description: str, status: str = "pending"):
         """Add a task to memory"""
         task = {
@@ -103,28 +215,85 @@ class ComprehensiveMemory:
             "result": None,
             "review_score": None,
             "review_feedback": None,
-            "revision_count": 0
+            "revision_count": 0,
+            "version": 0
         }
         self.data["tasks"].append(task)
         self.data["agent_stats"]["Planner"]["tasks_created"] += 1
         self.save()
+        self._notify_task_event("created", task)
         return task
     
-    def complete_task(self, task_id: str, result: str):
-        """Mark task as completed"""
-        for task in self.data["tasks"]:
+    def _current_tasks(self) -> List[Dict[str, Any]]:
+        """Tasks of the current project, the only ones its agents may change by ID"""
+        return [t for t in self.data["tasks"] if t.get("project_id") == self.current_project_id]
+    
+    @synchronized
+    def record_duplicate_task(self, duplicate_of: str, description: str, similarity: float, llm_calls_saved: int):
+        """Record a task creation that was rejected as a near-duplicate"""
+        planner_stats = self.data["agent_stats"]["Planner"]
+        planner_stats["duplicates_rejected"] = planner_stats.get("duplicates_rejected", 0) + 1
+        for project in self.data["projects"]:
+            if project["id"] == self.current_project_id:
+                metrics = project.setdefault("metrics", {})
+                metrics["duplicates_rejected"] = metrics.get("duplicates_rejected", 0) + 1
+                metrics["llm_calls_saved"] = metrics.get("llm_calls_saved", 0) + llm_calls_saved
+                project.setdefault("rejected_duplicates", []).append({
+                    "description": description,
+                    "duplicate_of": duplicate_of,
+                    "similarity": round(similarity, 3),
+                    "timestamp": datetime.now().isoformat()
+                })
+                break
+        self.save()
+    
+    @synchronized
+    def revise_task(self, task_id: str, description: str):
+        """Replace a task's description and send it back to pending, discarding any result"""
+        for task in self._current_tasks():
+            if task["id"] == task_id and task["status"] in ["pending", "completed"]:
+                task["description"] = description
+                task["status"] = "pending"
+                task["result"] = None
+                task["completed_at"] = None
+                task["version"] = task.get("version", 0) + 1
+                self.save()
+                self._notify_task_event("revised", task)
+                return True
+        return False
+    
+    @synchronized
+    def cancel_task(self, task_id: str):
+        """Cancel a task that has not been reviewed yet"""
+        for task in self._current_tasks():
+            if task["id"] == task_id and task["status"] in ["pending", "completed"]:
+                task["status"] = "cancelled"
+                task["version"] = task.get("version", 0) + 1
+                self.save()
+                self._notify_task_event("cancelled", task)
+                return True
+        return False
+    
+    @synchronized
+    def complete_task(self, task_id: str, result: str, expected_version: int = None):
+        """Mark task as completed (rejected if the task was revised since expected_version)"""
+        for task in self._current_tasks():
             if task["id"] == task_id and task["status"] == "pending":
+                if expected_version is not None and task.get("version", 0) != expected_version:
+                    return False
                 task["status"] = "completed"
                 task["result"] = result
                 task["completed_at"] = datetime.now().isoformat()
                 self.data["agent_stats"]["Executor"]["tasks_completed"] += 1
                 self.save()
+                self._notify_task_event("completed", task)
                 return True
         return False
     
+    @synchronized
     def review_task(self, task_id: str, score: int, feedback: str):
         """Add review to a completed task"""
-        for task in self.data["tasks"]:
+        for task in self._current_tasks():
             if task["id"] == task_id and task["status"] == "completed":
                 task["status"] = "reviewed"
                 task["review_score"] = score
@@ -150,9 +319,46 @@ class ComprehensiveMemory:
                 }
                 self.data["reviews"].append(review_record)
                 self.save()
+                self._notify_task_event("reviewed", task)
+                return True
+        return False
+    
+    @synchronized
+    def reopen_task(self, task_id: str, reason: str = ""):
+        """Send a reviewed task back to pending so it can be re-executed"""
+        for task in self._current_tasks():
+            if task["id"] == task_id and task["status"] == "reviewed":
+                task.setdefault("previous_attempts", []).append({
+                    "result": task["result"],
+                    "review_score": task["review_score"],
+                    "review_feedback": task["review_feedback"],
+                    "reason": reason
+                })
+                task["status"] = "pending"
+                task["result"] = None
+                task["completed_at"] = None
+                task["reviewed_at"] = None
+                task["review_score"] = None
+                task["review_feedback"] = None
+                task["revision_count"] += 1
+                self.data["agent_stats"]["Critic"]["revisions_requested"] += 1
+                self.save()
+                self._notify_task_event("reopened", task)
+                return True
+        return False
+    
+    @synchronized
+    def update_project_metrics(self, metrics: Dict[str, Any], project_id: str = None):
+        """Merge extra metrics into a project's metrics"""
+        pid = project_id or self.current_project_id
+        for project in self.data["projects"]:
+            if project["id"] == pid:
+                project.setdefault("metrics", {}).update(metrics)
+                self.save()
                 return True
         return False
     
+    @synchronized
     def add_summary(self, summary_type: str, content: str, insights: List[str] = None, metrics: Dict = None):
         """Add summary to memory"""
         summary_record = {
@@ -171,6 +377,7 @@ class ComprehensiveMemory:
         self.save()
         return summary_record
     
+    @synchronized
     def add_system_insight(self, insight: str, category: str = "general"):
         """Add system-level insight"""
         insight_record = {
@@ -182,6 +389,7 @@ class ComprehensiveMemory:
         self.data["system_insights"].append(insight_record)
         self.save()
     
+    @synchronized
     def get_project_data(self, project_id: str = None):
         """Get comprehensive project data"""
         pid = project_id or self.current_project_id
@@ -209,6 +417,7 @@ class ComprehensiveMemory:
             "summaries": summaries
         }
     
+    @synchronized
     def get_tasks_by_status(self, status: str, project_id: str = None):
         """Get tasks by status for current or specific project"""
         pid = project_id or self.current_project_id
@@ -229,6 +438,7 @@ class ComprehensiveMemory:
         """Get reviewed tasks for current project"""
         return self.get_tasks_by_status("reviewed")
     
+    @synchronized
     def add_conversation(self, agent: str, message: str):
         """Add conversation to memory"""
         conversation = {
@@ -240,6 +450,7 @@ class ComprehensiveMemory:
         self.data["conversations"].append(conversation)
         self.save()
     
+    @synchronized
     def get_comprehensive_stats(self):
         """Get comprehensive system statistics"""
         projects = self.data["projects"]
@@ -0,0 +1,189 @@
+"""
+Model Tiers for Multi-Agent System
+Per-role model selection, escalation policy and cost/latency accounting
+"""
+
+import os
+import time
+from typing import Dict, List, Any, Optional
+
+ROLES = ["Planner", "Executor", "Critic", "Summariser"]
+
+# USD per 1M tokens: (input, output)
+MODEL_PRICING = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-3.5-turbo": (0.50, 1.50)
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Cost in USD for a call, 0 for models without known pricing"""
+    input_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+class ModelTierConfig:
+    """Which model each role uses and when Executor work is escalated to a stronger model"""
+
+    def __init__(self, default_model: str = "gpt-4o-mini", role_models: Dict[str, str] = None,
+                 escalation_model: Optional[str] = None, escalation_threshold: int = 80,
+                 max_escalation_rounds: int = 1, baseline_model: Optional[str] = None):
+        self.default_model = default_model
+        self.role_models = role_models or {}
+        self.escalation_model = escalation_model
+        self.escalation_threshold = escalation_threshold
+        self.max_escalation_rounds = max_escalation_rounds
+        # Single-model run the tiered cost is compared against
+        self.baseline_model = baseline_model or escalation_model or default_model
+
+    @classmethod
+    def from_env(cls, default_model: str = "gpt-4o-mini"):
+        """Build a config from PLANNER_MODEL, EXECUTOR_MODEL, ..., ESCALATION_MODEL and ESCALATION_THRESHOLD"""
+        role_models = {}
+        for role in ROLES:
+            model = os.getenv(f"{role.upper()}_MODEL")
+            if model:
+                role_models[role] = model
+        return cls(
+            default_model=os.getenv("DEFAULT_MODEL", default_model),
+            role_models=role_models,
+            escalation_model=os.getenv("ESCALATION_MODEL"),
+            escalation_threshold=int(os.getenv("ESCALATION_THRESHOLD", "80")),
+            max_escalation_rounds=int(os.getenv("MAX_ESCALATION_ROUNDS", "1")),
+            baseline_model=os.getenv("BASELINE_MODEL")
+        )
+
+    def model_for(self, role: str) -> str:
+        """Model name used by a role"""
+        return self.role_models.get(role, self.default_model)
+
+    def models(self) -> List[str]:
+        """All distinct models this config needs a client for"""
+        names = [self.default_model] + [self.model_for(role) for role in ROLES]
+        if self.escalation_model:
+            names.append(self.escalation_model)
+        return list(dict.fromkeys(names))
+
+
+def build_model_clients(tier_config: ModelTierConfig, api_key: str) -> Dict[str, Any]:
+    """One OpenAI client per distinct model (429 retries are left to the shared rate limiter)"""
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+    
+    return {
+        model: OpenAIChatCompletionClient(
+            model=model,
+            api_key=api_key,
+            max_retries=0,
+        )
+        for model in tier_config.models()
+    }
+
+
+class UsageMeter:
+    """Accumulates tokens, cost and latency per role and model"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded usage (called at the start of each project)"""
+        self.records: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, role: str, model: str, prompt_tokens: int, completion_tokens: int, latency: float):
+        """Record one model call"""
+        key = f"{role}:{model}"
+        entry = self.records.setdefault(key, {
+            "role": role,
+            "model": model,
+            "calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "latency_seconds": 0.0,
+            "cost_usd": 0.0
+        })
+        entry["calls"] += 1
+        entry["prompt_tokens"] += prompt_tokens
+        entry["completion_tokens"] += completion_tokens
+        entry["latency_seconds"] += latency
+        entry["cost_usd"] += estimate_cost(model, prompt_tokens, completion_tokens)
+
+    def totals(self) -> Dict[str, Any]:
+        """Totals across all roles and models"""
+        totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_seconds": 0.0, "cost_usd": 0.0}
+        for entry in self.records.values():
+            for key in totals:
+                totals[key] += entry[key]
+        return totals
+
+    def report(self, baseline_model: str) -> Dict[str, Any]:
+        """Compare actual spend with the same token volume on a single baseline model
+
+        Baseline latency is estimated from the seconds per completion token observed
+        on the baseline model during this project; it is omitted when the baseline
+        model was never called.
+        """
+        totals = self.totals()
+        baseline_cost = sum(
+            estimate_cost(baseline_model, e["prompt_tokens"], e["completion_tokens"])
+            for e in self.records.values()
+        )
+
+        baseline_entries = [e for e in self.records.values() if e["model"] == baseline_model]
+        baseline_tokens = sum(e["completion_tokens"] for e in baseline_entries)
+        baseline_latency = None
+        if baseline_tokens:
+            seconds_per_token = sum(e["latency_seconds"] for e in baseline_entries) / baseline_tokens
+            baseline_latency = sum(e["completion_tokens"] for e in self.records.values()) * seconds_per_token
+
+        return {
+            "by_role": {key: {k: (round(v, 6) if isinstance(v, float) else v) for k, v in e.items()}
+                        for key, e in self.records.items()},
+            "total_cost_usd": round(totals["cost_usd"], 6),
+            "total_latency_seconds": round(totals["latency_seconds"], 2),
+            "total_tokens": totals["prompt_tokens"] + totals["completion_tokens"],
+            "baseline_model": baseline_model,
+            "baseline_cost_usd": round(baseline_cost, 6),
+            "cost_savings_usd": round(baseline_cost - totals["cost_usd"], 6),
+            "baseline_latency_seconds": round(baseline_latency, 2) if baseline_latency is not None else None,
+            "latency_savings_seconds": round(baseline_latency - totals["latency_seconds"], 2) if baseline_latency is not None else None
+        }
+
+
+class MeteredChatClient:
+    """Wraps a chat completion client and records usage for one role in a UsageMeter"""
+
+    def __init__(self, model_client, meter: UsageMeter, role: str, model: str):
+        self._client = model_client
+        self._meter = meter
+        self._role = role
+        self._model = model
+
+    def _record(self, result, started: float):
+        usage = getattr(result, "usage", None)
+        self._meter.record(
+            self._role,
+            self._model,
+            getattr(usage, "prompt_tokens", 0) or 0,
+            getattr(usage, "completion_tokens", 0) or 0,
+            time.monotonic() - started
+        )
+
+    async def create(self, messages, **kwargs):
+        started = time.monotonic()
+        result = await self._client.create(messages, **kwargs)
+        self._record(result, started)
+        return result
+
+    async def create_stream(self, messages, **kwargs):
+        started = time.monotonic()
+        async for chunk in self._client.create_stream(messages, **kwargs):
+            if not isinstance(chunk, str):
+                self._record(chunk, started)
+            yield chunk
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
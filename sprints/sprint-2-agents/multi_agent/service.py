@@ -0,0 +1,260 @@
+"""
+HTTP Job Service for Multi-Agent System
+Runs FourAgentSystem workflows as background jobs behind a FastAPI API with SSE event streaming
+"""
+
+import os
+import sys
+import json
+import uuid
+import time
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+import uvicorn
+
+# Started with `python service.py` from multi_agent/, so add the sprint root for the shared package
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+load_dotenv()
+
+from memory_manager import ComprehensiveMemory
+from tools import build_tools
+from agent_system import FourAgentSystem, WORKFLOWS
+from model_tiers import ModelTierConfig, build_model_clients
+from budget import ProjectBudget
+from shared.rate_limiter import get_shared_rate_limiter
+
+# Number of events kept per job for SSE replay
+MAX_EVENTS_PER_JOB = 2000
+# Finished jobs (with their event logs) are forgotten after this many seconds,
+# or oldest first once more than MAX_FINISHED_JOBS have finished
+FINISHED_JOB_TTL = 3600
+MAX_FINISHED_JOBS = 1000
+
+class JobRequest(BaseModel):
+    goal: str
+    workflow: str = "complete_pipeline"
+    max_tokens: Optional[int] = None
+    max_usd: Optional[float] = None
+    max_wall_seconds: Optional[float] = None
+
+class JobManager:
+    """Bounded pool of background workers running workflow jobs on shared clients and memory
+
+    Finished jobs stay queryable for `finished_ttl` seconds; at most
+    `max_finished` of them are kept (the oldest are evicted first).
+    """
+
+    def __init__(self, memory, model_clients, tier_config, rate_limiter, workers: int = 4, max_queued: int = 100,
+                 finished_ttl: float = FINISHED_JOB_TTL, max_finished: int = MAX_FINISHED_JOBS):
+        self.memory = memory
+        self.model_clients = model_clients
+        self.tier_config = tier_config
+        self.rate_limiter = rate_limiter
+        self.worker_count = workers
+        self.finished_ttl = finished_ttl
+        self.max_finished = max_finished
+        self.queue = asyncio.Queue(maxsize=max_queued)
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: Dict[str, set] = {}
+        # Finished job ids in finishing order, with their monotonic finish time
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self._workers = []
+
+    def start(self):
+        """Start the worker tasks"""
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def stop(self):
+        """Cancel the worker tasks and write pending memory changes"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self.memory.flush()
+
+    def submit(self, goal: str, workflow: str, budget: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Queue a job (raises asyncio.QueueFull when the backlog is full)"""
+        self._evict_finished()
+        job = {
+            "id": f"job_{uuid.uuid4().hex[:12]}",
+            "goal": goal,
+            "workflow": workflow,
+            "budget": budget,
+            "status": "queued",
+            "project_id": None,
+            "error": None,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "events": deque(maxlen=MAX_EVENTS_PER_JOB)
+        }
+        self.queue.put_nowait(job)
+        self.jobs[job["id"]] = job
+        self._subscribers[job["id"]] = set()
+        return job
+
+    def _evict_finished(self):
+        """Forget finished jobs past their TTL, then the oldest beyond max_finished"""
+        expired_before = time.monotonic() - self.finished_ttl
+        while self._finished:
+            job_id, finished = next(iter(self._finished.items()))
+            if finished > expired_before and len(self._finished) <= self.max_finished:
+                break
+            del self._finished[job_id]
+            self.jobs.pop(job_id, None)
+            self._subscribers.pop(job_id, None)
+
+    def describe(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Job status without its event log"""
+        return {key: value for key, value in job.items() if key != "events"} | {"event_count": len(job["events"])}
+
+    def _publish(self, job: Dict[str, Any], event: Dict[str, Any]):
+        job["events"].append(event)
+        for subscriber in self._subscribers[job["id"]]:
+            subscriber.put_nowait(event)
+
+    async def subscribe(self, job_id: str):
+        """Replay a job's stored events, then follow live events until the job finishes"""
+        job = self.jobs[job_id]
+        live = asyncio.Queue()
+        self._subscribers[job_id].add(live)
+        try:
+            # The snapshot is taken right after subscribing, so later events only arrive via the live queue
+            for event in list(job["events"]):
+                yield event
+            while job["status"] in ["queued", "running"] or not live.empty():
+                try:
+                    yield await asyncio.wait_for(live.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield {"type": "keepalive"}
+        finally:
+            # The job may have been evicted while a slow client was still reading
+            self._subscribers.get(job_id, set()).discard(live)
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self.queue.task_done()
+
+    async def _run(self, job: Dict[str, Any]):
+        """Run one job on its own pipeline and memory scope"""
+        project_memory = self.memory.scoped()
+        job["status"] = "running"
+        job["started_at"] = datetime.now().isoformat()
+        try:
+            system = FourAgentSystem(
+                self.model_clients[self.tier_config.default_model],
+                project_memory,
+                build_tools(project_memory),
+                rate_limiter=self.rate_limiter,
+                tier_config=self.tier_config,
+                model_clients=self.model_clients,
+                budget=ProjectBudget.from_dict(job["budget"]) or ProjectBudget.from_env()
+            )
+            async for event in system.stream_workflow(job["workflow"], job["goal"]):
+                if event["type"] == "project_started":
+                    job["project_id"] = event["project_id"]
+                self._publish(job, event)
+            job["status"] = "completed"
+        except asyncio.CancelledError:
+            # Shutdown cancelled the worker mid-job; report it, then let the cancellation finish
+            job["status"] = "cancelled"
+            raise
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
+            self._publish(job, {"type": "job_end", "status": job["status"], "error": job["error"]})
+            self._finished[job["id"]] = time.monotonic()
+            self._evict_finished()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the model clients, memory store and worker pool once per process"""
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY environment variable not set")
+
+    tier_config = ModelTierConfig.from_env(default_model="gpt-4o-mini")
+    model_clients = build_model_clients(tier_config, api_key)
+    app.state.jobs = JobManager(
+        ComprehensiveMemory(os.getenv("SERVICE_MEMORY_FILE", "four_agent_memory.json")),
+        model_clients,
+        tier_config,
+        get_shared_rate_limiter(),
+        workers=int(os.getenv("SERVICE_WORKERS", "4")),
+        max_queued=int(os.getenv("SERVICE_MAX_QUEUED", "100")),
+        finished_ttl=float(os.getenv("SERVICE_JOB_TTL", str(FINISHED_JOB_TTL))),
+        max_finished=int(os.getenv("SERVICE_MAX_FINISHED_JOBS", str(MAX_FINISHED_JOBS)))
+    )
+    app.state.jobs.start()
+    yield
+    await app.state.jobs.stop()
+    for client in model_clients.values():
+        await client.close()
+
+app = FastAPI(title="Four-Agent Workflow Service", lifespan=lifespan)
+
+@app.get("/")
+def read_root():
+    return {"message": "Four-Agent Workflow Service", "workflows": list(WORKFLOWS)}
+
+@app.post("/jobs", status_code=202)
+def submit_job(request: JobRequest):
+    if request.workflow not in WORKFLOWS:
+        raise HTTPException(status_code=400, detail=f"Unknown workflow '{request.workflow}'. Expected one of {list(WORKFLOWS)}")
+    try:
+        budget = {
+            "max_tokens": request.max_tokens,
+            "max_usd": request.max_usd,
+            "max_wall_seconds": request.max_wall_seconds
+        }
+        job = app.state.jobs.submit(request.goal, request.workflow, budget if any(budget.values()) else None)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Job queue is full, try again later")
+    return app.state.jobs.describe(job)
+
+@app.get("/jobs")
+def list_jobs():
+    return [app.state.jobs.describe(job) for job in app.state.jobs.jobs.values()]
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = app.state.jobs.jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return app.state.jobs.describe(job)
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    if job_id not in app.state.jobs.jobs:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    async def event_source():
+        async for event in app.state.jobs.subscribe(job_id):
+            yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(event_source(), media_type="text/event-stream")
+
+@app.get("/projects/{project_id}")
+def get_project(project_id: str):
+    project_data = app.state.jobs.memory.get_project_data(project_id)
+    if not project_data:
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+    return project_data
+
+#Run the service locally using Uvicorn (if run directly, not imported)
+if __name__ == "__main__":
+    uvicorn.run("service:app", host="127.0.0.1", port=8000)
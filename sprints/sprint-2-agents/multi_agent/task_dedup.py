@@ -0,0 +1,61 @@
+"""
+Task Deduplication for Multi-Agent System
+Cheap local near-duplicate detection for task descriptions using normalized word shingles
+"""
+
+import re
+from typing import Dict, List, Any, Optional, Tuple
+
+# Words that carry no meaning for comparing task descriptions
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "for", "in", "on", "with", "by", "at", "from",
+    "as", "is", "are", "be", "that", "this", "these", "those", "it", "its", "into", "all",
+    "any", "each", "including", "include", "includes", "such", "etc", "e", "g"
+}
+
+# Each duplicate avoids at least one Executor completion and one Critic review
+LLM_CALLS_PER_TASK = 2
+
+
+def _stem(word: str) -> str:
+    """Very light suffix stripping so 'drafting', 'drafted' and 'drafts' compare equal"""
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def normalize(description: str) -> List[str]:
+    """Lowercased, stemmed tokens without punctuation or stopwords"""
+    words = re.findall(r"[a-z0-9]+", description.lower())
+    return [_stem(w) for w in words if w not in STOPWORDS]
+
+
+def shingles(description: str) -> set:
+    """Unigram and bigram shingles of the normalized description"""
+    tokens = normalize(description)
+    return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def similarity(first: str, second: str) -> float:
+    """Jaccard similarity of two descriptions' shingle sets"""
+    a, b = shingles(first), shingles(second)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def find_duplicate(description: str, tasks: List[Dict[str, Any]], threshold: float = 0.6) -> Optional[Tuple[Dict[str, Any], float]]:
+    """Most similar existing task at or above the threshold, with its score"""
+    candidate = shingles(description)
+    if not candidate:
+        return None
+    best = None
+    for task in tasks:
+        existing = shingles(task["description"])
+        if not existing:
+            continue
+        score = len(candidate & existing) / len(candidate | existing)
+        if score >= threshold and (best is None or score > best[1]):
+            best = (task, score)
+    return best
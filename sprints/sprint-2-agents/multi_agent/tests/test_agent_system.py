@@ -0,0 +1,140 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("autogen_agentchat")
+
+import agent_system
+from agent_system import FourAgentSystem
+from memory_manager import ComprehensiveMemory
+
+
+class FakeTeam:
+    """Stands in for RoundRobinGroupChat: streams `script` (messages, delays and exceptions)"""
+
+    script = []
+
+    def __init__(self, agents):
+        pass
+
+    async def run_stream(self, task):
+        for step in self.script:
+            if isinstance(step, Exception):
+                raise step
+            if isinstance(step, (int, float)):
+                await asyncio.sleep(step)
+                continue
+            yield SimpleNamespace(content=step, source="Executor")
+
+
+@pytest.fixture
+def system(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent_system, "RoundRobinGroupChat", FakeTeam)
+    system = object.__new__(FourAgentSystem)
+    system.memory = ComprehensiveMemory(str(tmp_path / "memory.json"), save_delay=0)
+    system.budget = None
+    system._workflow_name = "test"
+    return system
+
+
+def run_phase(system, script, cancel_after=None):
+    FakeTeam.script = script
+
+    async def run():
+        system._event_queue = asyncio.Queue()
+        phase = asyncio.create_task(system._run_agent_phase(SimpleNamespace(name="Executor"), "Do it", "EXECUTION", "⚡"))
+        if cancel_after is not None:
+            await asyncio.sleep(cancel_after)
+            phase.cancel()
+        outcome = (await asyncio.gather(phase, return_exceptions=True))[0]
+        events = []
+        while not system._event_queue.empty():
+            events.append(system._event_queue.get_nowait())
+        return outcome, [event for event in events if event["type"] == "phase_end"]
+
+    return asyncio.run(run())
+
+
+def test_completed_phase_records_the_conversation(system):
+    outcome, ends = run_phase(system, ["Working", "Task complete!"])
+
+    assert outcome == "Task complete!"
+    assert [(end["status"], end["messages"]) for end in ends] == [("completed", 2)]
+    assert system.memory.data["conversations"][-1]["message"] == "Task complete!"
+
+
+def test_cancelled_phase_still_emits_phase_end(system):
+    outcome, ends = run_phase(system, ["Working", 10], cancel_after=0.05)
+
+    assert isinstance(outcome, asyncio.CancelledError)
+    assert [end["status"] for end in ends] == ["cancelled"]
+
+
+def test_failed_phase_reports_its_error(system):
+    outcome, ends = run_phase(system, ["Working", RuntimeError("model unavailable")])
+
+    assert isinstance(outcome, RuntimeError)
+    assert [(end["status"], end["error"]) for end in ends] == [("failed", "RuntimeError: model unavailable")]
+
+
+def speculative_system(system, work_seconds=0.2, planning_seconds=0.0):
+    """Planner creates two tasks; each speculative worker takes `work_seconds` to complete its task"""
+    system.usage_meter = SimpleNamespace(reset=lambda: None)
+    system.escalation_executor = None
+    system._record_model_usage = lambda project_id: None
+    system._speculative_executor = lambda task: SimpleNamespace(name="Executor", task=task)
+    system.planner = SimpleNamespace(name="Planner")
+    system.critic = SimpleNamespace(name="Critic")
+    system.summariser = SimpleNamespace(name="Summariser")
+    system.executor = SimpleNamespace(name="Executor")
+    system.planner_unwound = False
+
+    async def run_agent_phase(agent, task, title, emoji, **kwargs):
+        if agent.name == "Planner":
+            try:
+                system.memory.add_task("task_a", "Research the market")
+                system.memory.add_task("task_b", "Draft the launch plan")
+                await asyncio.sleep(planning_seconds)
+            finally:
+                # Unwinding takes a moment, like a team run closing its model stream
+                await asyncio.sleep(0.01)
+                system.planner_unwound = True
+        elif hasattr(agent, "task"):
+            await asyncio.sleep(work_seconds)
+            system.memory.complete_task(agent.task["id"], "Done", expected_version=agent.task["version"])
+
+    system._run_agent_phase = run_agent_phase
+    return system
+
+
+def test_pipeline_waits_for_workers_without_spinning_after_planning(system, monkeypatch):
+    speculative_system(system, work_seconds=0.2)
+    waits = []
+    real_wait = asyncio.wait
+
+    async def counting_wait(*args, **kwargs):
+        waits.append(1)
+        return await real_wait(*args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "wait", counting_wait)
+    system._event_queue = None
+    asyncio.run(system._speculative_pipeline("Launch a product"))
+
+    assert [task["status"] for task in system.memory.data["tasks"]] == ["completed", "completed"]
+    # One wake-up per event and per finished worker, not one per loop pass while workers run
+    assert len(waits) < 10
+
+
+def test_cancelled_pipeline_waits_for_the_planner_to_unwind(system):
+    speculative_system(system, planning_seconds=10)
+
+    async def run():
+        system._event_queue = None
+        pipeline = asyncio.create_task(system._speculative_pipeline("Launch a product"))
+        await asyncio.sleep(0.05)
+        pipeline.cancel()
+        await asyncio.gather(pipeline, return_exceptions=True)
+        return system.planner_unwound
+
+    assert asyncio.run(run())
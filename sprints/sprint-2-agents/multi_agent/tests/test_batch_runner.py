@@ -0,0 +1,48 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("autogen_agentchat")
+
+import batch_runner
+from memory_manager import ComprehensiveMemory
+from shared.rate_limiter import RateLimiter
+
+
+class FakeSystem:
+    """Stands in for FourAgentSystem with a one-phase workflow"""
+
+    def __init__(self, model_client, memory, tools, **kwargs):
+        self.memory = memory
+
+    async def stream_workflow(self, workflow, goal):
+        self.memory.start_project(goal, workflow)
+        yield {"type": "project_started", "project_id": self.memory.current_project_id}
+        yield {"type": "phase_end", "phase": "planning", "duration_seconds": 0.0}
+
+
+def test_a_pipeline_that_fails_to_build_fails_only_its_job(tmp_path, monkeypatch):
+    def build(model_client, memory, tools, **kwargs):
+        if kwargs["budget"] is not None and kwargs["budget"].max_tokens == -1:
+            raise ValueError("cannot build")
+        return FakeSystem(model_client, memory, tools, **kwargs)
+
+    monkeypatch.setattr(batch_runner, "FourAgentSystem", build)
+    report_path = tmp_path / "report.jsonl"
+    runner = batch_runner.BatchRunner(
+        {"model": object()}, type("Tiers", (), {"default_model": "model"})(),
+        ComprehensiveMemory(str(tmp_path / "memory.json")), str(report_path),
+        concurrency=2, rate_limiter=RateLimiter()
+    )
+    jobs = [
+        {"index": 0, "goal": "Good goal", "workflow": "sequential", "budget": None},
+        {"index": 1, "goal": "Bad goal", "workflow": "sequential", "budget": {"max_tokens": -1}},
+        {"index": 2, "goal": "Another goal", "workflow": "sequential", "budget": None}
+    ]
+
+    summary = asyncio.run(runner.run(jobs))
+
+    assert summary["completed"] == 2 and summary["failed"] == 1
+    records = [json.loads(line) for line in report_path.read_text().splitlines()]
+    assert [record["goal"] for record in records if record["event"] == "failed"] == ["Bad goal"]
@@ -0,0 +1,75 @@
+import json
+import threading
+import time
+
+from memory_manager import ComprehensiveMemory
+
+
+def test_burst_of_changes_is_written_once(tmp_path):
+    path = tmp_path / "memory.json"
+    memory = ComprehensiveMemory(str(path), save_delay=0.05)
+    memory.start_project("Plan a conference", "sequential")
+    for index in range(50):
+        memory.add_task(f"task_{index}", f"Task {index}")
+
+    assert not path.exists()
+    time.sleep(0.2)
+    assert memory._saver.writes == 1
+    assert len(json.loads(path.read_text())["tasks"]) == 50
+
+
+def test_flush_writes_pending_changes_immediately(tmp_path):
+    path = tmp_path / "memory.json"
+    memory = ComprehensiveMemory(str(path), save_delay=60)
+    memory.start_project("Plan a conference", "sequential")
+    memory.add_task("task_1", "Book the venue")
+
+    memory.flush()
+
+    assert json.loads(path.read_text())["tasks"][0]["id"] == "task_1"
+    assert ComprehensiveMemory(str(path)).data["tasks"][0]["description"] == "Book the venue"
+
+
+def test_scoped_views_share_one_saver_across_threads(tmp_path):
+    path = tmp_path / "memory.json"
+    memory = ComprehensiveMemory(str(path), save_delay=0.05)
+
+    def project(index):
+        view = memory.scoped()
+        view.start_project(f"Project {index}", "sequential")
+        for task in range(10):
+            view.add_task(f"task_{index}_{task}", f"Task {task}")
+
+    threads = [threading.Thread(target=project, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    memory.flush()
+
+    data = json.loads(path.read_text())
+    assert len(data["projects"]) == 4 and len(data["tasks"]) == 40
+    assert {task["project_id"] for task in data["tasks"]} == {project["id"] for project in data["projects"]}
+
+
+def test_zero_delay_writes_on_every_change(tmp_path):
+    path = tmp_path / "memory.json"
+    memory = ComprehensiveMemory(str(path), save_delay=0)
+    memory.start_project("Plan a conference", "sequential")
+
+    assert json.loads(path.read_text())["projects"][0]["goal"] == "Plan a conference"
+
+
+def test_task_changes_only_reach_the_current_project(tmp_path):
+    memory = ComprehensiveMemory(str(tmp_path / "memory.json"), save_delay=0)
+    first, second = memory.scoped(), memory.scoped()
+    first.start_project("Plan a conference", "sequential")
+    second.start_project("Launch a newsletter", "sequential")
+    first.add_task("task_1", "Book the venue")
+
+    assert not second.complete_task("task_1", "Booked")
+    assert not second.cancel_task("task_1")
+    assert first.get_pending_tasks()[0]["id"] == "task_1"
+    assert first.complete_task("task_1", "Booked")
+    assert not second.review_task("task_1", 90, "Good")
+    assert first.review_task("task_1", 90, "Good")
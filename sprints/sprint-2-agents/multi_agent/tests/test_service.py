@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("autogen_agentchat")
+
+import service
+from memory_manager import ComprehensiveMemory
+from shared.rate_limiter import RateLimiter
+
+
+class FakeSystem:
+    """Stands in for FourAgentSystem with a one-phase workflow"""
+
+    def __init__(self, model_client, memory, tools, **kwargs):
+        if kwargs["budget"] is not None and kwargs["budget"].max_tokens == -1:
+            raise ValueError("cannot build")
+        self.memory = memory
+
+    async def stream_workflow(self, workflow, goal):
+        self.memory.start_project(goal, workflow)
+        yield {"type": "project_started", "project_id": self.memory.current_project_id}
+        if goal == "Slow goal":
+            await asyncio.sleep(10)
+        yield {"type": "phase_end", "phase": "planning", "duration_seconds": 0.0}
+
+
+@pytest.fixture
+def make_manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(service, "FourAgentSystem", FakeSystem)
+
+    def make(**kwargs):
+        return service.JobManager(
+            ComprehensiveMemory(str(tmp_path / "memory.json")),
+            {"model": object()},
+            type("Tiers", (), {"default_model": "model"})(),
+            RateLimiter(),
+            **kwargs
+        )
+    return make
+
+
+def run_jobs(manager, goals, budgets=None):
+    async def run():
+        manager.start()
+        jobs = [manager.submit(goal, "sequential", budget) for goal, budget in zip(goals, budgets or [None] * len(goals))]
+        await manager.queue.join()
+        await manager.stop()
+        return jobs
+    return asyncio.run(run())
+
+
+def test_jobs_complete_and_replay_their_events(make_manager):
+    manager = make_manager(workers=2)
+
+    async def run():
+        manager.start()
+        job = manager.submit("Write a launch plan", "sequential")
+        events = [event["type"] async for event in manager.subscribe(job["id"])]
+        await manager.stop()
+        return job, events
+
+    job, events = asyncio.run(run())
+    assert job["status"] == "completed"
+    assert events == ["project_started", "phase_end", "job_end"]
+
+
+def test_pipeline_construction_error_fails_only_that_job(make_manager):
+    manager = make_manager()
+    failed, ok = run_jobs(manager, ["Broken goal", "Good goal"], [{"max_tokens": -1}, None])
+
+    assert failed["status"] == "failed" and "cannot build" in failed["error"]
+    assert ok["status"] == "completed"
+
+
+def test_oldest_finished_jobs_are_evicted_beyond_max_finished(make_manager):
+    manager = make_manager(workers=1, max_finished=2)
+    jobs = run_jobs(manager, [f"Goal {index}" for index in range(5)])
+
+    assert list(manager.jobs) == [job["id"] for job in jobs[-2:]]
+    assert set(manager._subscribers) == set(manager.jobs)
+
+
+def test_finished_jobs_expire_after_the_ttl(make_manager):
+    manager = make_manager(finished_ttl=0)
+    run_jobs(manager, ["Goal"])
+
+    assert manager.jobs == {}
+
+
+def test_jobs_cancelled_by_shutdown_report_cancelled(make_manager):
+    manager = make_manager()
+
+    async def run():
+        manager.start()
+        job = manager.submit("Slow goal", "sequential")
+        events = []
+
+        async def listen():
+            async for event in manager.subscribe(job["id"]):
+                events.append(event)
+
+        listener = asyncio.ensure_future(listen())
+        while job["project_id"] is None:
+            await asyncio.sleep(0.01)
+        await manager.stop()
+        await asyncio.wait_for(listener, 1)
+        return job, events
+
+    job, events = asyncio.run(run())
+    assert job["status"] == "cancelled"
+    assert events[-1]["type"] == "job_end" and events[-1]["status"] == "cancelled"
@@ -0,0 +1,53 @@
+from memory_manager import ComprehensiveMemory
+from tools import MemoryTools
+
+
+def make_tools(tmp_path):
+    memory = ComprehensiveMemory(str(tmp_path / "memory.json"))
+    memory.start_project("Launch a newsletter", "sequential")
+    return memory, MemoryTools(memory)
+
+
+def test_near_duplicate_of_open_task_is_rejected(tmp_path):
+    memory, tools = make_tools(tmp_path)
+    tools.create_task_tool("Draft the launch email for subscribers")
+
+    reply = tools.create_task_tool("Draft a launch email for the subscribers")
+
+    assert reply.startswith("⚠️ Duplicate rejected")
+    assert len(memory.get_pending_tasks()) == 1
+
+
+def test_reviewed_task_does_not_block_re_planning(tmp_path):
+    memory, tools = make_tools(tmp_path)
+    tools.create_task_tool("Draft the launch email for subscribers")
+    task_id = memory.get_pending_tasks()[0]["id"]
+    memory.complete_task(task_id, "draft")
+    memory.review_task(task_id, 40, "too long")
+
+    reply = tools.create_task_tool("Draft a launch email for the subscribers")
+
+    assert reply.startswith("✅ Created task")
+    assert len(memory.get_pending_tasks()) == 1
+
+
+def test_overview_and_stats_lines_are_not_indented(tmp_path):
+    memory, tools = make_tools(tmp_path)
+    tools.create_task_tool("Draft the launch email for subscribers")
+
+    for text in (tools.get_project_overview_tool(), tools.get_stats_tool()):
+        assert not any(line.startswith(" ") for line in text.splitlines())
+
+
+def test_task_ids_are_unique_across_projects(tmp_path):
+    memory, tools = make_tools(tmp_path)
+    other = memory.scoped()
+    other.start_project("Plan a conference", "sequential")
+    other_tools = MemoryTools(other)
+
+    for index in range(20):
+        tools.create_task_tool(f"Newsletter step {index}: " + "abcdefghijklmnopqrst"[index] * 5)
+        other_tools.create_task_tool(f"Conference step {index}: " + "abcdefghijklmnopqrst"[index] * 5)
+
+    ids = [task["id"] for task in memory.data["tasks"]]
+    assert len(ids) == len(set(ids)) == 40
@@ -6,130 +6,176 @@ Contains all the tools that agents can use to interact with the memory system
 import uuid
 from typing import List
 
-# This will be imported from main.py
-memory = None
-
-def set_memory_instance(memory_instance):
-    """Set the memory instance for tools to use"""
-    global memory
-    memory = memory_instance
-
-def create_task_tool(description: str) -> str:
-    """Tool for Planner to create tasks"""
-    import time
-    import random
-    task_id = f"task_{int(time.time())}_{random.randint(100, 999)}"
-    task = memory.add_task(task_id, description)
-    return f"✅ Created task: {task_id}\n{description}"
-
-def get_pending_tasks_tool() -> str:
-    """Tool to get all pending tasks"""
-    tasks = memory.get_pending_tasks()
-    if not tasks:
-        return "No pending tasks found."
+from task_dedup import find_duplicate, LLM_CALLS_PER_TASK
+
+# Minimum shingle similarity for a new task to count as a duplicate
+DUPLICATE_THRESHOLD = 0.6
+# Only tasks revise_task_tool can still change block a near-duplicate; reviewed work may be re-planned
+DEDUP_STATUSES = ("pending", "completed")
+
+TOOL_NAMES = [
+    "create_task_tool",
+    "revise_task_tool",
+    "cancel_task_tool",
+    "get_pending_tasks_tool",
+    "complete_task_tool",
+    "get_completed_tasks_tool",
+    "review_task_tool",
+    "get_reviewed_tasks_tool",
+    "create_summary_tool",
+    "generate_insight_tool",
+    "get_project_overview_tool",
+    "get_stats_tool"
+]
+
+class MemoryTools:
+    """All agent tools bound to one memory instance, so concurrent projects stay isolated"""
+    
+    def __init__(self, memory_instance):
+        self.memory = memory_instance
+    
+    def as_dict(self):
+        """Tools dictionary in the shape FourAgentSystem expects"""
+        return {name: getattr(self, name) for name in TOOL_NAMES}
+    
+    def create_task_tool(self, description: str) -> str:
+        """Tool for Planner to create tasks"""
+        # Reject near-duplicates locally instead of paying the Executor and Critic for each copy
+        existing = [t for t in self.memory.get_project_data()["tasks"] if t["status"] in DEDUP_STATUSES] if self.memory.current_project_id else []
+        duplicate = find_duplicate(description, existing, DUPLICATE_THRESHOLD)
+        if duplicate:
+            task, score = duplicate
+            self.memory.record_duplicate_task(task["id"], description, score, LLM_CALLS_PER_TASK)
+            return (f"⚠️ Duplicate rejected ({score:.0%} similar to {task['id']}): {task['description']}\n"
+                    f"No new task was created. Use revise_task_tool on {task['id']} if it needs changes.")
     
-    result = "📋 Pending Tasks:\n"
-    for i, task in enumerate(tasks, 1):
-        result += f"{i}. ID: {task['id']}\n   {task['description']}\n"
-    return result
-
-def complete_task_tool(task_id: str, result: str) -> str:
-    """Tool for Executor to complete tasks"""
-    success = memory.complete_task(task_id, result)
-    if success:
-        return f"✅ Completed task: {task_id}"
-    return f"❌ Failed to complete task: {task_id} (not found or not pending)"
-
-def get_completed_tasks_tool() -> str:
-    """Tool to get all completed tasks for review"""
-    tasks = memory.get_completed_tasks()
-    if not tasks:
-        return "No completed tasks found for review."
+        # Random IDs cannot collide between projects created in the same second
+        task_id = f"task_{uuid.uuid4().hex}"
+        task = self.memory.add_task(task_id, description)
+        return f"✅ Created task: {task_id}\n{description}"
+
+    def revise_task_tool(self, task_id: str, description: str) -> str:
+        """Tool for Planner to revise a task that has not been reviewed yet"""
+        success = self.memory.revise_task(task_id, description)
+        if success:
+            return f"✏️ Revised task: {task_id}\n{description}"
+        return f"❌ Failed to revise task: {task_id} (not found or already reviewed)"
+
+    def cancel_task_tool(self, task_id: str) -> str:
+        """Tool for Planner to cancel a redundant or obsolete task"""
+        success = self.memory.cancel_task(task_id)
+        if success:
+            return f"🗑️ Cancelled task: {task_id}"
+        return f"❌ Failed to cancel task: {task_id} (not found or already reviewed)"
+
+    def get_pending_tasks_tool(self) -> str:
+        """Tool to get all pending tasks"""
+        tasks = self.memory.get_pending_tasks()
+        if not tasks:
+            return "No pending tasks found."
     
-    result = "📋 Completed Tasks Ready for Review:\n"
-    for i, task in enumerate(tasks, 1):
-        result += f"{i}. ID: {task['id']}\n   Description: {task['description']}\n"
-        result += f"   Result: {task['result'][:100]}...\n" if len(task['result']) > 100 else f"   Result: {task['result']}\n"
-    return result
-
-def review_task_tool(task_id: str, score: int, feedback: str) -> str:
-    """Tool for Critic to review completed tasks"""
-    success = memory.review_task(task_id, score, feedback)
-    if success:
-        return f"✅ Reviewed task: {task_id}\nScore: {score}/100\nFeedback: {feedback}"
-    return f"❌ Failed to review task: {task_id} (not found or not completed)"
-
-def get_reviewed_tasks_tool() -> str:
-    """Tool to get all reviewed tasks for summarization"""
-    tasks = memory.get_reviewed_tasks()
-    if not tasks:
-        return "No reviewed tasks found for summarization."
+        result = "📋 Pending Tasks:\n"
+        for i, task in enumerate(tasks, 1):
+            result += f"{i}. ID: {task['id']}\n   {task['description']}\n"
+        return result
+
+    def complete_task_tool(self, task_id: str, result: str) -> str:
+        """Tool for Executor to complete tasks"""
+        success = self.memory.complete_task(task_id, result)
+        if success:
+            return f"✅ Completed task: {task_id}"
+        return f"❌ Failed to complete task: {task_id} (not found or not pending)"
+
+    def get_completed_tasks_tool(self) -> str:
+        """Tool to get all completed tasks for review"""
+        tasks = self.memory.get_completed_tasks()
+        if not tasks:
+            return "No completed tasks found for review."
     
-    result = "📋 Reviewed Tasks Ready for Summarization:\n"
-    for i, task in enumerate(tasks, 1):
-        result += f"{i}. ID: {task['id']}\n   Description: {task['description']}\n"
-        result += f"   Score: {task['review_score']}/100\n"
-        result += f"   Feedback: {task['review_feedback']}\n"
-    return result
-
-def create_summary_tool(summary_type: str, content: str, insights: str = "") -> str:
-    """Tool for Summariser to create project summaries"""
-    # Parse insights string into list
-    insight_list = []
-    if insights:
-        # Split by numbered list items or bullet points
-        if any(f"{i}." in insights for i in range(1, 10)):
-            # Numbered list
-            parts = insights.split("\n")
-            for part in parts:
-                if any(part.strip().startswith(f"{i}.") for i in range(1, 10)):
-                    cleaned = part.strip()
-                    # Remove the number prefix
-                    for i in range(1, 10):
-                        if cleaned.startswith(f"{i}."):
-                            cleaned = cleaned[len(f"{i}."):].strip()
-                            break
-                    insight_list.append(cleaned)
-        elif "•" in insights or "-" in insights:
-            # Bullet points
-            parts = insights.split("\n")
-            for part in parts:
-                if part.strip().startswith("•") or part.strip().startswith("-"):
-                    cleaned = part.strip()[1:].strip()  # Remove bullet and trim
-                    insight_list.append(cleaned)
-        else:
-            # Just split by lines
-            insight_list = [line.strip() for line in insights.split("\n") if line.strip()]
+        result = "📋 Completed Tasks Ready for Review:\n"
+        for i, task in enumerate(tasks, 1):
+            result += f"{i}. ID: {task['id']}\n   Description: {task['description']}\n"
+            result += f"   Result: {task['result'][:100]}...\n" if len(task['result']) > 100 else f"   Result: {task['result']}\n"
+        return result
+
+    def review_task_tool(self, task_id: str, score: int, feedback: str) -> str:
+        """Tool for Critic to review completed tasks"""
+        success = self.memory.review_task(task_id, score, feedback)
+        if success:
+            return f"✅ Reviewed task: {task_id}\nScore: {score}/100\nFeedback: {feedback}"
+        return f"❌ Failed to review task: {task_id} (not found or not completed)"
+
+    def get_reviewed_tasks_tool(self) -> str:
+        """Tool to get all reviewed tasks for summarization"""
+        tasks = self.memory.get_reviewed_tasks()
+        if not tasks:
+            return "No reviewed tasks found for summarization."
     
-    # Create the summary
-    summary = memory.add_summary(summary_type, content, insight_list)
+        result = "📋 Reviewed Tasks Ready for Summarization:\n"
+        for i, task in enumerate(tasks, 1):
+            result += f"{i}. ID: {task['id']}\n   Description: {task['description']}\n"
+            result += f"   Score: {task['review_score']}/100\n"
+            result += f"   Feedback: {task['review_feedback']}\n"
+        return result
+
+    def create_summary_tool(self, summary_type: str, content: str, insights: str = "") -> str:
+        """Tool for Summariser to create project summaries"""
+        # Parse insights string into list
+        insight_list = []
+        if insights:
+            # Split by numbered list items or bullet points
+            if any(f"{i}." in insights for i in range(1, 10)):
+                # Numbered list
+                parts = insights.split("\n")
+                for part in parts:
+                    if any(part.strip().startswith(f"{i}.") for i in range(1, 10)):
+                        cleaned = part.strip()
+                        # Remove the number prefix
+                        for i in range(1, 10):
+                            if cleaned.startswith(f"{i}."):
+                                cleaned = cleaned[len(f"{i}."):].strip()
+                                break
+                        insight_list.append(cleaned)
+            elif "•" in insights or "-" in insights:
+                # Bullet points
+                parts = insights.split("\n")
+                for part in parts:
+                    if part.strip().startswith("•") or part.strip().startswith("-"):
+                        cleaned = part.strip()[1:].strip()  # Remove bullet and trim
+                        insight_list.append(cleaned)
+            else:
+                # Just split by lines
+                insight_list = [line.strip() for line in insights.split("\n") if line.strip()]
     
-    return f"✅ Created {summary_type} summary with {len(insight_list)} insights"
-
-def generate_insight_tool(insight: str, category: str = "general") -> str:
-    """Tool for Summariser to generate system insights"""
-    memory.add_system_insight(insight, category)
-    return f"✅ Added system insight: {insight} (category: {category})"
-
-def get_project_overview_tool() -> str:
-    """Tool to get current project overview"""
-    project_data = memory.get_project_data()
-    if not project_data:
-        return "No active project found."
+        # Create the summary
+        summary = self.memory.add_summary(summary_type, content, insight_list)
     
-    project = project_data["project"]
-    tasks = project_data["tasks"]
-    reviews = project_data["reviews"]
+        return f"✅ Created {summary_type} summary with {len(insight_list)} insights"
+
+    def generate_insight_tool(self, insight: str, category: str = "general") -> str:
+        """Tool for Summariser to generate system insights"""
+        self.memory.add_system_insight(insight, category)
+        return f"✅ Added system insight: {insight} (category: {category})"
+
+    def get_project_overview_tool(self) -> str:
+        """Tool to get current project overview"""
+        project_data = self.memory.get_project_data()
+        if not project_data:
+            return "No active project found."
     
-    # Calculate metrics
-    pending_tasks = [t for t in tasks if t["status"] == "pending"]
-    completed_tasks = [t for t in tasks if t["status"] == "completed"]
-    reviewed_tasks = [t for t in tasks if t["status"] == "reviewed"]
+        project = project_data["project"]
+        tasks = project_data["tasks"]
+        reviews = project_data["reviews"]
     
-    # Calculate average score safely to avoid division by zero
-    avg_score = sum(r['score'] for r in reviews) / len(reviews) if reviews else 0
+        # Calculate metrics
+        pending_tasks = [t for t in tasks if t["status"] == "pending"]
+        completed_tasks = [t for t in tasks if t["status"] == "completed"]
+        reviewed_tasks = [t for t in tasks if t["status"] == "reviewed"]
     
-    result = f"""📊 Project Overview: {project['goal']}
+        # Calculate average score safely to avoid division by zero
+        avg_score = sum(r['score'] for r in reviews) / len(reviews) if reviews else 0
+    
+        result = f"""📊 Project Overview: {project['goal']}
 ID: {project['id']}
 Status: {project['status']}
 Workflow: {project['workflow_type']}
@@ -144,13 +190,13 @@ Tasks: {len(tasks)} total
 Reviews: {len(reviews)} completed
 Average Score: {avg_score:.1f}/100
 """
-    return result
+        return result
 
-def get_stats_tool() -> str:
-    """Tool to get comprehensive system statistics"""
-    stats = memory.get_comprehensive_stats()
+    def get_stats_tool(self) -> str:
+        """Tool to get comprehensive system statistics"""
+        stats = self.memory.get_comprehensive_stats()
     
-    result = f"""📊 Comprehensive System Statistics:
+        result = f"""📊 Comprehensive System Statistics:
 
 🏗️ Projects:
 - Total: {stats['projects']['total']}
@@ -174,4 +220,32 @@ def get_stats_tool() -> str:
 - Summaries: {stats['activity']['summaries']}
 - Insights: {stats['activity']['insights']}"""
     
-    return result
+        return result
+
+
+def build_tools(memory_instance):
+    """Create the tools dictionary for a memory instance"""
+    return MemoryTools(memory_instance).as_dict()
+
+# Module-level tools bound to the instance passed to set_memory_instance (used by main.py)
+_default_tools = MemoryTools(None)
+memory = None
+
+def set_memory_instance(memory_instance):
+    """Set the memory instance for tools to use"""
+    global memory
+    memory = memory_instance
+    _default_tools.memory = memory_instance
+
+create_task_tool = _default_tools.create_task_tool
+revise_task_tool = _default_tools.revise_task_tool
+cancel_task_tool = _default_tools.cancel_task_tool
+get_pending_tasks_tool = _default_tools.get_pending_tasks_tool
+complete_task_tool = _default_tools.complete_task_tool
+get_completed_tasks_tool = _default_tools.get_completed_tasks_tool
+review_task_tool = _default_tools.review_task_tool
+get_reviewed_tasks_tool = _default_tools.get_reviewed_tasks_tool
+create_summary_tool = _default_tools.create_summary_tool
+generate_insight_tool = _default_tools.generate_insight_tool
+get_project_overview_tool = _default_tools.get_project_overview_tool
+get_stats_tool = _default_tools.get_stats_tool
@@ -1,105 +1,17 @@
 import os
 import sys
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 
-# Import AutoGen components
-from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-
-# Import our tools
-from tools.weather_tool import get_weather
-from tools.calculator_tool import calculate
-from tools.currency_tool import convert_currency
 from tools.tool_manager import ToolManager
 
-# Configure logging - file only for detailed logs
-os.makedirs('logs', exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("logs/agent.log"),
-    ]
-)
+# Handlers are set up by the entry point via tools.logging_config.configure_logging
 logger = logging.getLogger("MultiToolAgent")
 
-# Suppress unnecessary AutoGen logs
-logging.getLogger('autogen').setLevel(logging.WARNING)
-logging.getLogger('autogen_agentchat').setLevel(logging.WARNING)
-
-# Load OpenAI API key from environment variables
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY environment variable not set")
-
-# Initialize the tool manager
-tool_manager = ToolManager()
-
-# Register tools with descriptions
-tool_manager.register_tool(
-    "get_weather", 
-    get_weather, 
-    "Get current weather information for a specified city"
-)
-
-tool_manager.register_tool(
-    "calculate", 
-    calculate, 
-    "Evaluate a mathematical expression and return the result"
-)
-
-tool_manager.register_tool(
-    "convert_currency", 
-    convert_currency, 
-    "Convert an amount from one currency to another using exchange rates"
-)
-
-# Create wrapper functions that log reasoning through the tool manager
-def weather_with_reasoning(city: str, reasoning: str) -> str:
-    """Wrapper for weather tool that logs reasoning"""
-    return tool_manager.execute_tool("get_weather", reasoning, city=city)
-
-def calculate_with_reasoning(expression: str, reasoning: str) -> str:
-    """Wrapper for calculator tool that logs reasoning"""
-    return tool_manager.execute_tool("calculate", reasoning, expression=expression)
-
-def currency_with_reasoning(amount: float, from_currency: str, to_currency: str, reasoning: str) -> str:
-    """Wrapper for currency tool that logs reasoning"""
-    return tool_manager.execute_tool(
-        "convert_currency", 
-        reasoning, 
-        amount=amount, 
-        from_currency=from_currency, 
-        to_currency=to_currency
-    )
-
-# Define the model client using GPT-4o with the OpenAI API key
-model_client = OpenAIChatCompletionClient(
-    model="gpt-4o",
-    api_key=OPENAI_API_KEY,
-)
+# Importing this module has no side effects: the heavy AutoGen and HTTP modules are
+# only imported by create_agent / create_tool_manager (or warm_up_imports).
 
-# Create the system message with tool descriptions
-available_tools = tool_manager.get_available_tools()
-tool_descriptions = "\n".join([f"- {name}: {desc}" for name, desc in available_tools.items()])
-
-# Custom print function for cleaner output
-def pretty_print(message, role="assistant"):
-    """Print messages in a more readable format"""
-    if role == "assistant":
-        prefix = "\n💬 Assistant: "
-    elif role == "system":
-        prefix = "\n🔔 System: "
-    elif role == "user":
-        prefix = "\n👤 User: "
-    else:
-        prefix = "\n💬 "
-    
-    print(f"{prefix}{message}\n")
-    sys.stdout.flush()
-
-system_message = f"""
+SYSTEM_MESSAGE_TEMPLATE = """
 You are a helpful assistant with access to multiple tools. You can reason step-by-step to select the most appropriate tool for a given task.
 
 Available tools:
@@ -117,39 +29,296 @@ Always explain your reasoning out loud before and after using a tool. Be transpa
 Keep your responses concise and focused. Avoid unnecessary verbosity.
 """
 
-# Initialize the assistant agent with tool use and reasoning capabilities
-assistant = AssistantAgent(
-    name="multi_tool_assistant",
-    model_client=model_client,
-    tools=[
-        weather_with_reasoning,
-        calculate_with_reasoning,
-        currency_with_reasoning
-    ],
-    system_message=system_message,
-    reflect_on_tool_use=True,
-    model_client_stream=True
-)
-
-def get_tool_usage_summary() -> Dict[str, Any]:
+def warm_up_imports() -> None:
+    """
+    Import the AutoGen, OpenAI and tool modules ahead of time (e.g. in a
+    background thread while the CLI waits for input). Import errors are left
+    for create_agent to report.
+    """
+    try:
+        import tools.weather_tool  # noqa: F401
+        import tools.currency_tool  # noqa: F401
+        import tools.calculator_tool  # noqa: F401
+        import autogen_agentchat.agents  # noqa: F401
+        import autogen_agentchat.ui  # noqa: F401
+        import autogen_ext.models.openai  # noqa: F401
+    except ImportError:
+        pass
+
+def create_tool_manager(**options) -> ToolManager:
+    """
+    Create a ToolManager with the weather, calculator and currency tools registered.
+
+    Args:
+        **options: Overrides for the ToolManager constructor
+
+    Returns:
+        ToolManager: Tool manager with caches and resilience policies configured
     """
-    Get a summary of tool usage statistics and execution history.
-    
+    from tools.weather_tool import get_weather, get_weather_many
+    from tools.calculator_tool import calculate, calculate_table
+    from tools.currency_tool import (
+        convert_currency, convert_currency_batch, convert_with_mock_rates, convert_batch_with_mock_rates
+    )
+    from tools.tool_resilience import ToolPolicy
+
+    # Recent history in memory, full history in a rotating JSONL file
+    tool_manager = ToolManager(**{
+        "history_capacity": int(os.getenv("TOOL_HISTORY_CAPACITY", "1000")),
+        "history_file": os.getenv("TOOL_HISTORY_FILE", "logs/tool_history.jsonl"),
+        "max_workers": int(os.getenv("TOOL_MAX_WORKERS", "8")),
+        **options
+    })
+
+    # Upstream calls get a timeout, jittered retries, a hedged second request when the
+    # first is slow (TOOL_HEDGE_AFTER seconds, 0 disables) and a circuit breaker.
+    # An open circuit answers from the last cached result or, for currency, the mock rates.
+    hedge_after = float(os.getenv("TOOL_HEDGE_AFTER", "2.0")) or None
+    weather_policy = ToolPolicy(timeout=12, retries=2, hedge_after=hedge_after)
+    currency_policy = ToolPolicy(
+        timeout=12,
+        retries=2,
+        hedge_after=hedge_after,
+        is_failure=lambda result: result.startswith("Error converting currency"),
+        fallback=convert_with_mock_rates
+    )
+    currency_batch_policy = ToolPolicy(
+        timeout=12,
+        retries=2,
+        hedge_after=hedge_after,
+        is_failure=lambda result: result.startswith("Error converting currency"),
+        fallback=convert_batch_with_mock_rates
+    )
+
+    # Register tools with descriptions; results are memoized per tool
+    # (weather for 10 minutes, exchange rates for an hour, calculations forever).
+    # The currency tools also share one cached rate table, so a cache miss here
+    # is computed locally unless the table itself has expired.
+    tool_manager.register_tool(
+        "get_weather",
+        get_weather,
+        "Get current weather information for a specified city",
+        cache=True,
+        cache_ttl=600,
+        policy=weather_policy
+    )
+
+    tool_manager.register_tool(
+        "get_weather_many",
+        get_weather_many,
+        "Get current weather for several cities at once (fetched concurrently), e.g. for travel planning",
+        cache=True,
+        cache_ttl=600,
+        cache_max_entries=128,
+        policy=weather_policy
+    )
+
+    tool_manager.register_tool(
+        "calculate",
+        calculate,
+        "Evaluate a mathematical expression and return the result",
+        cache=True,
+        cache_ttl=None,
+        cache_max_entries=1024
+    )
+
+    tool_manager.register_tool(
+        "calculate_table",
+        calculate_table,
+        "Evaluate one expression for many variable values at once (what-if tables) and return one result per row",
+        cache=True,
+        cache_ttl=None,
+        cache_max_entries=256
+    )
+
+    tool_manager.register_tool(
+        "convert_currency",
+        convert_currency,
+        "Convert an amount from one currency to another using exchange rates",
+        cache=True,
+        cache_ttl=3600,
+        policy=currency_policy
+    )
+
+    tool_manager.register_tool(
+        "convert_currency_batch",
+        convert_currency_batch,
+        "Convert many amounts between currencies in one call (one rate table, computed locally)",
+        cache=True,
+        cache_ttl=3600,
+        cache_max_entries=256,
+        policy=currency_batch_policy
+    )
+    return tool_manager
+
+def create_tool_functions(tool_manager: ToolManager) -> List:
+    """
+    Create the async tool functions exposed to the model, bound to a tool manager.
+
+    The blocking tools run on the tool manager's thread pool, so the event loop
+    stays free and parallel tool calls from one model turn run concurrently.
+
+    Args:
+        tool_manager (ToolManager): Tool manager that executes and logs the calls
+
     Returns:
-        Dict[str, Any]: Summary of tool usage
+        List: Wrapper functions that log reasoning through the tool manager
     """
-    return {
-        "usage_stats": tool_manager.get_usage_stats(),
-        "execution_count": len(tool_manager.get_execution_history()),
-        "last_executions": tool_manager.get_execution_history()[-5:] if tool_manager.get_execution_history() else []
-    }
+    async def weather_with_reasoning(city: str, reasoning: str) -> str:
+        """Wrapper for weather tool that logs reasoning"""
+        return await tool_manager.execute_tool_async("get_weather", reasoning, city=city)
+
+    async def weather_many_with_reasoning(cities: List[str], reasoning: str) -> str:
+        """Wrapper for the batch weather tool: use it instead of repeated get_weather calls for several cities"""
+        return await tool_manager.execute_tool_async("get_weather_many", reasoning, cities=cities)
+
+    async def calculate_with_reasoning(expression: str, reasoning: str) -> str:
+        """Wrapper for calculator tool that logs reasoning"""
+        return await tool_manager.execute_tool_async("calculate", reasoning, expression=expression)
+
+    async def table_with_reasoning(expression: str, variables: Dict[str, List[float]], reasoning: str) -> str:
+        """Wrapper for the batch calculator: evaluates the expression once per row of variable values"""
+        return await tool_manager.execute_tool_async(
+            "calculate_table",
+            reasoning,
+            expression=expression,
+            variables=variables
+        )
 
-def export_execution_history(file_path: str = "logs/execution_history.json") -> None:
+    async def currency_with_reasoning(amount: float, from_currency: str, to_currency: str, reasoning: str) -> str:
+        """Wrapper for currency tool that logs reasoning"""
+        return await tool_manager.execute_tool_async(
+            "convert_currency",
+            reasoning,
+            amount=amount,
+            from_currency=from_currency,
+            to_currency=to_currency
+        )
+
+    async def currency_batch_with_reasoning(conversions: List[Dict[str, Any]], reasoning: str) -> str:
+        """Wrapper for the batch currency tool: each item has amount, from_currency and to_currency"""
+        return await tool_manager.execute_tool_async("convert_currency_batch", reasoning, conversions=conversions)
+
+    return [weather_with_reasoning, weather_many_with_reasoning, calculate_with_reasoning,
+            table_with_reasoning, currency_with_reasoning, currency_batch_with_reasoning]
+
+class MultiToolAgent:
     """
-    Export the full execution history to a JSON file.
-    
+    The assistant agent together with the model client, rate limiter and tool manager it uses.
+    """
+
+    def __init__(self, assistant, model_client, tool_manager: ToolManager, rate_limiter):
+        self.assistant = assistant
+        self.model_client = model_client
+        self.tool_manager = tool_manager
+        self.rate_limiter = rate_limiter
+
+    def get_tool_usage_summary(self) -> Dict[str, Any]:
+        """
+        Get a summary of tool usage statistics and execution history.
+
+        Returns:
+            Dict[str, Any]: Summary of tool usage
+        """
+        history = self.tool_manager.get_execution_history()
+        return {
+            "usage_stats": self.tool_manager.get_usage_stats(),
+            "cache_stats": self.tool_manager.get_cache_stats(),
+            "latency": self.tool_manager.get_latency_stats(),
+            "circuit_breakers": self.tool_manager.get_resilience_stats(),
+            "rate_limiter": self.rate_limiter.get_stats(),
+            "execution_count": self.tool_manager.execution_count,
+            "last_executions": history[-5:]
+        }
+
+    def export_execution_history(self, file_path: str = "logs/execution_history.jsonl") -> None:
+        """
+        Export the recent execution history to a JSONL file.
+
+        Args:
+            file_path (str): Path to save the JSONL file
+        """
+        self.tool_manager.export_execution_history(file_path)
+        logger.info("Exported execution history to %s", file_path)
+
+    def export_metrics(self, file_path: str = "logs/tool_metrics.prom") -> str:
+        """
+        Write tool latency histograms, error and cache-hit counters in Prometheus text format.
+
+        Args:
+            file_path (str): Path to save the metrics file
+
+        Returns:
+            str: The exported metrics text
+        """
+        return self.tool_manager.export_prometheus(file_path)
+
+    async def close(self) -> None:
+        """
+        Close the model client and stop the tool worker pool.
+        """
+        await self.model_client.close()
+        self.tool_manager.shutdown()
+
+def create_agent(api_key: Optional[str] = None, model: str = "gpt-4o",
+                 tool_manager: Optional[ToolManager] = None, rate_limiter=None) -> MultiToolAgent:
+    """
+    Build the multi-tool assistant.
+
     Args:
-        file_path (str): Path to save the JSON file
+        api_key (Optional[str]): OpenAI API key (defaults to OPENAI_API_KEY)
+        model (str): OpenAI model name
+        tool_manager (Optional[ToolManager]): Tool manager to use (defaults to create_tool_manager())
+        rate_limiter: Rate limiter for model calls (defaults to the shared one)
+
+    Returns:
+        MultiToolAgent: The assembled agent
     """
-    tool_manager.export_execution_history(file_path)
-    logger.info(f"Exported execution history to {file_path}")
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable not set")
+
+    # Import AutoGen components
+    from autogen_agentchat.agents import AssistantAgent
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+    from shared.rate_limiter import RateLimitedChatClient, get_shared_rate_limiter
+
+    tool_manager = tool_manager or create_tool_manager()
+    rate_limiter = rate_limiter or get_shared_rate_limiter()
+
+    # 429 retries are handled by the shared rate limiter instead of the OpenAI SDK
+    model_client = OpenAIChatCompletionClient(
+        model=model,
+        api_key=api_key,
+        max_retries=0,
+    )
+
+    # Create the system message with tool descriptions
+    available_tools = tool_manager.get_available_tools()
+    tool_descriptions = "\n".join([f"- {name}: {desc}" for name, desc in available_tools.items()])
+
+    # Initialize the assistant agent with tool use and reasoning capabilities
+    assistant = AssistantAgent(
+        name="multi_tool_assistant",
+        model_client=RateLimitedChatClient(model_client, rate_limiter),
+        tools=create_tool_functions(tool_manager),
+        system_message=SYSTEM_MESSAGE_TEMPLATE.format(tool_descriptions=tool_descriptions),
+        reflect_on_tool_use=True,
+        model_client_stream=True
+    )
+    return MultiToolAgent(assistant, model_client, tool_manager, rate_limiter)
+
+# Custom print function for cleaner output
+def pretty_print(message, role="assistant"):
+    """Print messages in a more readable format"""
+    if role == "assistant":
+        prefix = "\n💬 Assistant: "
+    elif role == "system":
+        prefix = "\n🔔 System: "
+    elif role == "user":
+        prefix = "\n👤 User: "
+    else:
+        prefix = "\n💬 "
+
+    print(f"{prefix}{message}\n")
+    sys.stdout.flush()
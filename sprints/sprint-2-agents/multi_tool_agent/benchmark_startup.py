@@ -0,0 +1,93 @@
+"""
+Cold-start benchmark for the multi-tool agent.
+
+Measures, over several fresh processes:
+- time-to-first-prompt: from process launch until main.py shows the input prompt
+- import time of agent.py
+- time to build the agent with create_agent() (skipped if AutoGen is not installed)
+
+Usage: python benchmark_startup.py [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROMPT = "What would you like to know?"
+
+def time_to_first_prompt(env) -> float:
+    """
+    Launch main.py and return the seconds until the prompt appears on stdout.
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=HERE,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    output = b""
+    try:
+        while PROMPT.encode() not in output:
+            chunk = process.stdout.read1(1024)
+            if not chunk:
+                raise RuntimeError(f"main.py exited before showing the prompt: {output.decode(errors='replace')}")
+            output += chunk
+        return time.perf_counter() - started
+    finally:
+        process.kill()
+        process.wait()
+
+def time_in_subprocess(code: str, env) -> float:
+    """
+    Run a snippet in a fresh interpreter; it must print its own elapsed seconds.
+    """
+    result = subprocess.run([sys.executable, "-c", code], cwd=HERE, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed")
+    return float(result.stdout.strip().splitlines()[-1])
+
+IMPORT_AGENT = """
+import time
+started = time.perf_counter()
+import agent
+print(time.perf_counter() - started)
+"""
+
+CREATE_AGENT = """
+import time
+started = time.perf_counter()
+from agent import create_agent
+create_agent(api_key="sk-benchmark")
+print(time.perf_counter() - started)
+"""
+
+def report(name: str, samples) -> None:
+    print(f"{name:<24} median {statistics.median(samples) * 1000:8.1f} ms   "
+          f"min {min(samples) * 1000:8.1f} ms   max {max(samples) * 1000:8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure multi-tool agent cold start")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement")
+    args = parser.parse_args()
+
+    env = {**os.environ, "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "sk-benchmark"), "PYTHONUNBUFFERED": "1"}
+    # The snippets import agent.py directly, so give them the shared package the way main.py does
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(HERE), os.getenv("PYTHONPATH")]))
+
+    print(f"Cold start over {args.runs} runs ({sys.executable})\n")
+    report("time-to-first-prompt", [time_to_first_prompt(env) for _ in range(args.runs)])
+    report("import agent", [time_in_subprocess(IMPORT_AGENT, env) for _ in range(args.runs)])
+    try:
+        report("create_agent()", [time_in_subprocess(CREATE_AGENT, env) for _ in range(args.runs)])
+    except RuntimeError as e:
+        print(f"{'create_agent()':<24} skipped: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,183 @@
+import argparse
 import asyncio
 import os
-import logging
-from agent import assistant, model_client, get_tool_usage_summary, export_execution_history, pretty_print
-from autogen_agentchat.ui import Console
+import statistics
+import sys
+import threading
+import time
+from dotenv import load_dotenv
 
-# Configure logging to reduce verbosity
-logging.basicConfig(level=logging.WARNING)
-for logger_name in ['httpx', 'autogen', 'autogen_core.events', 'autogen_agentchat']:
-    logging.getLogger(logger_name).setLevel(logging.WARNING)
+# The weather tool and the rate limiter come from the sprint-level shared package
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
-async def main():
-    """
-    Main function to run the multi-tool agent.
-    """
+from tools.logging_config import configure_logging, shutdown_logging
+from agent import create_agent, warm_up_imports, pretty_print
+
+EXIT_COMMANDS = {"exit", "quit", ":q"}
+PROMPT = "\n🔍 What would you like to know? "
+
+def print_banner():
     print("\n" + "=" * 60)
     print("🤖 MULTI-TOOL AGENT WITH AUTOGEN 🤖".center(60))
     print("=" * 60)
     print("\nThis agent can use multiple tools and logs its reasoning process.")
     print("\nAvailable tools:")
-    print("  🌤️  Weather - Get current weather for any city")
-    print("  🧮  Calculator - Evaluate mathematical expressions")
-    print("  💱  Currency - Convert between different currencies")
+    print("  🌤️  Weather - Get current weather for any city (or several at once)")
+    print("  🧮  Calculator - Evaluate mathematical expressions (or whole what-if tables)")
+    print("  💱  Currency - Convert between different currencies (one or many at once)")
+    print("\nCommands: 'stats' shows the tool summary, 'reset' clears the conversation, 'exit' quits.")
     print("\n" + "-" * 60)
-    
-    # Get user input
-    user_input = input("\n🔍 What would you like to know? ").strip()
-    print(f"\n👤 User: {user_input}\n")
-    print("-" * 60 + "\n")
-    
-    # Run the assistant with the user's task
-    await Console(assistant.run_stream(task=user_input))
-    
-    # Print tool usage summary
+
+def print_summary(agent):
+    """
+    Print tool usage, latency and circuit breaker state.
+    """
     print("\n" + "-" * 60)
     print("\n📊 TOOL USAGE SUMMARY")
-    summary = get_tool_usage_summary()
+    summary = agent.get_tool_usage_summary()
     for tool, count in summary["usage_stats"].items():
         tool_name = tool.replace('_', ' ').title()
         emoji = "🌤️" if "weather" in tool else "🧮" if "calculate" in tool else "💱" if "currency" in tool else "🛠️"
-        print(f"  {emoji}  {tool_name}: {count} uses")
+        cache_hits = summary["cache_stats"].get(tool, {}).get("hits", 0)
+        print(f"  {emoji}  {tool_name}: {count} uses" + (f", {cache_hits} cached" if cache_hits else ""))
     
-    # Export execution history
-    export_execution_history("logs/execution_history.json")
+    # Print tail latency per tool
+    print("\n⏱️  TOOL LATENCY (executed calls)")
+    for tool, stats in summary["latency"].items():
+        tool_name = tool.replace('_', ' ').title()
+        if stats["count"]:
+            print(f"  {tool_name}: p50 {stats['p50'] * 1000:.0f}ms, p95 {stats['p95'] * 1000:.0f}ms, "
+                  f"p99 {stats['p99'] * 1000:.0f}ms, max {stats['max'] * 1000:.0f}ms "
+                  f"({stats['count']} calls, {stats['errors']} errors, {stats['cache_hits']} cache hits, "
+                  f"{stats['coalesced']} coalesced)")
+        elif stats["cache_hits"]:
+            print(f"  {tool_name}: {stats['cache_hits']} cache hits")
     
-    # Close the model client
-    await model_client.close()
+    # Print circuit breaker state for upstream tools
+    for tool, breaker in summary["circuit_breakers"].items():
+        if breaker["state"] != "closed" or breaker["fallbacks"] or breaker["timeouts"]:
+            print(f"  ⚡ {tool.replace('_', ' ').title()}: circuit {breaker['state']}, {breaker['retries']} retries, "
+                  f"{breaker['timeouts']} timeouts, {breaker['hedges']} hedges, {breaker['fallbacks']} fallbacks")
+
+def read_queries(path: str):
+    """
+    Read one query per line from a file ('-' for stdin), skipping blank lines and # comments.
+    """
+    stream = sys.stdin if path == "-" else open(path, 'r')
+    try:
+        for line in stream:
+            query = line.strip()
+            if query and not query.startswith("#"):
+                yield query
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+class Session:
+    """
+    Keeps one agent (model client connection pool, tool caches, ToolManager and
+    conversation) alive across many queries and tracks per-query latency.
+    """
+    
+    def __init__(self):
+        self.agent = None
+        self.latencies = []
+    
+    async def ask(self, query: str) -> float:
+        """
+        Run one query through the assistant and return its latency in seconds.
+        """
+        from autogen_agentchat.ui import Console
+        if self.agent is None:
+            self.agent = create_agent()
+        
+        print(f"\n👤 User: {query}\n")
+        print("-" * 60 + "\n")
+        started = time.perf_counter()
+        await Console(self.agent.assistant.run_stream(task=query))
+        latency = time.perf_counter() - started
+        self.latencies.append(latency)
+        print(f"\n⏱️  {latency:.2f}s (query {len(self.latencies)})")
+        return latency
+    
+    async def reset(self):
+        """
+        Clear the conversation but keep clients, caches and stats.
+        """
+        if self.agent is not None:
+            from autogen_core import CancellationToken
+            await self.agent.assistant.on_reset(CancellationToken())
+    
+    async def close(self):
+        """
+        Print the summary, export history and metrics and close the agent.
+        """
+        if self.agent is None:
+            return
+        print_summary(self.agent)
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            print(f"\n🕒 {len(ordered)} queries: median {statistics.median(ordered):.2f}s, "
+                  f"max {ordered[-1]:.2f}s, total {sum(ordered):.2f}s")
+        
+        # Export execution history and metrics
+        self.agent.export_metrics("logs/tool_metrics.prom")
+        self.agent.export_execution_history("logs/execution_history.jsonl")
+        
+        # Close the model client and the tool worker pool
+        await self.agent.close()
+
+async def main(args):
+    """
+    Main function to run the multi-tool agent.
+    """
+    session = Session()
+    try:
+        if args.file:
+            # Non-interactive: run every query from the file or stdin in one session
+            for query in read_queries(args.file):
+                await session.ask(query)
+            return
+        
+        print_banner()
+        
+        # Load the heavy modules while the user types
+        threading.Thread(target=warm_up_imports, daemon=True).start()
+        
+        while True:
+            # Read input off the event loop thread
+            try:
+                user_input = (await asyncio.to_thread(input, PROMPT)).strip()
+            except EOFError:
+                break
+            if not user_input:
+                continue
+            if user_input.lower() in EXIT_COMMANDS:
+                break
+            if user_input.lower() == "stats":
+                if session.agent is not None:
+                    print_summary(session.agent)
+                continue
+            if user_input.lower() == "reset":
+                await session.reset()
+                print("🔄 Conversation cleared")
+                continue
+            
+            await session.ask(user_input)
+            if args.once:
+                break
+    finally:
+        await session.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-tool agent: interactive session by default")
+    parser.add_argument("--file", "-f", help="Run the queries in this file (one per line, '-' for stdin) and exit")
+    parser.add_argument("--once", action="store_true", help="Answer a single interactive query and exit")
+    args = parser.parse_args()
+    
+    # The tools load .env only when they are first imported, which is after this check
+    load_dotenv()
+    
     # Check if API keys are set
     if not os.getenv("OPENAI_API_KEY"):
         print("\n⚠️  OPENAI_API_KEY environment variable not set.")
@@ -54,9 +185,18 @@ if __name__ == "__main__":
         print("\n" + "-" * 60)
         exit(1)
     
+    # Configure logging before the agent registers its tools. By default a background
+    # listener thread does all log I/O; set TOOL_LOG_QUEUE=0 to log synchronously.
+    configure_logging(use_queue=os.getenv("TOOL_LOG_QUEUE", "1") != "0")
+    
     try:
         # Run the main function
-        asyncio.run(main())
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        print("\n👋 Bye")
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
         print("\n" + "-" * 60)
+    finally:
+        # Flush queued log records and stop the listener thread
+        shutdown_logging()
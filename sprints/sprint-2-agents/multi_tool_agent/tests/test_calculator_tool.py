@@ -0,0 +1,25 @@
+import time
+
+import pytest
+
+from tools.calculator_tool import calculate, compile_expression, evaluate_batch
+
+
+@pytest.mark.parametrize("expression", ["9**9**9", "(9**10000)**10000", "factorial(10**6)", "factorial(3000)**50"])
+def test_huge_integer_results_are_rejected_quickly(expression):
+    started = time.perf_counter()
+    assert calculate(expression).startswith("Error calculating: ")
+    assert time.perf_counter() - started < 1
+
+
+def test_moderate_powers_and_factorials_still_work():
+    assert compile_expression("2**100")() == 2 ** 100
+    assert compile_expression("factorial(20)")() == 2432902008176640000
+    assert compile_expression("(-3)**3")() == -27
+    assert compile_expression("2**-2")() == 0.25
+
+
+def test_numpy_backend_shares_the_guard():
+    with pytest.raises(ValueError):
+        evaluate_batch("x + (9**10000)**10000", {"x": [1.0, 2.0]})
+    assert list(evaluate_batch("x ** 2", {"x": [1.0, 3.0]})) == [1.0, 9.0]
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from tools.currency_tool import ExchangeRateCache, RateTable, mock_rate_provider
+
+
+class FlakyProvider:
+    """Counts calls; fails while `down` is set and can be slowed down"""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.down = False
+        self.delay = delay
+
+    def __call__(self, base):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.down:
+            raise RuntimeError("provider down")
+        return mock_rate_provider(base)
+
+
+def test_concurrent_misses_fetch_the_table_once():
+    provider = FlakyProvider(delay=0.05)
+    cache = ExchangeRateCache(provider, ttl=60)
+
+    threads = [threading.Thread(target=cache.get_table) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert provider.calls == 1
+    assert cache.get_table().rate("EUR", "EUR") == 1.0
+
+
+def test_stale_table_is_served_and_provider_backs_off_after_a_failure():
+    provider = FlakyProvider()
+    cache = ExchangeRateCache(provider, ttl=60, retry_after=60)
+    stale = cache.get_table()
+    stale.fetched_at -= 120
+    provider.down = True
+
+    for _ in range(5):
+        assert cache.get_table() is stale
+    assert provider.calls == 2 and cache.failures == 1
+
+
+def test_expired_table_is_served_while_another_caller_refreshes():
+    provider = FlakyProvider()
+    cache = ExchangeRateCache(provider, ttl=60)
+    stale = cache.get_table()
+    stale.fetched_at -= 120
+    provider.delay = 0.3
+
+    refresher = threading.Thread(target=cache.get_table)
+    refresher.start()
+    time.sleep(0.05)
+    started = time.perf_counter()
+    assert cache.get_table() is stale
+    assert time.perf_counter() - started < 0.1
+    refresher.join()
+    assert cache.get_table() is not stale
+
+
+def test_failure_without_a_table_is_raised_again_until_retry_after():
+    provider = FlakyProvider()
+    provider.down = True
+    cache = ExchangeRateCache(provider, ttl=60, retry_after=0.1)
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            cache.get_table()
+    assert provider.calls == 1
+
+    provider.down = False
+    time.sleep(0.15)
+    assert isinstance(cache.get_table(), RateTable)
+    assert provider.calls == 2
+
+
+def test_table_is_reloaded_from_disk(tmp_path):
+    path = str(tmp_path / "rates.json")
+    provider = FlakyProvider()
+    ExchangeRateCache(provider, ttl=60, cache_file=path).get_table()
+
+    table = ExchangeRateCache(provider, ttl=60, cache_file=path).get_table()
+
+    assert provider.calls == 1
+    assert table.rate("USD", "EUR") == pytest.approx(0.93)
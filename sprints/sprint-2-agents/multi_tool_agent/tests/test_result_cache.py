@@ -0,0 +1,64 @@
+import time
+
+from tools.tool_manager import ResultCache, ToolManager
+
+
+def counting_tool(calls: list, result=lambda city: f"Sunny in {city}"):
+    def tool(city):
+        calls.append(city)
+        return result(city)
+    return tool
+
+
+def test_keys_ignore_case_whitespace_and_numeric_type():
+    assert ResultCache.make_key({"city": "  Cape   Town "}) == ResultCache.make_key({"city": "cape town"})
+    assert ResultCache.make_key({"amount": 100}) == ResultCache.make_key({"amount": 100.0})
+    assert ResultCache.make_key({"a": 1, "b": 2}) == ResultCache.make_key({"b": 2, "a": 1})
+    assert ResultCache.make_key({"flag": True}) != ResultCache.make_key({"flag": 1})
+
+
+def test_expired_entries_miss_but_stay_available_as_stale():
+    cache = ResultCache(ttl=0.05)
+    cache.set("key", "value")
+    assert cache.get("key") == (True, "value")
+    time.sleep(0.06)
+    assert cache.get("key") == (False, None)
+    assert cache.get_stale("key") == (True, "value")
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResultCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get_stale("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert len(cache) == 2
+
+
+def test_cached_tool_runs_once_per_normalized_arguments():
+    calls = []
+    manager = ToolManager(history_file=None)
+    manager.register_tool("weather", counting_tool(calls), "weather tool", cache=True, cache_ttl=60)
+
+    first = manager.execute_tool("weather", "first lookup", city="Durban")
+    second = manager.execute_tool("weather", "same city, other reasoning", city="  durban ")
+
+    assert first == second == "Sunny in Durban"
+    assert calls == ["Durban"]
+    assert manager.get_cache_stats()["weather"]["hits"] == 1
+    manager.shutdown()
+
+
+def test_error_results_are_not_cached():
+    calls = []
+    manager = ToolManager(history_file=None)
+    manager.register_tool("weather", counting_tool(calls, lambda city: "Error: city not found"), "weather tool", cache=True)
+
+    manager.execute_tool("weather", "lookup", city="Atlantis")
+    manager.execute_tool("weather", "lookup again", city="Atlantis")
+
+    assert calls == ["Atlantis", "Atlantis"]
+    assert manager.get_cache_stats()["weather"]["entries"] == 0
+    manager.shutdown()
@@ -0,0 +1,213 @@
+import asyncio
+import threading
+import time
+
+from tools.tool_manager import ToolManager
+from tools.tool_resilience import ToolPolicy
+
+
+def make_manager(**kwargs):
+    return ToolManager(history_file=None, **kwargs)
+
+
+def blocking_tool(release: threading.Event, calls: list):
+    def tool(value):
+        calls.append(value)
+        release.wait(5)
+        return f"result {value}"
+    return tool
+
+
+def test_identical_concurrent_calls_share_one_execution():
+    release, calls = threading.Event(), []
+    manager = make_manager()
+    manager.register_tool("slow", blocking_tool(release, calls), "slow tool")
+
+    async def run():
+        callers = [asyncio.ensure_future(manager.execute_tool_async("slow", "test", value=1)) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*callers)
+
+    assert asyncio.run(run()) == ["result 1"] * 4
+    assert calls == [1]
+    manager.shutdown()
+
+
+def test_cancelling_one_follower_leaves_the_others_their_result():
+    release, calls = threading.Event(), []
+    manager = make_manager()
+    manager.register_tool("slow", blocking_tool(release, calls), "slow tool")
+
+    async def run():
+        callers = [asyncio.ensure_future(manager.execute_tool_async("slow", "test", value=1)) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        callers[2].cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*callers, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert isinstance(results[2], asyncio.CancelledError)
+    assert [results[i] for i in (0, 1, 3)] == ["result 1"] * 3
+    assert calls == [1]
+    assert not manager._flights
+    manager.shutdown()
+
+
+def test_cancelling_the_leader_hands_the_call_to_a_follower():
+    release, calls = threading.Event(), []
+    manager = make_manager()
+    manager.register_tool("slow", blocking_tool(release, calls), "slow tool")
+
+    async def run():
+        callers = [asyncio.ensure_future(manager.execute_tool_async("slow", "test", value=1)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        callers[0].cancel()
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*callers, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1:] == ["result 1"] * 2
+    # The abandoned execution plus one re-run by the new leader
+    assert calls == [1, 1]
+    assert not manager._flights
+    manager.shutdown()
+
+
+def test_different_arguments_are_not_coalesced():
+    release, calls = threading.Event(), []
+    release.set()
+    manager = make_manager()
+    manager.register_tool("slow", blocking_tool(release, calls), "slow tool")
+
+    async def run():
+        return await asyncio.gather(*(manager.execute_tool_async("slow", "test", value=v) for v in (1, 2)))
+
+    assert asyncio.run(run()) == ["result 1", "result 2"]
+    assert sorted(calls) == [1, 2]
+    manager.shutdown()
+
+
+def test_sync_call_with_policy_works_inside_a_running_loop():
+    manager = make_manager()
+    manager.register_tool("add", lambda a, b: a + b, "adds", policy=ToolPolicy(timeout=1, retries=0))
+
+    async def run():
+        return manager.execute_tool("add", "test", a=1, b=2)
+
+    assert manager.execute_tool("add", "test", a=1, b=2) == 3
+    assert asyncio.run(run()) == 3
+    manager.shutdown()
+
+
+def test_fallback_answer_is_counted_as_an_error():
+    def broken(city):
+        raise ConnectionError("upstream down")
+
+    manager = make_manager()
+    policy = ToolPolicy(timeout=1, retries=1, backoff_base=0, fallback=lambda city: f"no data for {city}")
+    manager.register_tool("weather", broken, "weather", policy=policy)
+
+    assert asyncio.run(manager.execute_tool_async("weather", "test", city="Paris")) == "no data for Paris"
+    assert manager.metrics.summary()["weather"]["errors"] == 1
+    stats = manager.get_resilience_stats()["weather"]
+    assert stats["retries"] == 1 and stats["fallbacks"] == 1
+    manager.shutdown()
+
+
+def test_expired_cached_result_is_the_first_fallback():
+    calls = []
+
+    def flaky(city):
+        calls.append(city)
+        if len(calls) > 1:
+            raise ConnectionError("upstream down")
+        return f"sunny in {city}"
+
+    manager = make_manager()
+    manager.register_tool("weather", flaky, "weather", cache=True, cache_ttl=0.01,
+                          policy=ToolPolicy(timeout=1, retries=0, fallback=lambda city: "unknown"))
+
+    assert asyncio.run(manager.execute_tool_async("weather", "test", city="Paris")) == "sunny in Paris"
+    time.sleep(0.02)
+    assert asyncio.run(manager.execute_tool_async("weather", "test", city="Paris")) == "sunny in Paris"
+    assert manager.execution_history[-1]["fallback"] == "last_cached"
+    manager.shutdown()
+
+
+def test_circuit_opens_after_repeated_failures():
+    calls = []
+
+    def broken(city):
+        calls.append(city)
+        raise ConnectionError("upstream down")
+
+    manager = make_manager()
+    policy = ToolPolicy(timeout=1, retries=0, failure_threshold=2, reset_timeout=60, fallback=lambda city: "unknown")
+    manager.register_tool("weather", broken, "weather", policy=policy, coalesce=False)
+
+    for _ in range(4):
+        assert asyncio.run(manager.execute_tool_async("weather", "test", city="Paris")) == "unknown"
+    assert len(calls) == 2
+    state = manager.get_resilience_stats()["weather"]
+    assert state["state"] == "open" and state["rejected"] == 2
+    manager.shutdown()
+
+
+def test_cancelled_half_open_trial_lets_the_next_call_through():
+    async def weather(city):
+        await asyncio.sleep(0.2)
+        return f"sunny in {city}"
+
+    manager = make_manager()
+    policy = ToolPolicy(timeout=1, retries=0, failure_threshold=1, reset_timeout=0.01, fallback=lambda city: "unknown")
+    manager.register_tool("weather", weather, "weather", policy=policy, coalesce=False)
+    manager.breakers["weather"].record_failure()
+    time.sleep(0.02)
+
+    async def run():
+        trial = asyncio.ensure_future(manager.execute_tool_async("weather", "test", city="Paris"))
+        await asyncio.sleep(0.05)
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+        return await manager.execute_tool_async("weather", "test", city="Paris")
+
+    assert asyncio.run(run()) == "sunny in Paris"
+    assert manager.get_resilience_stats()["weather"]["state"] == "closed"
+    manager.shutdown()
+
+
+def test_timeout_then_retry_succeeds():
+    calls = []
+
+    def slow_once(city):
+        calls.append(city)
+        if len(calls) == 1:
+            time.sleep(0.3)
+        return f"sunny in {city}"
+
+    manager = make_manager()
+    manager.register_tool("weather", slow_once, "weather", policy=ToolPolicy(timeout=0.1, retries=1, backoff_base=0))
+
+    assert asyncio.run(manager.execute_tool_async("weather", "test", city="Paris")) == "sunny in Paris"
+    stats = manager.get_resilience_stats()["weather"]
+    assert stats["timeouts"] == 1 and stats["retries"] == 1
+    manager.shutdown()
+
+
+def test_abandoned_attempts_count_against_max_in_flight():
+    release, calls = threading.Event(), []
+    manager = make_manager()
+    policy = ToolPolicy(timeout=0.05, retries=3, backoff_base=0, max_in_flight=2, fallback=lambda value: "fallback")
+    manager.register_tool("hung", blocking_tool(release, calls), "hangs", policy=policy)
+
+    assert asyncio.run(manager.execute_tool_async("hung", "test", value=1)) == "fallback"
+    # Two threads are stuck in the tool; the other attempts were refused instead of queueing
+    assert len(calls) == 2
+    assert manager.get_resilience_stats()["hung"]["busy"] == 2
+    release.set()
+    manager.shutdown()
+    assert manager._threads_in_use["hung"] == 0
@@ -1,24 +1,218 @@
+import ast
 import math
+import operator
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Any
+
+# Largest integer result (in bits) that ** or factorial may build, so "9**9**9",
+# "(9**10000)**10000" and "factorial(10**6)" fail fast instead of hanging
+MAX_INTEGER_BITS = 150_000
+
+def _safe_factorial(n):
+    if isinstance(n, int) and n > 1:
+        bits = math.lgamma(n + 1) / math.log(2)
+        if bits > MAX_INTEGER_BITS:
+            raise ValueError(f"factorial({n}) is too large (about {bits:,.0f} bits)")
+    return math.factorial(n)
+
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+MATH_FUNCTIONS: Dict[str, Callable] = {
+    "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "asin": math.asin, "acos": math.acos, "atan": math.atan,
+    "sinh": math.sinh, "cosh": math.cosh, "tanh": math.tanh,
+    "sqrt": math.sqrt, "exp": math.exp,
+    "log": math.log, "log10": math.log10, "log2": math.log2,
+    "abs": abs, "round": round, "floor": math.floor, "ceil": math.ceil,
+    "factorial": _safe_factorial, "radians": math.radians, "degrees": math.degrees
+}
+
+# NumPy equivalents used by the batch API (factorial has no vectorized form)
+NUMPY_FUNCTION_NAMES = {
+    "sin": "sin", "cos": "cos", "tan": "tan",
+    "asin": "arcsin", "acos": "arccos", "atan": "arctan",
+    "sinh": "sinh", "cosh": "cosh", "tanh": "tanh",
+    "sqrt": "sqrt", "exp": "exp",
+    "log": "log", "log10": "log10", "log2": "log2",
+    "abs": "abs", "round": "round", "floor": "floor", "ceil": "ceil",
+    "radians": "radians", "degrees": "degrees"
+}
+
+def _safe_pow(base, exponent):
+    # Only int ** int grows without bound; floats and NumPy arrays overflow to inf
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        bits = exponent * math.log2(abs(base))
+        if bits > MAX_INTEGER_BITS:
+            raise ValueError(f"Result of the power is too large (about {bits:,.0f} bits)")
+    return operator.pow(base, exponent)
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod,
+    ast.Pow: _safe_pow
+}
+
+UNARY_OPERATORS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+class CompiledExpression:
+    """
+    A validated expression compiled to a tree of closures.
+
+    Args:
+        evaluate (Callable[[Dict[str, Any]], Any]): Evaluates the expression for variable bindings
+        variables (List[str]): Free variable names, in order of first appearance
+    """
+
+    def __init__(self, evaluate: Callable[[Dict[str, Any]], Any], variables: List[str]):
+        self.evaluate = evaluate
+        self.variables = variables
+
+    def __call__(self, **bindings) -> Any:
+        missing = [name for name in self.variables if name not in bindings]
+        if missing:
+            raise ValueError(f"Unknown variable(s): {', '.join(missing)}")
+        return self.evaluate(bindings)
+
+def normalize_expression(expression: str) -> str:
+    """
+    Normalize an expression for caching: lower-case, collapse whitespace and read "^" as a power.
+
+    Args:
+        expression (str): Raw expression
+
+    Returns:
+        str: Normalized expression
+    """
+    return " ".join(expression.lower().replace("^", "**").split())
+
+def _compile_node(node: ast.AST, functions: Dict[str, Callable], variables: List[str]) -> Callable:
+    """Turn a whitelisted AST node into a closure taking the variable bindings"""
+    if isinstance(node, ast.Expression):
+        return _compile_node(node.body, functions, variables)
+
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return lambda env: value
+
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        op = BINARY_OPERATORS[type(node.op)]
+        left = _compile_node(node.left, functions, variables)
+        right = _compile_node(node.right, functions, variables)
+        return lambda env: op(left(env), right(env))
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        op = UNARY_OPERATORS[type(node.op)]
+        operand = _compile_node(node.operand, functions, variables)
+        return lambda env: op(operand(env))
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda env: value
+        if name in functions:
+            raise ValueError(f"'{name}' is a function and must be called")
+        if name not in variables:
+            variables.append(name)
+        return lambda env: env[name]
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in functions:
+            name = node.func.id if isinstance(node.func, ast.Name) else ast.dump(node.func)
+            raise ValueError(f"Unsupported function: {name}")
+        if node.keywords:
+            raise ValueError("Keyword arguments are not supported")
+        function = functions[node.func.id]
+        arguments = [_compile_node(argument, functions, variables) for argument in node.args]
+        return lambda env: function(*(argument(env) for argument in arguments))
+
+    raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+def _numpy_functions() -> Dict[str, Callable]:
+    import numpy as np
+    return {name: getattr(np, numpy_name) for name, numpy_name in NUMPY_FUNCTION_NAMES.items()}
+
+@lru_cache(maxsize=1024)
+def _compile_normalized(expression: str, backend: str) -> CompiledExpression:
+    tree = ast.parse(expression, mode="eval")
+    functions = MATH_FUNCTIONS if backend == "math" else _numpy_functions()
+    variables: List[str] = []
+    return CompiledExpression(_compile_node(tree, functions, variables), variables)
+
+def compile_expression(expression: str, backend: str = "math") -> CompiledExpression:
+    """
+    Validate and compile an expression, reusing the cached result for the same normalized text.
+
+    Only numbers, + - * / // % ** (or ^), unary +/-, the constants pi, e and tau,
+    whitelisted math functions and plain variable names are accepted; attribute
+    access, subscripts, comprehensions etc. are rejected before anything runs.
+
+    Args:
+        expression (str): Mathematical expression (e.g. "sin(x) + 2^3")
+        backend (str): "math" for scalars or "numpy" for array bindings
+
+    Returns:
+        CompiledExpression: Compiled callable with its free variables
+    """
+    return _compile_normalized(normalize_expression(expression), backend)
 
 def calculate(expression: str) -> str:
     """
     Evaluates a mathematical expression and returns the result.
-    
+
     Args:
         expression (str): A mathematical expression as a string (e.g., "2 + 2", "sin(30)")
-        
+
     Returns:
         str: The result of the calculation or an error message
     """
     try:
-        # Replace common mathematical functions with their math module equivalents
-        expression = expression.lower()
-        for func in ["sin", "cos", "tan", "sqrt", "log", "exp"]:
-            if func in expression:
-                expression = expression.replace(func, f"math.{func}")
-        
-        # Safely evaluate the expression
-        result = eval(expression, {"__builtins__": None}, {"math": math})
+        result = compile_expression(expression)()
         return f"Result: {result}"
     except Exception as e:
         return f"Error calculating: {str(e)}"
+
+def evaluate_batch(expression: str, bindings: Dict[str, Sequence[float]]):
+    """
+    Evaluate one expression over arrays of variable values with NumPy.
+
+    Arrays are broadcast against each other, so {"x": [1, 2, 3], "rate": [0.05]}
+    evaluates three rows.
+
+    Args:
+        expression (str): Expression using the variable names (e.g. "p * (1 + r) ** n")
+        bindings (Dict[str, Sequence[float]]): Variable name to values
+
+    Returns:
+        numpy.ndarray: One result per row
+    """
+    import numpy as np
+    compiled = compile_expression(expression, backend="numpy")
+    arrays = {name.lower(): np.asarray(values, dtype=float) for name, values in bindings.items()}
+    with np.errstate(all="ignore"):
+        result = compiled(**arrays)
+    return np.broadcast_to(result, np.broadcast_shapes(*(array.shape for array in arrays.values()))) if arrays else np.asarray(result)
+
+def calculate_table(expression: str, variables: Dict[str, List[float]]) -> str:
+    """
+    Evaluates one expression for many variable values at once (a what-if table).
+
+    Args:
+        expression (str): A mathematical expression using variable names (e.g., "p * (1 + r) ** n")
+        variables (Dict[str, List[float]]): Values for each variable (e.g., {"p": [1000], "r": [0.05], "n": [1, 5, 10]})
+
+    Returns:
+        str: One line per row with the variable values and the result, or an error message
+    """
+    try:
+        import numpy as np
+        results = evaluate_batch(expression, variables)
+        columns = {name.lower(): np.broadcast_to(np.asarray(values, dtype=float), results.shape)
+                   for name, values in variables.items()}
+        rows = []
+        for index in range(results.size):
+            values = ", ".join(f"{name}={column.flat[index]:g}" for name, column in columns.items())
+            rows.append(f"{values} -> {results.flat[index]:g}")
+        return "Results:\n" + "\n".join(rows)
+    except Exception as e:
+        return f"Error calculating: {str(e)}"
@@ -1,55 +1,339 @@
+import json
 import os
+import threading
+import time
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple
+
 import requests
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# (connect, read) timeout in seconds so a hung upstream cannot stall the agent
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Base currency of the cached rate table; every pair is computed locally from it
+BASE_CURRENCY = "USD"
+
+# Approximate USD rates used without an API key and as a fallback when the API is down
+MOCK_RATES = {
+    "USD": 1.0,
+    "EUR": 0.93,
+    "GBP": 0.79,
+    "JPY": 151.72,
+    "CAD": 1.37,
+    "AUD": 1.52,
+    "ZAR": 18.41
+}
+
+class RateTable:
+    """
+    Exchange rates for one base currency (units of each currency per 1 base unit).
+    """
+
+    def __init__(self, base: str, rates: Dict[str, float], fetched_at: Optional[float] = None, source: str = "api"):
+        self.base = base.upper()
+        self.rates = {code.upper(): float(rate) for code, rate in rates.items()}
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+        self.source = source
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """
+        Cross rate between two currencies via the base currency.
+
+        Raises:
+            KeyError: If either currency is not in the table
+        """
+        return self.rates[to_currency.upper()] / self.rates[from_currency.upper()]
+
+    def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
+        return amount * self.rate(from_currency, to_currency)
+
+    def convert_many(self, amounts: Sequence[float], from_currencies: Sequence[str], to_currencies: Sequence[str]):
+        """
+        Vectorized conversion of many (amount, from, to) rows with NumPy.
+
+        Raises:
+            KeyError: If any currency is not in the table
+
+        Returns:
+            numpy.ndarray: Converted amounts
+        """
+        import numpy as np
+        codes = list(self.rates)
+        index = {code: position for position, code in enumerate(codes)}
+        rates = np.fromiter((self.rates[code] for code in codes), dtype=float, count=len(codes))
+        from_index = np.fromiter((index[code.upper()] for code in from_currencies), dtype=int, count=len(from_currencies))
+        to_index = np.fromiter((index[code.upper()] for code in to_currencies), dtype=int, count=len(to_currencies))
+        return np.asarray(amounts, dtype=float) / rates[from_index] * rates[to_index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"base": self.base, "rates": self.rates, "fetched_at": self.fetched_at, "source": self.source}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RateTable":
+        return cls(data["base"], data["rates"], data["fetched_at"], data.get("source", "api"))
+
+def mock_rate_provider(base: str) -> Dict[str, float]:
+    """
+    Local stand-in provider: MOCK_RATES rebased to `base`.
+    """
+    base_rate = MOCK_RATES[base.upper()]
+    return {code: rate / base_rate for code, rate in MOCK_RATES.items()}
+
+def api_rate_provider(base: str) -> Dict[str, float]:
+    """
+    Fetch the full rate table for `base` from exchangerate-api.com (one request for all pairs).
+
+    Raises:
+        RuntimeError: If the API reports an error
+    """
+    api_key = os.getenv("EXCHANGE_RATE_API_KEY")
+    url = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/{base}"
+    response = requests.get(url, timeout=REQUEST_TIMEOUT).json()
+    if response.get("result") != "success":
+        raise RuntimeError(response.get("error-type", "Unknown error"))
+    return response["conversion_rates"]
+
+class ExchangeRateCache:
+    """
+    Caches one rate table in memory and on disk for `ttl` seconds.
+
+    Concurrent refreshes are serialised; while one runs, callers that have an
+    expired table get it instead of waiting. If a refresh fails the last table
+    (even if expired) is served, and the provider is not asked again for
+    `retry_after` seconds; without any table the failure is raised again
+    during that time instead of retried.
+    """
+
+    def __init__(self, provider: Callable[[str], Dict[str, float]], base: str = BASE_CURRENCY,
+                 ttl: float = 3600, cache_file: Optional[str] = None, source: str = "api",
+                 retry_after: float = 60):
+        self.provider = provider
+        self.base = base
+        self.ttl = ttl
+        self.cache_file = cache_file
+        self.source = source
+        self.retry_after = retry_after
+        self.fetches = 0
+        self.failures = 0
+        self._table: Optional[RateTable] = None
+        self._retry_at = 0.0
+        self._last_error: Optional[Exception] = None
+        self._lock = threading.Lock()
+
+    def _load_disk(self) -> Optional[RateTable]:
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return None
+        try:
+            with open(self.cache_file, 'r') as f:
+                table = RateTable.from_dict(json.load(f))
+            return table if table.base == self.base.upper() else None
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_disk(self, table: RateTable) -> None:
+        if not self.cache_file:
+            return
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        temp_path = f"{self.cache_file}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(table.to_dict(), f)
+        os.replace(temp_path, self.cache_file)
+
+    def _fresh(self, table: Optional[RateTable]) -> bool:
+        return table is not None and table.age() < self.ttl
+
+    def get_table(self) -> RateTable:
+        """
+        Get a fresh rate table from memory, disk or the provider (in that order).
+
+        Returns:
+            RateTable: The current table (an expired one while the provider is failing)
+        """
+        table = self._table
+        if self._fresh(table):
+            return table
+        if table is None:
+            self._lock.acquire()
+        elif time.monotonic() < self._retry_at or not self._lock.acquire(blocking=False):
+            # Serve the expired table while the provider backs off or another caller refreshes it
+            return table
+        try:
+            return self._refresh()
+        finally:
+            self._lock.release()
+
+    def _refresh(self) -> RateTable:
+        """Reload the table (called with the lock held)"""
+        if self._fresh(self._table):
+            return self._table
+        if self._table is None:
+            self._table = self._load_disk()
+            if self._fresh(self._table):
+                return self._table
+        if time.monotonic() < self._retry_at:
+            if self._table is not None:
+                return self._table
+            raise self._last_error
+        try:
+            table = RateTable(self.base, self.provider(self.base), source=self.source)
+            self.fetches += 1
+        except Exception as e:
+            self.failures += 1
+            self._last_error = e
+            self._retry_at = time.monotonic() + self.retry_after
+            if self._table is not None:
+                return self._table
+            raise
+        self._retry_at = 0.0
+        self._table = table
+        self._save_disk(table)
+        return table
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._table = None
+            self._retry_at = 0.0
+            if self.cache_file and os.path.exists(self.cache_file):
+                os.remove(self.cache_file)
+
+_caches: Dict[str, ExchangeRateCache] = {}
+_caches_lock = threading.Lock()
+
+def get_rate_cache(use_mock: Optional[bool] = None) -> ExchangeRateCache:
+    """
+    Process-wide rate cache for the API (with EXCHANGE_RATE_API_KEY) or the mock provider.
+
+    The TTL comes from EXCHANGE_RATE_TTL (seconds, default 3600), the wait before
+    retrying a failed provider from EXCHANGE_RATE_RETRY_AFTER (seconds, default 60),
+    and the disk cache lives in EXCHANGE_RATE_CACHE_DIR (default "cache").
+
+    Args:
+        use_mock (Optional[bool]): Force the mock provider (default: only when no API key is set)
+
+    Returns:
+        ExchangeRateCache: Shared cache
+    """
+    if use_mock is None:
+        use_mock = not os.getenv("EXCHANGE_RATE_API_KEY")
+    key = "mock" if use_mock else "api"
+    with _caches_lock:
+        if key not in _caches:
+            cache_dir = os.getenv("EXCHANGE_RATE_CACHE_DIR", "cache")
+            _caches[key] = ExchangeRateCache(
+                mock_rate_provider if use_mock else api_rate_provider,
+                ttl=float(os.getenv("EXCHANGE_RATE_TTL", "3600")),
+                # The mock table never changes, so it is not written to disk
+                cache_file=None if use_mock else os.path.join(cache_dir, f"exchange_rates_{BASE_CURRENCY}.json"),
+                source="mock" if use_mock else "api",
+                retry_after=float(os.getenv("EXCHANGE_RATE_RETRY_AFTER", "60"))
+            )
+        return _caches[key]
+
+def _format_conversion(amount: float, from_currency: str, to_currency: str, converted: float, table: RateTable) -> str:
+    suffix = " (using mock data)" if table.source == "mock" else ""
+    return f"{amount} {from_currency} = {converted:.2f} {to_currency}{suffix}"
+
+def convert_with_mock_rates(amount: float, from_currency: str, to_currency: str) -> str:
+    """
+    Convert an amount using the built-in mock rates.
+
+    Args:
+        amount (float): The amount to convert
+        from_currency (str): The source currency code (e.g., USD, EUR)
+        to_currency (str): The target currency code (e.g., USD, EUR)
+
+    Returns:
+        str: The converted amount or an error message
+    """
+    from_currency = from_currency.upper()
+    to_currency = to_currency.upper()
+    table = get_rate_cache(use_mock=True).get_table()
+
+    if from_currency not in table.rates or to_currency not in table.rates:
+        return f"Currency not supported in mock data: {from_currency} or {to_currency}"
+
+    return _format_conversion(amount, from_currency, to_currency, table.convert(amount, from_currency, to_currency), table)
+
 def convert_currency(amount: float, from_currency: str, to_currency: str) -> str:
     """
     Convert an amount from one currency to another using exchange rates.
-    
+
+    Uses the cached rate table (mock data when no API key is set), so only a
+    table refresh touches the network.
+
     Args:
         amount (float): The amount to convert
         from_currency (str): The source currency code (e.g., USD, EUR)
         to_currency (str): The target currency code (e.g., USD, EUR)
-        
+
     Returns:
         str: The converted amount or an error message
     """
-    API_KEY = os.getenv("EXCHANGE_RATE_API_KEY")
-    if not API_KEY:
+    if not os.getenv("EXCHANGE_RATE_API_KEY"):
         # Fallback to mock data if no API key is available
-        mock_rates = {
-            "USD": 1.0,
-            "EUR": 0.93,
-            "GBP": 0.79,
-            "JPY": 151.72,
-            "CAD": 1.37,
-            "AUD": 1.52,
-            "ZAR": 18.41
-        }
-        
-        from_currency = from_currency.upper()
-        to_currency = to_currency.upper()
-        
-        if from_currency not in mock_rates or to_currency not in mock_rates:
-            return f"Currency not supported in mock data: {from_currency} or {to_currency}"
-        
-        # Calculate conversion using mock rates
-        usd_amount = amount / mock_rates[from_currency]
-        converted_amount = usd_amount * mock_rates[to_currency]
-        
-        return f"{amount} {from_currency} = {converted_amount:.2f} {to_currency} (using mock data)"
-    
-    # Use actual API if key is available
-    url = f"https://v6.exchangerate-api.com/v6/{API_KEY}/pair/{from_currency}/{to_currency}/{amount}"
-    
+        return convert_with_mock_rates(amount, from_currency, to_currency)
+
+    from_currency = from_currency.upper()
+    to_currency = to_currency.upper()
+    try:
+        table = get_rate_cache().get_table()
+    except Exception as e:
+        return f"Error converting currency: {str(e)}"
+
+    if from_currency not in table.rates or to_currency not in table.rates:
+        return f"Error: unsupported-code ({from_currency} or {to_currency})"
+    return _format_conversion(amount, from_currency, to_currency, table.convert(amount, from_currency, to_currency), table)
+
+def _convert_rows(conversions: List[Dict[str, Any]], table: RateTable) -> str:
+    rows: List[Tuple[float, str, str]] = [
+        (float(item["amount"]), str(item["from_currency"]).upper(), str(item["to_currency"]).upper())
+        for item in conversions
+    ]
+    unsupported = sorted({code for _, source, target in rows for code in (source, target) if code not in table.rates})
+    if unsupported:
+        return f"Error: unsupported-code ({', '.join(unsupported)})"
+    if not rows:
+        return "No conversions requested"
+
+    amounts, sources, targets = zip(*rows)
+    converted = table.convert_many(amounts, sources, targets)
+    return "\n".join(
+        _format_conversion(amount, source, target, value, table)
+        for (amount, source, target), value in zip(rows, converted)
+    )
+
+def convert_batch_with_mock_rates(conversions: List[Dict[str, Any]]) -> str:
+    """
+    Convert many amounts using the built-in mock rates.
+
+    Args:
+        conversions (List[Dict[str, Any]]): Items with "amount", "from_currency" and "to_currency"
+
+    Returns:
+        str: One converted amount per line, or an error message
+    """
+    return _convert_rows(conversions, get_rate_cache(use_mock=True).get_table())
+
+def convert_currency_batch(conversions: List[Dict[str, Any]]) -> str:
+    """
+    Convert many amounts in one call using the cached rate table.
+
+    All rows are computed locally from a single table (vectorized with NumPy),
+    so a batch costs at most one upstream request.
+
+    Args:
+        conversions (List[Dict[str, Any]]): Items with "amount", "from_currency" and "to_currency"
+
+    Returns:
+        str: One converted amount per line, or an error message
+    """
     try:
-        response = requests.get(url).json()
-        if response.get("result") == "success":
-            converted_amount = response.get("conversion_result")
-            return f"{amount} {from_currency} = {converted_amount:.2f} {to_currency}"
-        else:
-            return f"Error: {response.get('error-type', 'Unknown error')}"
+        table = get_rate_cache().get_table()
     except Exception as e:
         return f"Error converting currency: {str(e)}"
+    return _convert_rows(conversions, table)
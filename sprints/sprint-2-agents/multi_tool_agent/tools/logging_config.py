@@ -0,0 +1,117 @@
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Any, Optional
+
+# Logger names with their own destination
+CONSOLE_LOGGER = "console"
+AGENT_LOGGER = "MultiToolAgent"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_installed_handlers = []
+
+class LazyJson:
+    """
+    Defers json.dumps of a log argument until the record is actually formatted.
+    """
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __str__(self) -> str:
+        return json.dumps(self.value, default=str)
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues the record untouched.
+
+    The stock QueueHandler formats the message in the calling thread; this one
+    leaves msg/args as they are so %-formatting, LazyJson and str(result) run on
+    the listener thread instead of the tool path.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+class _NameFilter(logging.Filter):
+    """Accept records from the given logger names (or reject them with exclude=True)"""
+
+    def __init__(self, *names: str, exclude: bool = False):
+        super().__init__()
+        self.names = names
+        self.exclude = exclude
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        matched = any(record.name == name or record.name.startswith(name + ".") for name in self.names)
+        return matched != self.exclude
+
+def configure_logging(log_dir: str = "logs", level: int = logging.INFO, use_queue: bool = True,
+                      console: bool = True) -> None:
+    """
+    Set up logging for the multi-tool agent. Call once at startup.
+
+    Detailed logs go to <log_dir>/tool_usage.log, the agent's own logger to
+    <log_dir>/agent.log and the "console" logger to stderr (message only).
+    With use_queue the calling threads only enqueue records; one background
+    listener thread formats them and does all file and console I/O.
+
+    Args:
+        log_dir (str): Directory for the log files
+        level (int): Level for the root logger
+        use_queue (bool): Route records through a queue and listener thread
+        console (bool): Print user-facing "console" messages
+    """
+    global _listener
+    shutdown_logging()
+    os.makedirs(log_dir, exist_ok=True)
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    tool_file = logging.FileHandler(os.path.join(log_dir, "tool_usage.log"))
+    tool_file.setFormatter(formatter)
+    tool_file.addFilter(_NameFilter(CONSOLE_LOGGER, AGENT_LOGGER, exclude=True))
+
+    agent_file = logging.FileHandler(os.path.join(log_dir, "agent.log"))
+    agent_file.setFormatter(formatter)
+    agent_file.addFilter(_NameFilter(AGENT_LOGGER))
+
+    handlers = [tool_file, agent_file]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter('%(message)s'))
+        console_handler.addFilter(_NameFilter(CONSOLE_LOGGER))
+        handlers.append(console_handler)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    logging.getLogger(CONSOLE_LOGGER).setLevel(logging.INFO)
+    if use_queue:
+        records = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+        _installed_handlers.append(DeferredQueueHandler(records))
+    else:
+        _installed_handlers.extend(handlers)
+    for handler in _installed_handlers:
+        root.addHandler(handler)
+
+    # Suppress unnecessary AutoGen logs
+    for logger_name in ['httpx', 'autogen', 'autogen_core', 'autogen_core.events', 'autogen_agentchat']:
+        logging.getLogger(logger_name).setLevel(logging.WARNING)
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records, stop the listener thread and remove the handlers added by configure_logging.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    root = logging.getLogger()
+    for handler in _installed_handlers:
+        root.removeHandler(handler)
+        handler.close()
+    _installed_handlers.clear()
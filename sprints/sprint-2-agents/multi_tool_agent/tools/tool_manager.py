@@ -1,41 +1,188 @@
+import asyncio
+import functools
+import inspect
 import logging
 import os
-from typing import Callable, Dict, List, Any
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from tools.logging_config import CONSOLE_LOGGER, LazyJson
+from tools.tool_metrics import ToolMetrics
+from tools.tool_resilience import ToolPolicy, CircuitBreaker, CircuitOpenError, ToolBusyError, ToolResultError
 import json
+import threading
 import time
 
-# Configure logging - file only for detailed logs
-os.makedirs('logs', exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("logs/tool_usage.log"),
-    ]
-)
+# User-facing messages; handlers are set up by tools.logging_config.configure_logging
+console_logger = logging.getLogger(CONSOLE_LOGGER)
 
-# Create a separate console logger for user-facing information
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_handler.setFormatter(logging.Formatter('%(message)s'))
+class _LeaderGone(Exception):
+    """Set on a coalesced flight whose leader was cancelled, so a follower runs the tool instead"""
 
-console_logger = logging.getLogger("console")
-console_logger.addHandler(console_handler)
-console_logger.propagate = False  # Prevent double logging
+class JsonlSink:
+    """
+    Appends records to a JSONL file as they happen, rotating it by size.
+    
+    When the file grows past max_bytes it is renamed to <path>.1 (older files
+    shift to .2 ... .backup_count, the oldest is dropped) and a new file is started.
+    """
+    
+    def __init__(self, file_path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3):
+        self.file_path = file_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        self._file = open(file_path, 'a', encoding='utf-8')
+    
+    def write(self, record: Dict[str, Any]) -> None:
+        """
+        Append one record as a JSON line.
+        
+        Args:
+            record (Dict[str, Any]): JSON-serialisable record
+        """
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if self.max_bytes and self._file.tell() >= self.max_bytes:
+                self._rotate()
+    
+    def _rotate(self) -> None:
+        self._file.close()
+        if self.backup_count:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.file_path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.file_path}.{index + 1}")
+            os.replace(self.file_path, f"{self.file_path}.1")
+        else:
+            os.remove(self.file_path)
+        self._file = open(self.file_path, 'a', encoding='utf-8')
+    
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+class ResultCache:
+    """
+    Thread-safe memoization store with a TTL and LRU eviction.
+    
+    A ttl of None keeps entries until they are evicted by max_entries. Expired
+    entries are not returned by get but stay available to get_stale (as a
+    fallback when the tool is failing) until they are evicted.
+    """
+    
+    def __init__(self, ttl: Optional[float] = None, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(kwargs: Dict[str, Any]) -> str:
+        """
+        Build a cache key from tool arguments (strings are stripped and lower-cased, ints and floats compare equal).
+        
+        Args:
+            kwargs (Dict[str, Any]): Tool arguments, without the reasoning
+            
+        Returns:
+            str: Normalized key
+        """
+        normalized = {}
+        for name, value in kwargs.items():
+            if isinstance(value, str):
+                value = " ".join(value.split()).lower()
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                value = float(value)
+            normalized[name] = value
+        return json.dumps(normalized, sort_keys=True, default=str)
+    
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a key.
+        
+        Returns:
+            Tuple[bool, Any]: (hit, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+    
+    def get_stale(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a key ignoring the TTL.
+        
+        Returns:
+            Tuple[bool, Any]: (hit, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return (False, None) if entry is None else (True, entry[1])
+    
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
 
 class ToolManager:
     """
     Manages multiple tools, handles tool selection, and logs tool usage and reasoning.
+    
+    Only the most recent `history_capacity` executions are kept in memory (with
+    results truncated to `max_result_chars`); every execution is also appended in
+    full to a rotating JSONL file at `history_file` (None disables the file).
+    Blocking tools called through execute_tool_async run on a pool of at most
+    `max_workers` threads. A timed-out blocking call keeps its thread until the
+    tool returns, so a policy's max_in_flight caps the threads one tool can hold
+    and a hung upstream cannot take over the pool.
     """
     
-    def __init__(self):
+    def __init__(self, history_capacity: int = 1000, history_file: str = "logs/tool_history.jsonl",
+                 history_max_bytes: int = 10 * 1024 * 1024, history_backup_count: int = 3,
+                 max_result_chars: int = 2000, max_workers: int = 8):
         self.tools: Dict[str, Callable] = {}
         self.tool_descriptions: Dict[str, str] = {}
         self.usage_stats: Dict[str, int] = {}
-        self.execution_history: List[Dict[str, Any]] = []
+        self.cache_hits: Dict[str, int] = {}
+        self.caches: Dict[str, ResultCache] = {}
+        self.metrics = ToolMetrics()
+        self.policies: Dict[str, ToolPolicy] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.resilience_stats: Dict[str, Dict[str, int]] = {}
+        self._threads_in_use: Dict[str, int] = {}
+        self.coalesced_tools = set()
+        self._flights: Dict[str, Future] = {}
+        self._flights_lock = threading.Lock()
+        self.execution_history = deque(maxlen=history_capacity)
+        self.execution_count = 0
+        self.max_result_chars = max_result_chars
+        self.history_sink = JsonlSink(history_file, history_max_bytes, history_backup_count) if history_file else None
         self.logger = logging.getLogger("ToolManager")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._stats_lock = threading.Lock()
     
-    def register_tool(self, name: str, tool_func: Callable, description: str):
+    def register_tool(self, name: str, tool_func: Callable, description: str,
+                      cache: bool = False, cache_ttl: Optional[float] = None, cache_max_entries: int = 256,
+                      policy: Optional[ToolPolicy] = None, coalesce: bool = True):
         """
         Register a tool with the manager.
         
@@ -43,11 +190,34 @@ class ToolManager:
             name (str): Name of the tool
             tool_func (Callable): The tool function
             description (str): Description of what the tool does
+            cache (bool): Memoize results by normalized arguments (reasoning is not part of the key)
+            cache_ttl (Optional[float]): Seconds a cached result stays valid (None = until evicted)
+            cache_max_entries (int): Most results kept for this tool before LRU eviction
+            policy (Optional[ToolPolicy]): Timeout, retry, hedging, circuit breaker and fallback settings
+            coalesce (bool): Let concurrent calls with identical normalized arguments share one execution
         """
         self.tools[name] = tool_func
         self.tool_descriptions[name] = description
         self.usage_stats[name] = 0
-        self.logger.info(f"Registered tool: {name}")
+        self.cache_hits[name] = 0
+        self.metrics.register(name)
+        if cache:
+            self.caches[name] = ResultCache(cache_ttl, cache_max_entries)
+        else:
+            self.caches.pop(name, None)
+        if coalesce:
+            self.coalesced_tools.add(name)
+        else:
+            self.coalesced_tools.discard(name)
+        if policy:
+            self.policies[name] = policy
+            self.breakers[name] = CircuitBreaker(policy.failure_threshold, policy.reset_timeout)
+            self.resilience_stats[name] = {"retries": 0, "timeouts": 0, "hedges": 0, "fallbacks": 0, "busy": 0}
+        else:
+            self.policies.pop(name, None)
+            self.breakers.pop(name, None)
+            self.resilience_stats.pop(name, None)
+        self.logger.info("Registered tool: %s", name)
     
     def get_available_tools(self) -> Dict[str, str]:
         """
@@ -62,6 +232,10 @@ class ToolManager:
         """
         Execute a tool and log the execution details.
         
+        Tools with a policy are run through an event loop of their own (on a helper
+        thread when called from inside a running loop, which this call blocks), so
+        call execute_tool_async instead from async code.
+        
         Args:
             tool_name (str): Name of the tool to execute
             reasoning (str): The reasoning for selecting this tool
@@ -71,63 +245,410 @@ class ToolManager:
             str: Result from the tool execution
         """
         if tool_name not in self.tools:
-            error_msg = f"Tool '{tool_name}' not found. Available tools: {list(self.tools.keys())}"
-            self.logger.error(error_msg)
-            return error_msg
+            return self._tool_not_found(tool_name)
         
-        # Log the tool selection reasoning to file only
-        self.logger.info(f"Tool selection reasoning: {reasoning}")
-        # Print a user-friendly message to console
-        tool_emoji = "🌤️" if "weather" in tool_name else "🧮" if "calculate" in tool_name else "💱" if "currency" in tool_name else "🛠️"
-        tool_display_name = tool_name.replace('_', ' ').title()
-        console_logger.info(f"\n{tool_emoji} Using {tool_display_name}")
-        console_logger.info(f"💭 Reasoning: {reasoning}")
+        self._announce(tool_name, reasoning)
         
         # Execute the tool and time its execution
         start_time = time.time()
+        hit, cached = self._cache_lookup(tool_name, kwargs)
+        if hit:
+            return self._on_cache_hit(tool_name, reasoning, kwargs, cached, start_time)
+        
+        # Identical calls already in flight share that execution's result
+        key, flight, leader = self._join_flight(tool_name, kwargs)
+        while not leader:
+            try:
+                result, fallback = flight.result()
+            except _LeaderGone:
+                # The first follower to rejoin becomes the new leader
+                key, flight, leader = self._join_flight(tool_name, kwargs)
+                continue
+            except Exception as e:
+                return self._on_failure(tool_name, reasoning, kwargs, e, start_time, coalesced=True)
+            return self._on_coalesced(tool_name, reasoning, kwargs, result, start_time, fallback)
+        
         try:
-            result = self.tools[tool_name](**kwargs)
-            execution_time = time.time() - start_time
-            
-            # Update usage statistics
-            self.usage_stats[tool_name] += 1
-            
-            # Record execution details
-            execution_record = {
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "tool": tool_name,
-                "reasoning": reasoning,
-                "arguments": kwargs,
-                "result": result,
-                "execution_time": execution_time
-            }
-            self.execution_history.append(execution_record)
-            
-            # Log the execution details to file
-            self.logger.info(f"Executed {tool_name} with args: {json.dumps(kwargs)}")
-            self.logger.info(f"Result: {result}")
-            self.logger.info(f"Execution time: {execution_time:.4f} seconds")
-            
-            # Print user-friendly output to console
-            console_logger.info(f"📊 Result: {result}\n")
-            
-            return result
-        except Exception as e:
-            error_msg = f"Error executing {tool_name}: {str(e)}"
-            self.logger.error(error_msg)
+            if tool_name in self.policies:
+                result, fallback = self._run_policy_sync(tool_name, kwargs)
+            else:
+                result, fallback = self.tools[tool_name](**kwargs), None
+        except BaseException as e:
+            self._finish_flight(key, flight, error=e)
+            if not isinstance(e, Exception):
+                raise
+            return self._on_failure(tool_name, reasoning, kwargs, e, start_time)
+        response = self._on_success(tool_name, reasoning, kwargs, result, start_time, fallback)
+        self._finish_flight(key, flight, value=(result, fallback))
+        return response
+    
+    async def execute_tool_async(self, tool_name: str, reasoning: str, **kwargs) -> str:
+        """
+        Execute a tool without blocking the event loop and log the execution details.
+        
+        Coroutine tools are awaited directly; blocking tools run on the bounded
+        thread pool, so concurrent calls (e.g. parallel tool calls from one model
+        turn) overlap their I/O. Tools with a policy get timeouts, retries,
+        hedging, a circuit breaker and fallbacks.
+        
+        Args:
+            tool_name (str): Name of the tool to execute
+            reasoning (str): The reasoning for selecting this tool
+            **kwargs: Arguments to pass to the tool
             
-            # Record execution failure
-            execution_record = {
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "tool": tool_name,
-                "reasoning": reasoning,
-                "arguments": kwargs,
-                "error": str(e),
-                "execution_time": time.time() - start_time
-            }
-            self.execution_history.append(execution_record)
+        Returns:
+            str: Result from the tool execution
+        """
+        if tool_name not in self.tools:
+            return self._tool_not_found(tool_name)
+        
+        self._announce(tool_name, reasoning)
+        
+        start_time = time.time()
+        hit, cached = self._cache_lookup(tool_name, kwargs)
+        if hit:
+            return self._on_cache_hit(tool_name, reasoning, kwargs, cached, start_time)
+        
+        # Identical calls already in flight share that execution's result
+        key, flight, leader = self._join_flight(tool_name, kwargs)
+        while not leader:
+            try:
+                # Shielded so a cancelled follower does not cancel the shared flight
+                result, fallback = await asyncio.shield(asyncio.wrap_future(flight))
+            except _LeaderGone:
+                # The first follower to rejoin becomes the new leader
+                key, flight, leader = self._join_flight(tool_name, kwargs)
+                continue
+            except Exception as e:
+                return self._on_failure(tool_name, reasoning, kwargs, e, start_time, coalesced=True)
+            return self._on_coalesced(tool_name, reasoning, kwargs, result, start_time, fallback)
+        
+        try:
+            if tool_name in self.policies:
+                result, fallback = await self._call_with_policy(tool_name, kwargs)
+            else:
+                result, fallback = await self._invoke(tool_name, kwargs), None
+        except BaseException as e:
+            # Also release followers when the leader is cancelled
+            self._finish_flight(key, flight, error=e)
+            if not isinstance(e, Exception):
+                raise
+            return self._on_failure(tool_name, reasoning, kwargs, e, start_time)
+        response = self._on_success(tool_name, reasoning, kwargs, result, start_time, fallback)
+        self._finish_flight(key, flight, value=(result, fallback))
+        return response
+    
+    def _run_policy_sync(self, tool_name: str, kwargs: Dict[str, Any]) -> Tuple[Any, Optional[str]]:
+        """Run _call_with_policy to completion from synchronous code"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._call_with_policy(tool_name, kwargs))
+        # asyncio.run cannot nest inside a running loop, so give the call a loop on its own thread
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="tool-policy") as runner:
+            return runner.submit(lambda: asyncio.run(self._call_with_policy(tool_name, kwargs))).result()
+    
+    def _join_flight(self, tool_name: str, kwargs: Dict[str, Any]) -> Tuple[Optional[str], Optional[Future], bool]:
+        """
+        Join an identical in-flight call or register this call as its leader.
+        
+        Returns:
+            Tuple[Optional[str], Optional[Future], bool]: (flight key, shared future, whether this call executes the tool)
+        """
+        if tool_name not in self.coalesced_tools:
+            return None, None, True
+        key = f"{tool_name}:{ResultCache.make_key(kwargs)}"
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return key, flight, False
+            flight = Future()
+            # A running future cannot be cancelled, so only the leader settles it
+            flight.set_running_or_notify_cancel()
+            self._flights[key] = flight
+            return key, flight, True
+    
+    def _finish_flight(self, key: Optional[str], flight: Optional[Future], value: Any = None,
+                       error: Optional[BaseException] = None) -> None:
+        """Publish the leader's outcome to every coalesced caller"""
+        if flight is None:
+            return
+        with self._flights_lock:
+            self._flights.pop(key, None)
+        if error is not None:
+            # Cancellation (or an interrupt) belongs to the leader's caller alone
+            flight.set_exception(error if isinstance(error, Exception) else _LeaderGone(key))
+        else:
+            flight.set_result(value)
+    
+    async def _invoke(self, tool_name: str, kwargs: Dict[str, Any]) -> Any:
+        """Await a coroutine tool or run a blocking tool on the thread pool"""
+        tool = self.tools[tool_name]
+        if inspect.iscoroutinefunction(tool):
+            return await tool(**kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(tool, **kwargs))
+    
+    async def _invoke_bounded(self, tool_name: str, kwargs: Dict[str, Any], limit: int) -> Any:
+        """Run a blocking tool on the thread pool unless it already occupies `limit` threads"""
+        with self._stats_lock:
+            if self._threads_in_use.get(tool_name, 0) >= limit:
+                self.resilience_stats[tool_name]["busy"] += 1
+                raise ToolBusyError(f"{tool_name} already has {limit} calls running")
+            self._threads_in_use[tool_name] = self._threads_in_use.get(tool_name, 0) + 1
+        
+        def release(_):
+            with self._stats_lock:
+                self._threads_in_use[tool_name] -= 1
+        
+        # Released when the thread finishes (or the call is cancelled before it starts),
+        # not when an attempt is abandoned after a timeout
+        future = self._executor.submit(functools.partial(self.tools[tool_name], **kwargs))
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+    
+    async def _checked_invoke(self, tool_name: str, kwargs: Dict[str, Any]) -> Any:
+        """Invoke a tool and raise ToolResultError for results its policy classifies as failures"""
+        policy = self.policies[tool_name]
+        if policy.max_in_flight is not None and not inspect.iscoroutinefunction(self.tools[tool_name]):
+            result = await self._invoke_bounded(tool_name, kwargs, policy.max_in_flight)
+        else:
+            result = await self._invoke(tool_name, kwargs)
+        is_failure = policy.is_failure
+        if is_failure and is_failure(result):
+            raise ToolResultError(result)
+        return result
+    
+    async def _hedged_attempt(self, tool_name: str, kwargs: Dict[str, Any]) -> Any:
+        """One attempt, with a second parallel request once hedge_after passes; the first success wins"""
+        policy = self.policies[tool_name]
+        attempts = {asyncio.ensure_future(self._checked_invoke(tool_name, kwargs))}
+        try:
+            if policy.hedge_after is not None:
+                done, _ = await asyncio.wait(attempts, timeout=policy.hedge_after)
+                if not done:
+                    with self._stats_lock:
+                        self.resilience_stats[tool_name]["hedges"] += 1
+                    attempts.add(asyncio.ensure_future(self._checked_invoke(tool_name, kwargs)))
             
-            return error_msg
+            pending, error = set(attempts), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+                    error = attempt.exception()
+            raise error
+        finally:
+            for attempt in attempts:
+                if not attempt.done():
+                    attempt.cancel()
+    
+    async def _call_with_policy(self, tool_name: str, kwargs: Dict[str, Any]) -> Tuple[Any, Optional[str]]:
+        """
+        Run a tool under its policy.
+        
+        Returns:
+            Tuple[Any, Optional[str]]: (result, fallback source or None)
+        """
+        policy = self.policies[tool_name]
+        breaker = self.breakers[tool_name]
+        stats = self.resilience_stats[tool_name]
+        if not breaker.allow_request():
+            return self._fallback(tool_name, kwargs, CircuitOpenError(f"Circuit open for {tool_name}"))
+        
+        last_error = None
+        try:
+            for attempt in range(policy.retries + 1):
+                if attempt:
+                    with self._stats_lock:
+                        stats["retries"] += 1
+                    await asyncio.sleep(policy.backoff(attempt))
+                try:
+                    result = await asyncio.wait_for(self._hedged_attempt(tool_name, kwargs), policy.timeout)
+                    breaker.record_success()
+                    return result, None
+                except asyncio.TimeoutError:
+                    with self._stats_lock:
+                        stats["timeouts"] += 1
+                    last_error = TimeoutError(f"{tool_name} timed out after {policy.timeout}s")
+                except Exception as e:
+                    last_error = e
+                self.logger.warning("%s attempt %d/%d failed: %s", tool_name, attempt + 1, policy.retries + 1, last_error)
+        except BaseException:
+            # Cancelled: say nothing about the tool, but let the next call be the half-open trial
+            breaker.release_trial()
+            raise
+        
+        breaker.record_failure()
+        return self._fallback(tool_name, kwargs, last_error)
+    
+    def _fallback(self, tool_name: str, kwargs: Dict[str, Any], error: Exception) -> Tuple[Any, str]:
+        """Last cached result (even if expired), else the policy fallback, else re-raise"""
+        cache = self.caches.get(tool_name)
+        if cache is not None:
+            hit, value = cache.get_stale(ResultCache.make_key(kwargs))
+            if hit:
+                with self._stats_lock:
+                    self.resilience_stats[tool_name]["fallbacks"] += 1
+                self.logger.warning("%s failed (%s), answering with the last cached result", tool_name, error)
+                return value, "last_cached"
+        fallback = self.policies[tool_name].fallback
+        if fallback is not None:
+            with self._stats_lock:
+                self.resilience_stats[tool_name]["fallbacks"] += 1
+            self.logger.warning("%s failed (%s), answering with the policy fallback", tool_name, error)
+            return fallback(**kwargs), "policy_fallback"
+        raise error
+    
+    def shutdown(self) -> None:
+        """
+        Stop the worker threads and close the history file.
+        """
+        self._executor.shutdown(wait=True)
+        if self.history_sink:
+            self.history_sink.close()
+    
+    def _tool_not_found(self, tool_name: str) -> str:
+        error_msg = f"Tool '{tool_name}' not found. Available tools: {list(self.tools.keys())}"
+        self.logger.error(error_msg)
+        return error_msg
+    
+    def _announce(self, tool_name: str, reasoning: str) -> None:
+        # Log the tool selection reasoning to file only
+        self.logger.info("Tool selection reasoning: %s", reasoning)
+        # Print a user-friendly message to console
+        tool_emoji = "🌤️" if "weather" in tool_name else "🧮" if "calculate" in tool_name else "💱" if "currency" in tool_name else "🛠️"
+        tool_display_name = tool_name.replace('_', ' ').title()
+        console_logger.info("\n%s Using %s", tool_emoji, tool_display_name)
+        console_logger.info("💭 Reasoning: %s", reasoning)
+    
+    def _cache_lookup(self, tool_name: str, kwargs: Dict[str, Any]) -> Tuple[bool, Any]:
+        cache = self.caches.get(tool_name)
+        if cache is None:
+            return False, None
+        return cache.get(ResultCache.make_key(kwargs))
+    
+    def _on_cache_hit(self, tool_name: str, reasoning: str, kwargs: Dict[str, Any], result: Any, start_time: float) -> Any:
+        execution_time = time.time() - start_time
+        with self._stats_lock:
+            self.cache_hits[tool_name] += 1
+        self.metrics.observe_cache_hit(tool_name)
+        
+        self._record_execution({
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "tool": tool_name,
+            "reasoning": reasoning,
+            "arguments": kwargs,
+            "result": result,
+            "execution_time": execution_time,
+            "cached": True,
+            "coalesced": False
+        })
+        self.logger.info("Cache hit for %s with args: %s", tool_name, LazyJson(kwargs))
+        console_logger.info("📊 Result (cached): %s\n", result)
+        return result
+    
+    def _on_coalesced(self, tool_name: str, reasoning: str, kwargs: Dict[str, Any], result: Any, start_time: float,
+                      fallback: Optional[str] = None) -> Any:
+        execution_time = time.time() - start_time
+        self.metrics.observe_coalesced(tool_name)
+        
+        self._record_execution({
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "tool": tool_name,
+            "reasoning": reasoning,
+            "arguments": kwargs,
+            "result": result,
+            "execution_time": execution_time,
+            "cached": False,
+            "coalesced": True,
+            "fallback": fallback
+        })
+        self.logger.info("Coalesced %s with an identical in-flight call, args: %s", tool_name, LazyJson(kwargs))
+        console_logger.info("📊 Result (shared): %s\n", result)
+        return result
+    
+    def _on_success(self, tool_name: str, reasoning: str, kwargs: Dict[str, Any], result: Any, start_time: float,
+                    fallback: Optional[str] = None) -> Any:
+        execution_time = time.time() - start_time
+        # A fallback answer means the tool itself failed
+        self.metrics.observe(tool_name, execution_time, error=fallback is not None)
+        
+        # Error strings from the tools and fallback results are returned but never cached
+        cache = self.caches.get(tool_name)
+        if cache is not None and fallback is None and not (isinstance(result, str) and result.startswith("Error")):
+            cache.set(ResultCache.make_key(kwargs), result)
+        
+        # Update usage statistics
+        with self._stats_lock:
+            self.usage_stats[tool_name] += 1
+        
+        # Record execution details
+        execution_record = {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "tool": tool_name,
+            "reasoning": reasoning,
+            "arguments": kwargs,
+            "result": result,
+            "execution_time": execution_time,
+            "cached": False,
+            "coalesced": False,
+            "fallback": fallback
+        }
+        self._record_execution(execution_record)
+        
+        # Log the execution details to file
+        self.logger.info("Executed %s with args: %s", tool_name, LazyJson(kwargs))
+        self.logger.info("Result: %s", result)
+        self.logger.info("Execution time: %.4f seconds", execution_time)
+        
+        # Print user-friendly output to console
+        console_logger.info("📊 Result%s: %s\n", f" ({fallback})" if fallback else "", result)
+        
+        return result
+    
+    def _on_failure(self, tool_name: str, reasoning: str, kwargs: Dict[str, Any], error: Exception, start_time: float,
+                    coalesced: bool = False) -> str:
+        error_msg = f"Error executing {tool_name}: {str(error)}"
+        self.logger.error(error_msg)
+        execution_time = time.time() - start_time
+        if coalesced:
+            # The leader already recorded the failed execution
+            self.metrics.observe_coalesced(tool_name)
+        else:
+            self.metrics.observe(tool_name, execution_time, error=True)
+        
+        # Record execution failure
+        execution_record = {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "tool": tool_name,
+            "reasoning": reasoning,
+            "arguments": kwargs,
+            "error": str(error),
+            "execution_time": execution_time,
+            "coalesced": coalesced
+        }
+        self._record_execution(execution_record)
+        
+        return error_msg
+    
+    def _record_execution(self, execution_record: Dict[str, Any]) -> None:
+        """
+        Stream a record to the JSONL sink in full and keep a compact copy in the ring buffer.
+        
+        Args:
+            execution_record (Dict[str, Any]): Execution details
+        """
+        with self._stats_lock:
+            self.execution_count += 1
+        if self.history_sink:
+            self.history_sink.write(execution_record)
+        
+        result = execution_record.get("result")
+        if isinstance(result, str) and len(result) > self.max_result_chars:
+            execution_record = {**execution_record, "result": result[:self.max_result_chars] + "...", "result_truncated": True}
+        self.execution_history.append(execution_record)
     
     def get_usage_stats(self) -> Dict[str, int]:
         """
@@ -138,26 +659,88 @@ class ToolManager:
         """
         return self.usage_stats
     
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get cache hits and size for every tool with a cache.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Tool name to hits, executions, hit rate and entries
+        """
+        stats = {}
+        for name, cache in self.caches.items():
+            hits = self.cache_hits[name]
+            total = hits + self.usage_stats[name]
+            stats[name] = {
+                "hits": hits,
+                "executions": self.usage_stats[name],
+                "hit_rate": hits / total if total else 0.0,
+                "entries": len(cache),
+                "ttl": cache.ttl
+            }
+        return stats
+    
+    def get_resilience_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get circuit breaker state and retry, timeout, hedge, fallback and busy counts for every tool with a policy.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Tool name to breaker state and counters
+        """
+        with self._stats_lock:
+            return {name: {**self.breakers[name].get_state(), **stats} for name, stats in self.resilience_stats.items()}
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get streaming latency percentiles, errors and cache hits for every tool.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Tool name to count, errors, cache_hits, coalesced, mean, p50, p95, p99 and max (seconds)
+        """
+        return self.metrics.summary()
+    
+    def export_prometheus(self, file_path: Optional[str] = None) -> str:
+        """
+        Render tool metrics in the Prometheus text format, optionally writing them to a file.
+        
+        Args:
+            file_path (Optional[str]): Path to write the metrics to (e.g. for the node exporter textfile collector)
+            
+        Returns:
+            str: Exposition text
+        """
+        text = self.metrics.to_prometheus()
+        if file_path:
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            temp_path = f"{file_path}.tmp"
+            with open(temp_path, 'w') as f:
+                f.write(text)
+            os.replace(temp_path, file_path)
+        return text
+    
     def get_execution_history(self) -> List[Dict[str, Any]]:
         """
-        Get the full execution history.
+        Get the recent execution history from the in-memory ring buffer.
         
         Returns:
-            List[Dict[str, Any]]: List of execution records
+            List[Dict[str, Any]]: Up to history_capacity most recent execution records
         """
-        return self.execution_history
+        return list(self.execution_history)
     
     def export_execution_history(self, file_path: str) -> None:
         """
-        Export the execution history to a JSON file.
+        Export the recent execution history as JSON lines.
+        
+        The complete history is already streamed to the JSONL sink, so this only
+        writes the bounded ring buffer.
         
         Args:
-            file_path (str): Path to save the JSON file
+            file_path (str): Path to save the JSONL file
         """
         # Create logs directory if it doesn't exist
         os.makedirs(os.path.dirname(file_path) or "logs", exist_ok=True)
         
         with open(file_path, 'w') as f:
-            json.dump(self.execution_history, f, indent=2)
-        self.logger.info(f"Exported execution history to {file_path}")
-        console_logger.info(f"\n📝 Execution history saved to {file_path}\n")
+            for record in self.get_execution_history():
+                f.write(json.dumps(record, default=str) + "\n")
+        self.logger.info("Exported execution history to %s", file_path)
+        console_logger.info("\n📝 Execution history saved to %s\n", file_path)
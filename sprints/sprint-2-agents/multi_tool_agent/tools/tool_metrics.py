@@ -0,0 +1,177 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Any, Optional
+
+# Upper bounds (seconds) of the latency buckets; the last bucket is +Inf
+DEFAULT_BUCKETS = [
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+]
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with constant memory per tool.
+
+    Quantiles are estimated by linear interpolation inside the bucket that
+    contains the requested rank, the same way Prometheus' histogram_quantile does.
+    """
+
+    def __init__(self, buckets: Optional[List[float]] = None):
+        self.buckets = list(buckets or DEFAULT_BUCKETS)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Add one latency sample.
+
+        Args:
+            seconds (float): Observed latency
+        """
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            q (float): Quantile between 0 and 1 (e.g. 0.95)
+
+        Returns:
+            Optional[float]: Estimated latency in seconds, None without samples
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                # Samples above the last bound are only known to be <= max
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - cumulative) / bucket_count
+                return min(estimate, self.max)
+            cumulative += bucket_count
+        return self.max
+
+    def cumulative_counts(self) -> List[int]:
+        """
+        Get cumulative counts per bucket (including +Inf), as Prometheus expects.
+
+        Returns:
+            List[int]: Cumulative count for each upper bound
+        """
+        totals, running = [], 0
+        for bucket_count in self.counts:
+            running += bucket_count
+            totals.append(running)
+        return totals
+
+class ToolMetrics:
+    """
+    Streaming per-tool metrics: latency histogram of executed calls, error count,
+    cache hits and calls coalesced into an identical in-flight execution.
+    """
+
+    def __init__(self, buckets: Optional[List[float]] = None):
+        self.buckets = list(buckets or DEFAULT_BUCKETS)
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+        self.cache_hits: Dict[str, int] = {}
+        self.coalesced: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def register(self, tool_name: str) -> None:
+        with self._lock:
+            self.histograms.setdefault(tool_name, LatencyHistogram(self.buckets))
+            self.errors.setdefault(tool_name, 0)
+            self.cache_hits.setdefault(tool_name, 0)
+            self.coalesced.setdefault(tool_name, 0)
+
+    def observe(self, tool_name: str, seconds: float, error: bool = False) -> None:
+        """
+        Record one executed (uncached) call.
+
+        Args:
+            tool_name (str): Name of the tool
+            seconds (float): Execution time
+            error (bool): Whether the call failed (also when a fallback answered it)
+        """
+        with self._lock:
+            self.histograms[tool_name].observe(seconds)
+            if error:
+                self.errors[tool_name] += 1
+
+    def observe_cache_hit(self, tool_name: str) -> None:
+        with self._lock:
+            self.cache_hits[tool_name] += 1
+
+    def observe_coalesced(self, tool_name: str) -> None:
+        with self._lock:
+            self.coalesced[tool_name] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get latency percentiles, errors and cache hits per tool.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Tool name to count, errors, cache_hits, coalesced, mean, p50, p95, p99 and max (seconds)
+        """
+        with self._lock:
+            summary = {}
+            for name, histogram in self.histograms.items():
+                summary[name] = {
+                    "count": histogram.count,
+                    "errors": self.errors[name],
+                    "cache_hits": self.cache_hits[name],
+                    "coalesced": self.coalesced[name],
+                    "mean": histogram.sum / histogram.count if histogram.count else None,
+                    "p50": histogram.quantile(0.50),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99),
+                    "max": histogram.max if histogram.count else None
+                }
+            return summary
+
+    def to_prometheus(self, prefix: str = "tool") -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Metric name prefix
+
+        Returns:
+            str: Exposition text
+        """
+        lines = [
+            f"# HELP {prefix}_execution_seconds Latency of executed (uncached) tool calls",
+            f"# TYPE {prefix}_execution_seconds histogram"
+        ]
+        with self._lock:
+            for name, histogram in self.histograms.items():
+                bounds = [str(bound) for bound in histogram.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, histogram.cumulative_counts()):
+                    lines.append(f'{prefix}_execution_seconds_bucket{{tool="{name}",le="{bound}"}} {count}')
+                lines.append(f'{prefix}_execution_seconds_sum{{tool="{name}"}} {histogram.sum}')
+                lines.append(f'{prefix}_execution_seconds_count{{tool="{name}"}} {histogram.count}')
+
+            lines.append(f"# HELP {prefix}_errors_total Tool calls that failed, including those answered by a fallback")
+            lines.append(f"# TYPE {prefix}_errors_total counter")
+            for name, count in self.errors.items():
+                lines.append(f'{prefix}_errors_total{{tool="{name}"}} {count}')
+
+            lines.append(f"# HELP {prefix}_cache_hits_total Tool calls answered from the result cache")
+            lines.append(f"# TYPE {prefix}_cache_hits_total counter")
+            for name, count in self.cache_hits.items():
+                lines.append(f'{prefix}_cache_hits_total{{tool="{name}"}} {count}')
+
+            lines.append(f"# HELP {prefix}_coalesced_total Tool calls that shared an identical in-flight execution")
+            lines.append(f"# TYPE {prefix}_coalesced_total counter")
+            for name, count in self.coalesced.items():
+                lines.append(f'{prefix}_coalesced_total{{tool="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
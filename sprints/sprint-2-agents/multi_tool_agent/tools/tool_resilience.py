@@ -0,0 +1,155 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Any, Optional
+
+class ToolResultError(Exception):
+    """
+    Raised when a tool returned a result its policy classifies as a failure
+    (e.g. an "Error ..." string from a tool that catches its own exceptions).
+    """
+
+    def __init__(self, result: Any):
+        super().__init__(str(result))
+        self.result = result
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a call is rejected because the tool's circuit breaker is open.
+    """
+
+class ToolBusyError(Exception):
+    """
+    Raised when an attempt is rejected because the tool already has max_in_flight
+    blocking calls running (including attempts abandoned after a timeout).
+    """
+
+class ToolPolicy:
+    """
+    Resilience settings for one tool.
+
+    Args:
+        timeout (Optional[float]): Seconds per attempt before it is abandoned (None = no limit).
+            A blocking tool cannot be interrupted, so an abandoned attempt keeps its pool
+            thread until the tool returns; retries and hedges start new threads meanwhile
+        retries (int): Extra attempts after a failure or timeout
+        backoff_base (float): Base delay for exponential backoff with full jitter
+        backoff_max (float): Upper bound of a single backoff delay
+        hedge_after (Optional[float]): Start a second, parallel attempt when the first has not
+            finished after this many seconds; the first successful result wins (None = no hedging)
+        failure_threshold (int): Consecutive failed calls that open the circuit
+        reset_timeout (float): Seconds an open circuit waits before letting one trial call through
+        is_failure (Optional[Callable[[Any], bool]]): Classifies returned results as failures
+        fallback (Optional[Callable[..., Any]]): Called with the tool arguments when the circuit is
+            open or all attempts failed and no earlier cached result is available
+        max_in_flight (Optional[int]): Most threads a blocking tool may occupy at once, counting
+            abandoned attempts that are still running; further attempts fail with ToolBusyError
+            instead of queueing behind them (None = only the pool size limits them)
+    """
+
+    def __init__(self, timeout: Optional[float] = 10.0, retries: int = 2, backoff_base: float = 0.25,
+                 backoff_max: float = 4.0, hedge_after: Optional[float] = None, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, is_failure: Optional[Callable[[Any], bool]] = None,
+                 fallback: Optional[Callable[..., Any]] = None, max_in_flight: Optional[int] = 4):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_after = hedge_after
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure
+        self.fallback = fallback
+        self.max_in_flight = max_in_flight
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Delay before retry number `attempt` (1-based), with full jitter.
+
+        Args:
+            attempt (int): Retry number
+
+        Returns:
+            float: Seconds to wait
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    closed: calls pass through and consecutive failures are counted.
+    open: calls are rejected until reset_timeout has passed.
+    half_open: a single trial call is let through; success closes the circuit,
+    failure opens it again, and a cancelled trial lets the next call try.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may proceed (counts rejections).
+
+        Returns:
+            bool: True if the call may proceed
+        """
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Free the half-open trial slot of a call that ended without an outcome (e.g. was cancelled)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.times_opened += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get the breaker state for usage summaries.
+
+        Returns:
+            Dict[str, Any]: state, consecutive_failures, times_opened, rejected and seconds_until_retry
+        """
+        with self._lock:
+            retry_in = None
+            if self.state == "open":
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+                "seconds_until_retry": retry_in
+            }
@@ -1,13 +1,26 @@
 import os
-import requests
+from typing import List
 from dotenv import load_dotenv
 
+from shared.weather_client import get_weather_client, describe, is_found, WeatherRequestError
+
 load_dotenv()
 
+def _format_weather(city: str, response: dict) -> str:
+    if not is_found(response):
+        return f"Weather not found for {city}."
+
+    weather_desc, temp = describe(response)
+    return f"Current weather in {city}: {weather_desc}, Temperature: {temp}°C."
+
 def get_weather(city: str) -> str:
     """
     Get current weather information for a specified city.
     
+    Uses the shared pooled weather client, so repeated lookups reuse one
+    keep-alive connection and recent results (for any spelling of the city)
+    come from its cache.
+    
     Args:
         city (str): Name of the city to get weather for
         
@@ -18,12 +31,30 @@ def get_weather(city: str) -> str:
     if not API_KEY:
         return "OpenWeather API key is not set."
 
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={API_KEY}&units=metric"
-    response = requests.get(url).json()
+    return _format_weather(city, get_weather_client().get_current(city))
 
-    if response.get("cod") != 200:
-        return f"Weather not found for {city}."
+def get_weather_many(cities: List[str]) -> str:
+    """
+    Get current weather for several cities at once, fetched concurrently.
+    
+    Args:
+        cities (List[str]): Names of the cities to get weather for
+        
+    Returns:
+        str: One weather line per city
+    """
+    API_KEY = os.getenv("OPENWEATHER_API_KEY")
+    if not API_KEY:
+        return "OpenWeather API key is not set."
 
-    weather_desc = response["weather"][0]["description"]
-    temp = response["main"]["temp"]
-    return f"Current weather in {city}: {weather_desc}, Temperature: {temp}°C."
+    results = get_weather_client().get_many(cities)
+    errors = [result for result in results if isinstance(result, WeatherRequestError)]
+    if errors and len(errors) == len(results):
+        # Nothing came back, so let the tool policy retry or fall back
+        raise errors[0]
+
+    return "\n".join(
+        f"Error fetching weather for {city}: {result}" if isinstance(result, WeatherRequestError)
+        else _format_weather(city, result)
+        for city, result in zip(cities, results)
+    )
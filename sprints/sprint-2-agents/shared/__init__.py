@@ -0,0 +1,4 @@
+"""
+Shared Components for Sprint 2 Agents
+Modules used by more than one agent project (multi_agent, multi_tool_agent, single_tool_agents)
+"""
@@ -0,0 +1,70 @@
+"""
+Batch Report
+Per-city results, latency and throughput for the single-tool agents' batch runs
+"""
+
+import statistics
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class CityResult:
+    """Outcome of one city in a batch run"""
+
+    def __init__(self, city: str, output: Optional[str], latency: float, error: Optional[str] = None):
+        self.city = city
+        self.output = output
+        self.latency = latency
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def read_cities(cities: Iterable[str] = (), path: Optional[str] = None) -> List[str]:
+    """Cities from the command line plus a file (one per line, '#' comments, '-' for stdin)"""
+    names = [city.strip() for city in cities if city.strip()]
+    if path:
+        import sys
+        stream = sys.stdin if path == "-" else open(path, 'r')
+        try:
+            names += [line.strip() for line in stream if line.strip() and not line.strip().startswith("#")]
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+    return names
+
+
+def summarize(results: List[CityResult], elapsed: float) -> Dict[str, Any]:
+    """Latency percentiles and throughput for a batch that took `elapsed` seconds of wall time"""
+    latencies = sorted(result.latency for result in results)
+    return {
+        "cities": len(results),
+        "errors": sum(1 for result in results if not result.ok),
+        "wall_seconds": elapsed,
+        "cities_per_minute": len(results) / elapsed * 60 if elapsed > 0 else 0.0,
+        "median_latency": statistics.median(latencies) if latencies else 0.0,
+        "max_latency": latencies[-1] if latencies else 0.0,
+        # Sequential time / wall time: how much the concurrency bought
+        "speedup": sum(latencies) / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def print_report(results: List[CityResult], elapsed: float, show_output: bool = True):
+    """Print each city's answer and latency, then the batch summary"""
+    if show_output:
+        for result in results:
+            print("\n" + "=" * 60)
+            print(f"📍 {result.city} ({result.latency:.2f}s)")
+            print("-" * 60)
+            print(result.output if result.ok else f"❌ Error: {result.error}")
+
+    summary = summarize(results, elapsed)
+    print("\n" + "=" * 60)
+    print("📊 BATCH SUMMARY")
+    for result in results:
+        status = "ok" if result.ok else "error"
+        print(f"  {result.city:<24} {result.latency:7.2f}s  {status}")
+    print(f"\n  {summary['cities']} cities ({summary['errors']} errors) in {summary['wall_seconds']:.2f}s: "
+          f"{summary['cities_per_minute']:.1f} cities/min, median {summary['median_latency']:.2f}s, "
+          f"max {summary['max_latency']:.2f}s, {summary['speedup']:.1f}x vs sequential")
@@ -0,0 +1,135 @@
+"""
+Weather Client Benchmark
+Compares one-off requests.get calls (a new connection per lookup, as the agents
+used to do) with the pooled WeatherClient, sync and async, against a local stub
+of the OpenWeather API. --handshake-ms adds a delay to every new connection to
+stand in for the TCP + TLS setup of the real API.
+
+Usage: python shared/benchmark_weather_client.py [--lookups 50] [--handshake-ms 30] [--concurrency 10]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import importlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from shared.weather_client import WeatherClient
+
+CITIES = ["London", "Paris", "Cape Town", "Tokyo", "New York", "Nairobi", "Sydney", "Lima", "Oslo", "Cairo"]
+
+
+class StubWeatherHandler(BaseHTTPRequestHandler):
+    """Answers /weather with a fixed payload over HTTP/1.1 keep-alive"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, keep-alive responses hit the ~40 ms delayed-ACK stall
+    disable_nagle_algorithm = True
+    handshake_seconds = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        with StubWeatherHandler.lock:
+            StubWeatherHandler.connections += 1
+        time.sleep(self.handshake_seconds)
+        super().setup()
+
+    def do_GET(self):
+        body = json.dumps({
+            "cod": 200,
+            "weather": [{"description": "clear sky"}],
+            "main": {"temp": 21.5}
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubWeatherServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops concurrent connects and adds 1 s SYN retries
+    request_queue_size = 128
+
+
+def start_stub_server(handshake_ms: float) -> ThreadingHTTPServer:
+    StubWeatherHandler.handshake_seconds = handshake_ms / 1000
+    server = StubWeatherServer(("127.0.0.1", 0), StubWeatherHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_unpooled(base_url: str, lookups: int):
+    for index in range(lookups):
+        params = {"q": CITIES[index % len(CITIES)], "appid": "stub", "units": "metric"}
+        requests.get(f"{base_url}/weather", params=params, timeout=(3.05, 10)).json()
+
+
+def run_pooled(client: WeatherClient, lookups: int):
+    for index in range(lookups):
+        client.get_current(CITIES[index % len(CITIES)])
+
+
+async def run_async(client: WeatherClient, lookups: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(city: str):
+        async with semaphore:
+            await client.aget_current(city)
+
+    await asyncio.gather(*(lookup(CITIES[index % len(CITIES)]) for index in range(lookups)))
+    await client.aclose()
+
+
+def measure(name: str, lookups: int, run) -> None:
+    StubWeatherHandler.connections = 0
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    print(f"{name:<28} {elapsed * 1000:8.1f} ms total   {elapsed / lookups * 1000:6.2f} ms/lookup   "
+          f"{StubWeatherHandler.connections:3d} connections")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared weather client against a local stub")
+    parser.add_argument("--lookups", type=int, default=50, help="Lookups per mode")
+    parser.add_argument("--handshake-ms", type=float, default=30.0, help="Simulated setup cost per new connection")
+    parser.add_argument("--concurrency", type=int, default=10, help="In-flight lookups for the async mode")
+    args = parser.parse_args()
+
+    server = start_stub_server(args.handshake_ms)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"{args.lookups} lookups per mode, {args.handshake_ms:g} ms per new connection\n")
+
+    # Load httpx up front so the async row measures lookups, not module loading
+    importlib.import_module("httpx")
+
+    try:
+        measure("requests.get per lookup", args.lookups, lambda: run_unpooled(base_url, args.lookups))
+
+        client = WeatherClient(api_key="stub", base_url=base_url)
+        measure("pooled sync (Session)", args.lookups, lambda: run_pooled(client, args.lookups))
+        client.close()
+
+        client = WeatherClient(api_key="stub", base_url=base_url, pool_size=args.concurrency)
+        measure(f"pooled async (x{args.concurrency})", args.lookups,
+                lambda: asyncio.run(run_async(client, args.lookups, args.concurrency)))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
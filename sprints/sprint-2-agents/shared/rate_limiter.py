@@ -0,0 +1,318 @@
+"""
+Rate Limiter for Model Calls
+Token-bucket limiting of requests/minute and tokens/minute plus a max-in-flight
+semaphore, shared by every agent that talks to the same OpenAI account
+"""
+
+import os
+import re
+import time
+import asyncio
+from typing import Any, Dict, Optional
+
+
+class TokenBucket:
+    """Token bucket that refills continuously up to its capacity"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self.updated_at = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float, now: float):
+        """Take tokens from the bucket (may go negative when correcting estimates)"""
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        """Give back tokens that were reserved but not used"""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse OpenAI reset durations such as '1s', '6m0s' or '20ms' into seconds"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    matched = False
+    for amount, unit in re.findall(r"([\d.]+)(ms|h|m|s)", value):
+        matched = True
+        amount = float(amount)
+        if unit == "ms":
+            total += amount / 1000
+        elif unit == "s":
+            total += amount
+        elif unit == "m":
+            total += amount * 60
+        elif unit == "h":
+            total += amount * 3600
+    return total if matched else None
+
+
+class RateLimiter:
+    """Shared limiter for requests/minute, tokens/minute and concurrent requests
+
+    The effective rate adapts to the account: every 429 cuts the refill rate
+    multiplicatively and pauses all callers until the reset reported in the
+    rate-limit headers, while successful calls recover it additively up to the
+    configured ceiling. This keeps throughput near the account limit instead of
+    oscillating between bursts and backoff storms.
+    """
+
+    def __init__(self, requests_per_minute: int = 500, tokens_per_minute: int = 200_000,
+                 max_in_flight: int = 8, min_rate_fraction: float = 0.1):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_in_flight = max_in_flight
+        self.min_rate_fraction = min_rate_fraction
+
+        self._request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self._token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self._rate_fraction = 1.0
+        self._paused_until = 0.0
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._lock = asyncio.Lock()
+
+        self._waiting = 0
+        self._in_flight = 0
+        # 429s since the last successful call, for backoff when the server gives no reset time
+        self._consecutive_rate_limited = 0
+        self.stats = {
+            "requests": 0,
+            "rate_limited": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "last_wait_seconds": 0.0,
+            "tokens_used": 0
+        }
+
+    async def acquire(self, estimated_tokens: int = 1000):
+        """Wait until a request with `estimated_tokens` may be sent"""
+        self._waiting += 1
+        start = time.monotonic()
+        acquired = False
+        try:
+            await self._semaphore.acquire()
+            acquired = True
+            # The lock keeps waiters FIFO so large requests are not starved
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    delay = max(
+                        self._paused_until - now,
+                        self._request_bucket.time_until(1, now),
+                        self._token_bucket.time_until(estimated_tokens, now)
+                    )
+                    if delay <= 0:
+                        self._request_bucket.consume(1, now)
+                        self._token_bucket.consume(estimated_tokens, now)
+                        break
+                    await asyncio.sleep(delay)
+        except BaseException:
+            if acquired:
+                self._semaphore.release()
+            raise
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - start
+        self._in_flight += 1
+        self.stats["requests"] += 1
+        self.stats["total_wait_seconds"] += waited
+        self.stats["last_wait_seconds"] = waited
+        self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], waited)
+
+    def release(self, used_tokens: int, estimated_tokens: int):
+        """Release an in-flight slot and correct the token reservation"""
+        self._in_flight -= 1
+        self._semaphore.release()
+        self.stats["tokens_used"] += used_tokens
+        if used_tokens < estimated_tokens:
+            self._token_bucket.refund(estimated_tokens - used_tokens)
+        elif used_tokens > estimated_tokens:
+            self._token_bucket.consume(used_tokens - estimated_tokens, time.monotonic())
+
+    def record_success(self):
+        """Additively recover the refill rate after a successful call"""
+        self._consecutive_rate_limited = 0
+        if self._rate_fraction < 1.0:
+            self._set_rate_fraction(self._rate_fraction + 0.05)
+
+    def record_rate_limited(self, headers: Optional[Dict[str, str]] = None):
+        """Back off after a 429 using the rate-limit headers when present"""
+        self.stats["rate_limited"] += 1
+        self._consecutive_rate_limited += 1
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+
+        # Learn the real account limits if the server reports them
+        limit_requests = headers.get("x-ratelimit-limit-requests")
+        limit_tokens = headers.get("x-ratelimit-limit-tokens")
+        if limit_requests and limit_requests.isdigit():
+            self.requests_per_minute = min(self.requests_per_minute, int(limit_requests))
+        if limit_tokens and limit_tokens.isdigit():
+            self.tokens_per_minute = min(self.tokens_per_minute, int(limit_tokens))
+
+        retry_after = None
+        if "retry-after-ms" in headers:
+            retry_after = _parse_duration(headers["retry-after-ms"])
+            retry_after = retry_after / 1000 if retry_after is not None else None
+        if retry_after is None and "retry-after" in headers:
+            retry_after = _parse_duration(headers["retry-after"])
+        if retry_after is None:
+            resets = [
+                _parse_duration(headers.get("x-ratelimit-reset-requests", "")),
+                _parse_duration(headers.get("x-ratelimit-reset-tokens", ""))
+            ]
+            resets = [r for r in resets if r is not None]
+            retry_after = max(resets) if resets else None
+        if retry_after is None:
+            # No hint from the server: exponential backoff on consecutive 429s
+            retry_after = min(60.0, 2 ** min(self._consecutive_rate_limited, 6) * 0.5)
+
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        self._set_rate_fraction(self._rate_fraction * 0.7)
+
+    def _set_rate_fraction(self, fraction: float):
+        self._rate_fraction = max(self.min_rate_fraction, min(1.0, fraction))
+        rpm = self.requests_per_minute * self._rate_fraction
+        tpm = self.tokens_per_minute * self._rate_fraction
+        self._request_bucket.capacity = max(1.0, rpm)
+        self._request_bucket.refill_per_second = rpm / 60
+        self._token_bucket.capacity = max(1.0, tpm)
+        self._token_bucket.refill_per_second = tpm / 60
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current queue depth, wait times and effective limits"""
+        requests = self.stats["requests"]
+        return {
+            **self.stats,
+            "queue_depth": self._waiting,
+            "in_flight": self._in_flight,
+            "average_wait_seconds": self.stats["total_wait_seconds"] / requests if requests else 0.0,
+            "effective_requests_per_minute": round(self.requests_per_minute * self._rate_fraction, 1),
+            "effective_tokens_per_minute": round(self.tokens_per_minute * self._rate_fraction, 1),
+            "paused_for_seconds": max(0.0, self._paused_until - time.monotonic())
+        }
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for OpenAI 429 errors (checked by attribute so openai is not imported here)"""
+    return getattr(error, "status_code", None) == 429
+
+
+def _error_headers(error: Exception) -> Dict[str, str]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    return dict(headers) if headers else {}
+
+
+def _usage_tokens(result: Any) -> Optional[int]:
+    usage = getattr(result, "usage", None)
+    if usage is None:
+        return None
+    return (getattr(usage, "prompt_tokens", 0) or 0) + (getattr(usage, "completion_tokens", 0) or 0)
+
+
+class RateLimitedChatClient:
+    """Wraps an autogen chat completion client so every call goes through a RateLimiter
+
+    All attributes other than `create` and `create_stream` are delegated to the
+    wrapped client, so the wrapper can be handed to AssistantAgent directly.
+    """
+
+    def __init__(self, model_client, rate_limiter: RateLimiter, max_retries: int = 5,
+                 completion_token_reserve: int = 1024):
+        self._client = model_client
+        self._limiter = rate_limiter
+        self._max_retries = max_retries
+        self._completion_token_reserve = completion_token_reserve
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._limiter
+
+    @property
+    def wrapped_client(self):
+        return self._client
+
+    def _estimate_tokens(self, messages, kwargs) -> int:
+        """Rough prompt size (4 characters per token) plus a completion reserve"""
+        characters = sum(len(str(getattr(m, "content", m))) for m in messages)
+        characters += sum(len(str(getattr(t, "schema", t))) for t in kwargs.get("tools", []) or [])
+        return characters // 4 + self._completion_token_reserve
+
+    async def create(self, messages, **kwargs):
+        estimate = self._estimate_tokens(messages, kwargs)
+        for attempt in range(self._max_retries + 1):
+            await self._limiter.acquire(estimate)
+            used = estimate
+            try:
+                result = await self._client.create(messages, **kwargs)
+                used = _usage_tokens(result) or estimate
+                self._limiter.record_success()
+                return result
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self._max_retries:
+                    raise
+                self._limiter.record_rate_limited(_error_headers(e))
+            finally:
+                self._limiter.release(used, estimate)
+
+    async def create_stream(self, messages, **kwargs):
+        estimate = self._estimate_tokens(messages, kwargs)
+        for attempt in range(self._max_retries + 1):
+            await self._limiter.acquire(estimate)
+            used = estimate
+            yielded = False
+            try:
+                async for chunk in self._client.create_stream(messages, **kwargs):
+                    yielded = True
+                    if not isinstance(chunk, str):
+                        used = _usage_tokens(chunk) or estimate
+                    yield chunk
+                self._limiter.record_success()
+                return
+            except Exception as e:
+                # Once output has been streamed the call cannot be replayed transparently
+                if yielded or not is_rate_limit_error(e) or attempt == self._max_retries:
+                    raise
+                self._limiter.record_rate_limited(_error_headers(e))
+            finally:
+                self._limiter.release(used, estimate)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+_shared_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_shared_rate_limiter() -> RateLimiter:
+    """Process-wide limiter configured from OPENAI_RPM, OPENAI_TPM and OPENAI_MAX_IN_FLIGHT"""
+    global _shared_rate_limiter
+    if _shared_rate_limiter is None:
+        _shared_rate_limiter = RateLimiter(
+            requests_per_minute=int(os.getenv("OPENAI_RPM", "500")),
+            tokens_per_minute=int(os.getenv("OPENAI_TPM", "200000")),
+            max_in_flight=int(os.getenv("OPENAI_MAX_IN_FLIGHT", "8"))
+        )
+    return _shared_rate_limiter
@@ -0,0 +1,169 @@
+import asyncio
+import time
+
+import pytest
+
+from shared.rate_limiter import RateLimitedChatClient, RateLimiter, TokenBucket, _parse_duration
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, headers=None):
+        super().__init__("rate limited")
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+
+class Usage:
+    def __init__(self, prompt_tokens, completion_tokens):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+class Result:
+    def __init__(self, tokens):
+        self.usage = Usage(tokens, 0)
+
+
+class FakeClient:
+    """Chat client that raises the queued errors first, then answers"""
+
+    def __init__(self, errors=(), tokens=10):
+        self.errors = list(errors)
+        self.tokens = tokens
+        self.calls = 0
+        self.model_info = {"family": "fake"}
+
+    async def create(self, messages, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return Result(self.tokens)
+
+
+def test_bucket_refills_continuously_up_to_capacity():
+    bucket = TokenBucket(capacity=10, refill_per_second=2)
+    bucket.consume(10, now=bucket.updated_at)
+    assert bucket.time_until(4, now=bucket.updated_at) == pytest.approx(2.0)
+    assert bucket.time_until(4, now=bucket.updated_at + 2) == 0.0
+    bucket.consume(4, now=bucket.updated_at)
+    bucket.refund(100)
+    assert bucket.tokens == 10
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("1s", 1.0), ("6m0s", 360.0), ("20ms", 0.02), ("1h2m", 3720.0), ("2.5", 2.5), ("", None), ("soon", None)
+])
+def test_reset_durations_are_parsed(value, seconds):
+    assert _parse_duration(value) == (pytest.approx(seconds) if seconds is not None else None)
+
+
+def test_requests_beyond_the_per_minute_budget_wait():
+    limiter = RateLimiter(requests_per_minute=120, tokens_per_minute=1_000_000, max_in_flight=10)
+    limiter._request_bucket.tokens = 1
+
+    async def run():
+        started = time.monotonic()
+        for _ in range(2):
+            await limiter.acquire(estimated_tokens=10)
+            limiter.release(10, 10)
+        return time.monotonic() - started
+
+    # 120 rpm refills one request every 0.5 s
+    assert asyncio.run(run()) >= 0.4
+    assert limiter.stats["requests"] == 2
+    assert limiter.get_stats()["in_flight"] == 0
+
+
+def test_in_flight_requests_are_capped():
+    limiter = RateLimiter(max_in_flight=2)
+    peak, active = [0], [0]
+
+    async def call():
+        await limiter.acquire(10)
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        limiter.release(10, 10)
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak[0] == 2
+
+
+def test_unused_token_reservations_are_refunded():
+    limiter = RateLimiter(tokens_per_minute=10_000)
+
+    async def run():
+        await limiter.acquire(estimated_tokens=4_000)
+        limiter.release(used_tokens=1_000, estimated_tokens=4_000)
+
+    asyncio.run(run())
+    assert limiter._token_bucket.tokens == pytest.approx(9_000, abs=5)
+    assert limiter.stats["tokens_used"] == 1_000
+
+
+def test_429_pauses_callers_and_cuts_the_rate_until_successes_recover_it():
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=100_000)
+    limiter.record_rate_limited({"Retry-After": "2", "x-ratelimit-limit-requests": "60"})
+
+    stats = limiter.get_stats()
+    assert stats["rate_limited"] == 1
+    assert 1.5 < stats["paused_for_seconds"] <= 2
+    assert stats["effective_requests_per_minute"] == pytest.approx(60 * 0.7)
+
+    for _ in range(10):
+        limiter.record_success()
+    assert limiter.get_stats()["effective_requests_per_minute"] == 60
+
+
+def test_rate_never_drops_below_the_minimum_fraction():
+    limiter = RateLimiter(requests_per_minute=100, min_rate_fraction=0.2)
+    for _ in range(20):
+        limiter.record_rate_limited({"retry-after-ms": "1"})
+    assert limiter.get_stats()["effective_requests_per_minute"] == 20
+
+
+def test_client_retries_rate_limit_errors_and_records_usage():
+    limiter = RateLimiter()
+    client = FakeClient(errors=[RateLimitError({"retry-after-ms": "10"})], tokens=42)
+    wrapped = RateLimitedChatClient(client, limiter, max_retries=2)
+
+    result = asyncio.run(wrapped.create(["hello"]))
+
+    assert result.usage.prompt_tokens == 42
+    assert client.calls == 2
+    assert limiter.stats["rate_limited"] == 1
+    assert limiter.stats["tokens_used"] == 42 + wrapped._estimate_tokens(["hello"], {})
+    assert limiter.get_stats()["in_flight"] == 0
+    # Everything else is delegated to the wrapped client
+    assert wrapped.model_info == {"family": "fake"}
+
+
+def test_client_gives_up_after_max_retries_and_does_not_retry_other_errors():
+    limiter = RateLimiter()
+    limited = FakeClient(errors=[RateLimitError({"retry-after-ms": "1"}) for _ in range(3)])
+    with pytest.raises(RateLimitError):
+        asyncio.run(RateLimitedChatClient(limited, limiter, max_retries=1).create(["hi"]))
+    assert limited.calls == 2
+
+    broken = FakeClient(errors=[ValueError("bad request")])
+    with pytest.raises(ValueError):
+        asyncio.run(RateLimitedChatClient(broken, limiter).create(["hi"]))
+    assert broken.calls == 1
+    assert limiter.get_stats()["in_flight"] == 0
+
+
+def test_headerless_backoff_grows_with_consecutive_429s_and_resets_on_success():
+    limiter = RateLimiter()
+    for _ in range(8):
+        limiter.record_rate_limited()
+    assert limiter.get_stats()["paused_for_seconds"] > 30
+
+    limiter._paused_until = 0.0
+    limiter.record_success()
+    limiter.record_rate_limited()
+    assert limiter.get_stats()["paused_for_seconds"] <= 1
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import requests
+
+from shared.weather_client import WeatherCache, WeatherClient, WeatherRequestError, normalize_city
+
+
+def payload(city_id, name, country="ZA", temp=20.0):
+    return {"cod": 200, "id": city_id, "name": name, "sys": {"country": country},
+            "weather": [{"description": "clear sky"}], "main": {"temp": temp}}
+
+
+class FakeSession:
+    """Stands in for requests.Session: answers from a table and records each query"""
+
+    def __init__(self, table, delay=0.0):
+        self.table = table
+        self.delay = delay
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params, timeout):
+        with self._lock:
+            self.queries.append(params["q"])
+        time.sleep(self.delay)
+        if params["q"] not in self.table:
+            raise requests.Timeout(f"timed out fetching {params['q']}")
+        return type("Response", (), {"json": lambda response: self.table[params["q"]]})()
+
+
+def fake_client(table, delay=0.0):
+    client = WeatherClient(api_key="test", cache=WeatherCache())
+    client._session = FakeSession(table, delay)
+    return client
+
+
+def test_city_queries_are_normalized():
+    assert normalize_city("  Cape  Town , ZA") == "cape town,za"
+    assert normalize_city("DURBAN") == "durban"
+
+
+def test_spellings_of_one_location_share_an_entry():
+    cache = WeatherCache()
+    cache.put("cape town", payload(3369157, "Cape Town"))
+
+    assert cache.get("Cape Town")["id"] == 3369157
+    assert cache.get("cape town, za")["id"] == 3369157
+    assert len(cache) == 1
+    assert cache.stats == {"hits": 2, "misses": 0}
+
+
+def test_errors_are_not_cached():
+    cache = WeatherCache()
+    cache.put("atlantis", {"cod": "404", "message": "city not found"})
+    assert cache.get("atlantis") is None
+    assert len(cache) == 0
+
+
+def test_expired_payloads_miss_but_keep_their_alias():
+    cache = WeatherCache(ttl=0.05)
+    cache.put("joburg", payload(993800, "Johannesburg"))
+    time.sleep(0.06)
+
+    assert cache.get("joburg") is None
+    cache.put("Johannesburg,ZA", payload(993800, "Johannesburg", temp=25.0))
+    # The old query still resolves to the refreshed location entry
+    assert cache.get("joburg")["main"]["temp"] == 25.0
+
+
+def test_least_recently_used_locations_are_evicted():
+    cache = WeatherCache(max_entries=2)
+    cache.put("durban", payload(1, "Durban"))
+    cache.put("pretoria", payload(2, "Pretoria"))
+    cache.get("durban")
+    cache.put("polokwane", payload(3, "Polokwane"))
+
+    assert cache.get("durban") is not None
+    assert cache.get("pretoria") is None
+    assert cache.get("polokwane") is not None
+
+
+def test_get_many_fetches_each_city_once_in_input_order():
+    table = {"durban": payload(1, "Durban"), "pretoria": payload(2, "Pretoria")}
+    client = fake_client(table, delay=0.01)
+
+    results = client.get_many(["Durban", "pretoria", " durban ", "nowhere"])
+
+    assert [r["name"] if isinstance(r, dict) else "error" for r in results] == ["Durban", "Pretoria", "Durban", "error"]
+    assert isinstance(results[3], WeatherRequestError)
+    assert sorted(client.session.queries) == ["durban", "nowhere", "pretoria"]
+
+    client.get_many(["DURBAN", "Pretoria"])
+    assert len(client.session.queries) == 3
@@ -0,0 +1,281 @@
+"""
+Weather Client
+One OpenWeather client with keep-alive connection pools (requests for sync
+callers, httpx for async ones) shared by every agent that looks up the weather
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BASE_URL = "https://api.openweathermap.org/data/2.5"
+
+# (connect, read) timeout in seconds so a hung upstream cannot stall an agent
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 10)
+
+
+class WeatherRequestError(Exception):
+    """The weather API could not be reached or did not answer in time"""
+
+
+def normalize_city(city: str) -> str:
+    """Case- and whitespace-insensitive form of a city query ("  Cape  Town , ZA" -> "cape town,za")"""
+    return ",".join(" ".join(part.split()) for part in city.lower().split(","))
+
+
+class WeatherCache:
+    """TTL cache of weather payloads keyed by location, plus a geocode alias table
+
+    Payloads are stored once per location (the OpenWeather city id). Every
+    query that resolved to that location is remembered as an alias, as is the
+    canonical "name,country" form from the payload, so "cape town", "Cape Town"
+    and "Cape Town,ZA" all hit the same entry after a single lookup. Aliases
+    outlive payloads (locations do not move), so an expired entry is refreshed
+    without resolving the query again. Only successful payloads are cached.
+    """
+
+    def __init__(self, ttl: float = 600, alias_ttl: float = 86400, max_entries: int = 512):
+        self.ttl = ttl
+        self.alias_ttl = alias_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._aliases: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def location_key(payload: Dict[str, Any]) -> str:
+        """Stable key for the location a payload describes"""
+        if payload.get("id"):
+            return str(payload["id"])
+        return normalize_city(f"{payload.get('name', '')},{payload.get('sys', {}).get('country', '')}")
+
+    def _resolve(self, query: str, now: float) -> Optional[str]:
+        alias = self._aliases.get(query)
+        if alias is None:
+            return None
+        if alias[0] <= now:
+            del self._aliases[query]
+            return None
+        return alias[1]
+
+    def get(self, city: str) -> Optional[Dict[str, Any]]:
+        """Cached payload for a query, or None if unknown or expired"""
+        now = time.monotonic()
+        with self._lock:
+            key = self._resolve(normalize_city(city), now)
+            entry = self._entries.get(key) if key is not None else None
+            if entry is None or entry[0] <= now:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def put(self, city: str, payload: Dict[str, Any]):
+        """Store a successful payload under its location and alias the query to it"""
+        if not is_found(payload):
+            return
+        now = time.monotonic()
+        key = self.location_key(payload)
+        canonical = normalize_city(f"{payload.get('name', '')},{payload.get('sys', {}).get('country', '')}")
+        with self._lock:
+            for query in {normalize_city(city), canonical}:
+                self._aliases[query] = (now + self.alias_ttl, key)
+            self._entries[key] = (now + self.ttl, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class WeatherClient:
+    """Current-weather lookups over pooled keep-alive connections
+
+    The sync interface reuses one requests.Session, so after the first call
+    lookups skip the TCP and TLS handshake. The async interface reuses one
+    httpx.AsyncClient per event loop. Both return the decoded OpenWeather
+    payload; API errors (unknown city, bad key) come back as a payload whose
+    "cod" is not 200, while transport failures raise WeatherRequestError.
+    With a WeatherCache, fresh payloads are served without a request.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = DEFAULT_BASE_URL,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT, pool_size: int = 10,
+                 units: str = "metric", cache: Optional[WeatherCache] = None):
+        self._api_key = api_key
+        self.cache = cache
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.units = units
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._async_clients: Dict[asyncio.AbstractEventLoop, Any] = {}
+
+    @property
+    def api_key(self) -> Optional[str]:
+        """The configured key, else OPENWEATHER_API_KEY (read per call so .env loading order does not matter)"""
+        return self._api_key or os.getenv("OPENWEATHER_API_KEY")
+
+    @property
+    def session(self) -> requests.Session:
+        """The pooled requests session, created on first use"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def _params(self, city: str) -> Dict[str, str]:
+        return {"q": city, "appid": self.api_key or "", "units": self.units}
+
+    def get_current(self, city: str) -> Dict[str, Any]:
+        """Current weather payload for a city
+
+        Raises:
+            WeatherRequestError: On connection errors, timeouts or a non-JSON response
+        """
+        cached = self.cache.get(city) if self.cache is not None else None
+        if cached is not None:
+            return cached
+        try:
+            response = self.session.get(f"{self.base_url}/weather", params=self._params(city), timeout=self.timeout)
+            payload = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise WeatherRequestError(str(e)) from e
+        if self.cache is not None:
+            self.cache.put(city, payload)
+        return payload
+
+    def _get_or_error(self, city: str) -> Union[Dict[str, Any], WeatherRequestError]:
+        try:
+            return self.get_current(city)
+        except WeatherRequestError as e:
+            return e
+
+    def get_many(self, cities: List[str]) -> List[Union[Dict[str, Any], WeatherRequestError]]:
+        """Current weather for many cities, fetched concurrently over the pool
+
+        Queries that normalize to the same city are fetched once. Results are in
+        input order; a city whose lookup failed gets its WeatherRequestError
+        instead of a payload (like asyncio.gather(return_exceptions=True)).
+        """
+        queries = list(dict.fromkeys(normalize_city(city) for city in cities))
+        if not queries:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(queries))) as pool:
+            results = dict(zip(queries, pool.map(self._get_or_error, queries)))
+        return [results[normalize_city(city)] for city in cities]
+
+    def _async_client(self):
+        """The httpx client for the running event loop (connections cannot be shared across loops)"""
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("The async weather interface requires httpx (pip install httpx)") from e
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            # Forget clients whose loop is gone (e.g. earlier asyncio.run calls)
+            for stale in [stale for stale in self._async_clients if stale.is_closed()]:
+                del self._async_clients[stale]
+            connect, read = self.timeout
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read, connect=connect),
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+            )
+            self._async_clients[loop] = client
+        return client
+
+    async def aget_current(self, city: str) -> Dict[str, Any]:
+        """Async variant of get_current
+
+        Raises:
+            WeatherRequestError: On connection errors, timeouts or a non-JSON response
+        """
+        cached = self.cache.get(city) if self.cache is not None else None
+        if cached is not None:
+            return cached
+        client = self._async_client()
+        import httpx
+        try:
+            response = await client.get(f"{self.base_url}/weather", params=self._params(city))
+            payload = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise WeatherRequestError(str(e)) from e
+        if self.cache is not None:
+            self.cache.put(city, payload)
+        return payload
+
+    async def aget_many(self, cities: List[str]) -> List[Union[Dict[str, Any], WeatherRequestError]]:
+        """Async variant of get_many (concurrency is bounded by the httpx pool size)"""
+        queries = list(dict.fromkeys(normalize_city(city) for city in cities))
+        payloads = await asyncio.gather(*(self.aget_current(query) for query in queries), return_exceptions=True)
+        results = {}
+        for query, payload in zip(queries, payloads):
+            if isinstance(payload, BaseException) and not isinstance(payload, WeatherRequestError):
+                raise payload
+            results[query] = payload
+        return [results[normalize_city(city)] for city in cities]
+
+    def close(self):
+        """Close the sync connection pool"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    async def aclose(self):
+        """Close the async client of the running loop and the sync pool"""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+        self.close()
+
+
+def describe(payload: Dict[str, Any]) -> Tuple[str, float]:
+    """(description, temperature) from a successful payload"""
+    return payload["weather"][0]["description"], payload["main"]["temp"]
+
+
+def is_found(payload: Dict[str, Any]) -> bool:
+    """True if the payload is a successful lookup ("cod" is 200, sometimes sent as a string)"""
+    return str(payload.get("cod")) == "200"
+
+
+_shared_weather_client: Optional[WeatherClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_weather_client() -> WeatherClient:
+    """Process-wide client configured from OPENWEATHER_BASE_URL, WEATHER_POOL_SIZE and
+    WEATHER_CACHE_TTL (seconds, default 600; 0 disables the cache)"""
+    global _shared_weather_client
+    if _shared_weather_client is None:
+        with _shared_lock:
+            if _shared_weather_client is None:
+                cache_ttl = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+                _shared_weather_client = WeatherClient(
+                    base_url=os.getenv("OPENWEATHER_BASE_URL", DEFAULT_BASE_URL),
+                    pool_size=int(os.getenv("WEATHER_POOL_SIZE", "10")),
+                    cache=WeatherCache(ttl=cache_ttl) if cache_ttl > 0 else None
+                )
+    return _shared_weather_client
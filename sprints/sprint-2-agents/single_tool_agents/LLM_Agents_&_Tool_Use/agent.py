@@ -1,5 +1,8 @@
 # agent.py
+import time
+import asyncio
 from tools import get_weather, dress_recommendation
+from shared.batch_report import CityResult
 
 def run_agent(task, location):
     print(f"🧠 Task: {task} for {location}")
@@ -23,3 +26,22 @@ def run_agent(task, location):
 
     # Step 6: Final Answer
     print(f"\n✅ Final Answer:\n{advice}")
+
+# Batch: the same Think → Act → Observe loop for many locations at once.
+# Each location runs on a worker thread; all of them share the OpenAI client, the
+# pooled weather client and the recommendation cache.
+async def run_agents(task, locations, max_concurrency=4):
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_location(location):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                weather = await asyncio.to_thread(get_weather, location)
+                advice = await asyncio.to_thread(dress_recommendation, weather)
+                return CityResult(location, f"Weather: {weather}\n\n{advice}", time.perf_counter() - started)
+            except Exception as e:
+                return CityResult(location, None, time.perf_counter() - started, error=str(e))
+
+    print(f"🧠 Task: {task} for {len(locations)} locations (up to {max_concurrency} at a time)")
+    return await asyncio.gather(*(run_location(location) for location in locations))
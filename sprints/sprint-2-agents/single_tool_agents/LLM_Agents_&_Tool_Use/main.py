@@ -1,7 +1,36 @@
 # main.py
-from agent import run_agent
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+# tools.py and agent.py import the sprint-level shared package
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from agent import run_agent, run_agents
+from tools import warm_up_recommendations
+from shared.batch_report import read_cities, print_report
 
 if __name__ == "__main__":
-    location = input("📍 Enter your city or location: ")
+    parser = argparse.ArgumentParser(description="What to wear for one location (interactive) or many (batch)")
+    parser.add_argument("--cities", nargs="+", default=[], help="Locations to run concurrently")
+    parser.add_argument("--file", "-f", help="File with one location per line ('-' for stdin)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum locations in flight")
+    # --warm-up precomputes clothing advice for every weather category and temperature band
+    parser.add_argument("--warm-up", action="store_true", help="Precompute the clothing advice cache first")
+    args = parser.parse_args()
+
+    if args.warm_up:
+        added = warm_up_recommendations()
+        print(f"🔥 Warmed up {added} recommendation(s)")
+
     task = "What should I wear today?"
-    run_agent(task, location)
+    locations = read_cities(args.cities, args.file)
+    if not locations:
+        location = input("📍 Enter your city or location: ")
+        run_agent(task, location)
+    else:
+        started = time.perf_counter()
+        results = asyncio.run(run_agents(task, locations, max_concurrency=args.concurrency))
+        print_report(results, time.perf_counter() - started)
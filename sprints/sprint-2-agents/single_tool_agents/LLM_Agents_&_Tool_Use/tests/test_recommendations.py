@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("openai")
+# The module builds its OpenAI client on import; no request is made in these tests
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import tools
+from tools import RecommendationStore
+
+
+class SlowModel:
+    """Stands in for the chat model: answers after `delay` seconds and counts calls"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt):
+        with self._lock:
+            self.calls.append(prompt)
+        time.sleep(self.delay)
+        return f"Advice for {prompt}"
+
+
+def test_weather_strings_map_to_category_and_band():
+    assert tools.recommendation_key("light rain, 12.3°C") == ("rain", "cool (10-18°C)")
+    assert tools.recommendation_key("overcast clouds, -2°C") == ("cloudy", "freezing (below 0°C)")
+    assert tools.recommendation_key("Error fetching weather: city not found") is None
+
+
+def test_concurrent_misses_for_one_key_call_the_model_once(tmp_path):
+    store = RecommendationStore(str(tmp_path / "advice.json"))
+    model = SlowModel(delay=0.1)
+    key = ("rain", "cool (10-18°C)")
+    results = []
+
+    def ask():
+        results.append(store.get_or_compute(key, lambda: model(tools._describe_key(key))))
+
+    threads = [threading.Thread(target=ask) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(model.calls) == 1
+    assert results == ["Advice for rain and cool (10-18°C)"] * 6
+    assert store.stats["coalesced"] + store.stats["hits"] == 5
+
+
+def test_failed_computation_is_shared_and_not_stored(tmp_path):
+    store = RecommendationStore(str(tmp_path / "advice.json"))
+    key = ("snow", "cold (0-10°C)")
+
+    def broken():
+        raise RuntimeError("model unavailable")
+
+    with pytest.raises(RuntimeError):
+        store.get_or_compute(key, broken)
+    assert key not in store
+    assert store.get_or_compute(key, lambda: "Wear boots") == "Wear boots"
+
+
+def test_advice_persists_and_least_recently_used_keys_are_dropped(tmp_path):
+    path = str(tmp_path / "advice.json")
+    store = RecommendationStore(path, max_entries=2)
+    store.put(("rain", "cool (10-18°C)"), "Umbrella")
+    store.put(("clear", "hot (above 32°C)"), "Sunscreen")
+    time.sleep(0.01)
+    store.get(("rain", "cool (10-18°C)"))
+    store.put(("snow", "cold (0-10°C)"), "Boots")
+
+    reloaded = RecommendationStore(path, max_entries=2)
+    assert ("rain", "cool (10-18°C)") in reloaded and ("snow", "cold (0-10°C)") in reloaded
+    assert ("clear", "hot (above 32°C)") not in reloaded
+
+
+def test_default_cache_file_does_not_depend_on_the_working_directory():
+    if "RECOMMENDATION_CACHE_FILE" not in os.environ:
+        assert os.path.isabs(tools.RECOMMENDATION_CACHE_FILE)
+        assert os.path.dirname(os.path.dirname(tools.RECOMMENDATION_CACHE_FILE)) == os.path.dirname(tools.__file__)
+
+
+def test_dress_recommendation_uses_the_store(tmp_path, monkeypatch):
+    model = SlowModel()
+    monkeypatch.setattr(tools, "_ask_model", model)
+    monkeypatch.setattr(tools, "recommendation_store", RecommendationStore(str(tmp_path / "advice.json")))
+
+    tools.dress_recommendation("light rain, 12.3°C")
+    tools.dress_recommendation("moderate rain, 15°C")
+
+    assert model.calls == ["rain and cool (10-18°C)"]
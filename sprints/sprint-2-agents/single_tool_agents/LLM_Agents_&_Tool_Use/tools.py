@@ -1,34 +1,195 @@
 import os
-import requests
+import re
+import json
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from shared.weather_client import get_weather_client, describe, is_found, WeatherRequestError
+
 # Load environment variables from .env file
 load_dotenv()
 
 # --- API keys from environment ---
-OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 # Initialize OpenAI client
 client = OpenAI(api_key=OPENAI_API_KEY)
 
 # --- Tool 1: Get weather for a given location ---
+# Uses the shared pooled client, so repeated lookups reuse one keep-alive connection
+# and recent results (for any spelling of the location) come from its cache
+def _format_weather(data):
+    if isinstance(data, WeatherRequestError):
+        return f"Error fetching weather: {data}"
+    if not is_found(data):
+        return f"Error fetching weather: {data.get('message', 'weather not found')}"
+    description, temperature = describe(data)
+    return f"{description}, {temperature}°C"
+
 def get_weather(location):
-    url = "https://api.openweathermap.org/data/2.5/weather"
-    params = {"q": location, "appid": OPENWEATHER_API_KEY, "units": "metric"}
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        description = data["weather"][0]["description"]
-        temperature = data["main"]["temp"]
-        return f"{description}, {temperature}°C"
-    except requests.exceptions.RequestException as e:
-        return f"Error fetching weather: {e}"
+        return _format_weather(get_weather_client().get_current(location))
+    except WeatherRequestError as e:
+        return _format_weather(e)
+
+# --- Tool 1b: Get weather for many locations at once (fetched concurrently) ---
+def get_weather_many(locations):
+    return [_format_weather(data) for data in get_weather_client().get_many(locations)]
 
 # --- Tool 2: Recommend clothing based on weather ---
-def dress_recommendation(weather):
+# Advice depends on the kind of weather and a temperature band, not the exact reading,
+# so answers are cached per (condition category, temperature bucket) in memory and on disk.
+
+# Checked in order; the first category whose keywords appear in the description wins
+CONDITION_CATEGORIES = [
+    ("thunderstorm", ("thunder",)),
+    ("snow", ("snow", "sleet")),
+    ("rain", ("rain", "drizzle", "shower")),
+    ("fog", ("mist", "fog", "haze", "smoke", "dust", "sand", "ash")),
+    ("cloudy", ("cloud", "overcast")),
+    ("clear", ("clear", "sun")),
+]
+
+# (upper bound in °C, bucket name); the last bucket is open-ended
+TEMPERATURE_BUCKETS = [
+    (0, "freezing (below 0°C)"),
+    (10, "cold (0-10°C)"),
+    (18, "cool (10-18°C)"),
+    (25, "mild (18-25°C)"),
+    (32, "warm (25-32°C)"),
+    (None, "hot (above 32°C)"),
+]
+
+# Next to this module by default, so the cache is shared whatever directory the agent runs from
+RECOMMENDATION_CACHE_FILE = os.getenv(
+    "RECOMMENDATION_CACHE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "dress_recommendations.json")
+)
+RECOMMENDATION_CACHE_SIZE = int(os.getenv("RECOMMENDATION_CACHE_SIZE", "256"))
+
+WEATHER_PATTERN = re.compile(r"^(?P<description>.+),\s*(?P<temperature>-?\d+(?:\.\d+)?)\s*°C$")
+
+def condition_category(description):
+    description = description.lower()
+    for category, keywords in CONDITION_CATEGORIES:
+        if any(keyword in description for keyword in keywords):
+            return category
+    return "other"
+
+def temperature_bucket(temperature):
+    for upper, bucket in TEMPERATURE_BUCKETS:
+        if upper is None or temperature < upper:
+            return bucket
+
+def recommendation_key(weather):
+    """(condition category, temperature bucket) for a get_weather string, or None if it is not a reading"""
+    match = WEATHER_PATTERN.match(weather.strip())
+    if not match:
+        return None
+    return condition_category(match.group("description")), temperature_bucket(float(match.group("temperature")))
+
+class RecommendationStore:
+    """
+    LRU store of advice per (category, bucket), persisted as JSON.
+
+    Lookups are in-memory dict hits; the file is loaded once and rewritten
+    atomically when new advice is added, keeping the `max_entries` most
+    recently used keys. get_or_compute lets concurrent misses for one key
+    share a single model call.
+    """
+
+    def __init__(self, path=RECOMMENDATION_CACHE_FILE, max_entries=RECOMMENDATION_CACHE_SIZE):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = None
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    @staticmethod
+    def _name(key):
+        return "|".join(key)
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, 'r') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._load().get(self._name(key))
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            # Recency is tracked in memory and saved with the next write
+            entry["used"] = time.time()
+            self.stats["hits"] += 1
+            return entry["advice"]
+
+    def get_or_compute(self, key, compute):
+        """Stored advice for key, else compute() it once however many threads miss at the same time"""
+        advice = self.get(key)
+        if advice is not None:
+            return advice
+        name = self._name(key)
+        with self._lock:
+            flight = self._flights.get(name)
+            leader = flight is None
+            if leader:
+                # Another leader may have stored it since the miss above
+                entry = self._load().get(name)
+                if entry is not None:
+                    return entry["advice"]
+                flight = self._flights[name] = Future()
+                flight.set_running_or_notify_cancel()
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return flight.result()
+
+        try:
+            advice = compute()
+            self.put(key, advice)
+        except BaseException as e:
+            with self._lock:
+                self._flights.pop(name, None)
+            flight.set_exception(e)
+            raise
+        with self._lock:
+            self._flights.pop(name, None)
+        flight.set_result(advice)
+        return advice
+
+    def put(self, key, advice):
+        with self._lock:
+            entries = self._load()
+            entries[self._name(key)] = {"advice": advice, "used": time.time()}
+            if len(entries) > self.max_entries:
+                newest = sorted(entries.items(), key=lambda item: item[1]["used"], reverse=True)
+                self._entries = entries = dict(newest[:self.max_entries])
+            self._save(entries)
+
+    def _save(self, entries):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(entries, f)
+        os.replace(temp_path, self.path)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._name(key) in self._load()
+
+recommendation_store = RecommendationStore()
+
+def _ask_model(weather):
     prompt = f"What should I wear if the weather is {weather}?"
 
     response = client.chat.completions.create(
@@ -37,3 +198,31 @@ def dress_recommendation(weather):
     )
 
     return response.choices[0].message.content.strip()
+
+def _describe_key(key):
+    category, bucket = key
+    return f"{category} and {bucket}"
+
+def dress_recommendation(weather):
+    key = recommendation_key(weather)
+    if key is None:
+        # Not a weather reading (e.g. an error message): ask about it directly
+        return _ask_model(weather)
+
+    return recommendation_store.get_or_compute(key, lambda: _ask_model(_describe_key(key)))
+
+def warm_up_recommendations(categories=None, max_workers=4):
+    """
+    Precompute advice for every temperature bucket of the given condition
+    categories (default: all) that is not stored yet. Returns how many were added.
+    """
+    categories = categories or [category for category, _ in CONDITION_CATEGORIES]
+    keys = [(category, bucket) for category in categories for _, bucket in TEMPERATURE_BUCKETS]
+    missing = [key for key in keys if key not in recommendation_store]
+
+    def fill(key):
+        recommendation_store.get_or_compute(key, lambda: _ask_model(_describe_key(key)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(fill, missing))
+    return len(missing)
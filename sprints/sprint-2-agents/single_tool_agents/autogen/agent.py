@@ -1,7 +1,11 @@
 import os
+import time
+import asyncio
+from typing import List
 from autogen_agentchat.agents import AssistantAgent  # Core assistant agent class
 from autogen_ext.models.openai import OpenAIChatCompletionClient  # Wrapper for OpenAI LLMs
-from tools.weather_tool import get_weather  # Custom plain function weather tool
+from tools.weather_tool import get_weather, get_weather_many  # Custom plain function weather tools
+from shared.batch_report import CityResult
 
 # Load OpenAI API key from environment variables
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -13,24 +17,50 @@ model_client = OpenAIChatCompletionClient(
     api_key=OPENAI_API_KEY,
 )
 
-# 🤖 Initialize the assistant agent with tool use and reasoning capabilities
-assistant = AssistantAgent(
-    name="weather_assistant",  # Unique name for the agent (optional but good for tracing)
-    model_client=model_client,  # Connect the agent to the GPT-4o model client
-    tools=[get_weather],  # Register tools the assistant is allowed to use
-    system_message="""
+# 🤖 Build an assistant agent with tool use and reasoning capabilities
+# Every assistant shares the one model client (and its connection pool)
+def create_assistant(name: str = "weather_assistant") -> AssistantAgent:
+    return AssistantAgent(
+        name=name,  # Unique name for the agent (optional but good for tracing)
+        model_client=model_client,  # Connect the agent to the GPT-4o model client
+        tools=[get_weather, get_weather_many],  # Register tools the assistant is allowed to use
+        system_message="""
 You are a helpful assistant reasoning step-by-step.
 
 When a user asks about the weather or what to wear, follow this process:
 1. Think step-by-step about what the user is asking.
 2. Decide if you need to use the weather tool.
-3. Call the get_weather tool with the city name.
+3. Call the get_weather tool with the city name (or get_weather_many once for several cities).
 4. Once you have the weather info, explain what it means.
 5. Suggest an outfit based on temperature and weather conditions.
 
 Always explain your reasoning out loud before and after using the tool.
 """,  #Gives the assistant instructions on how to behave and solve the task
 
-    reflect_on_tool_use=True,  #Enables the agent to self-evaluate its tool usage
-    model_client_stream=True,  #Enables response streaming for real-time feedback and tracing
-)
+        reflect_on_tool_use=True,  #Enables the agent to self-evaluate its tool usage
+        model_client_stream=True,  #Enables response streaming for real-time feedback and tracing
+    )
+
+assistant = create_assistant()
+
+def build_task(city: str) -> str:
+    return f"Suggest an outfit the user should wear for {city}'s weather using current weather."
+
+async def run_agents(cities: List[str], max_concurrency: int = 4) -> List[CityResult]:
+    """
+    Run one assistant per city concurrently (an assistant keeps conversation
+    state, so runs cannot share one). At most `max_concurrency` runs are in
+    flight; all of them share the model client and the weather client.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_city(index: int, city: str) -> CityResult:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await create_assistant(f"weather_assistant_{index}").run(task=build_task(city))
+                return CityResult(city, result.messages[-1].content, time.perf_counter() - started)
+            except Exception as e:
+                return CityResult(city, None, time.perf_counter() - started, error=str(e))
+
+    return await asyncio.gather(*(run_city(index, city) for index, city in enumerate(cities)))
@@ -1,12 +1,34 @@
+import argparse
 import asyncio
-from agent import assistant, model_client
+import os
+import sys
+import time
+
+# The weather tool and the batch report come from the sprint-level shared package
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from agent import assistant, model_client, build_task, run_agents
 from autogen_agentchat.ui import Console
+from shared.batch_report import read_cities, print_report
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Outfit suggestions for one city (interactive) or many (batch)")
+    parser.add_argument("--cities", nargs="+", default=[], help="Cities to run concurrently")
+    parser.add_argument("--file", "-f", help="File with one city per line ('-' for stdin)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum agent runs in flight")
+    args = parser.parse_args()
+
     async def main():
-        city = input("📍 Enter your city: ").strip()
-        task = f"Suggest an outfit the user should wear for {city}'s weather using current weather."
-        await Console(assistant.run_stream(task=task))
-        await model_client.close()
+        cities = read_cities(args.cities, args.file)
+        try:
+            if not cities:
+                city = input("📍 Enter your city: ").strip()
+                await Console(assistant.run_stream(task=build_task(city)))
+            else:
+                started = time.perf_counter()
+                results = await run_agents(cities, max_concurrency=args.concurrency)
+                print_report(results, time.perf_counter() - started)
+        finally:
+            await model_client.close()
 
     asyncio.run(main())
@@ -1,20 +1,40 @@
 import os
-import requests
+from typing import List
 from dotenv import load_dotenv
 
+from shared.weather_client import get_weather_client, describe, is_found, WeatherRequestError
+
 load_dotenv()
 
-def get_weather(city: str) -> str:
+def _format_weather(city: str, response: dict) -> str:
+    if not is_found(response):
+        return f"Weather not found for {city}."
+
+    weather_desc, temp = describe(response)
+    return f"Current weather in {city}: {weather_desc}, Temperature: {temp}°C."
+
+async def get_weather(city: str) -> str:
     API_KEY = os.getenv("OPENWEATHER_API_KEY")
     if not API_KEY:
         return "OpenWeather API key is not set."
 
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={API_KEY}&units=metric"
-    response = requests.get(url).json()
+    # Async lookup over the shared httpx pool, so the agent's event loop is never blocked
+    try:
+        response = await get_weather_client().aget_current(city)
+    except WeatherRequestError as e:
+        return f"Error fetching weather for {city}: {e}"
 
-    if response.get("cod") != 200:
-        return f"Weather not found for {city}."
+    return _format_weather(city, response)
 
-    weather_desc = response["weather"][0]["description"]
-    temp = response["main"]["temp"]
-    return f"Current weather in {city}: {weather_desc}, Temperature: {temp}°C."
+async def get_weather_many(cities: List[str]) -> str:
+    """Current weather for several cities at once, fetched concurrently."""
+    API_KEY = os.getenv("OPENWEATHER_API_KEY")
+    if not API_KEY:
+        return "OpenWeather API key is not set."
+
+    results = await get_weather_client().aget_many(cities)
+    return "\n".join(
+        f"Error fetching weather for {city}: {result}" if isinstance(result, WeatherRequestError)
+        else _format_weather(city, result)
+        for city, result in zip(cities, results)
+    )
@@ -2,12 +2,17 @@
 from langchain.agents import initialize_agent, Tool
 from langchain.agents.agent_types import AgentType
 from langchain_openai import ChatOpenAI
-from tools.weather_tool import get_weather  # Custom tool for fetching real-time weather
+from tools.weather_tool import get_weather, get_weather_many  # Custom tools for fetching real-time weather
 
+from langchain.callbacks.base import BaseCallbackHandler
 
 import os
+import time
+from typing import List
 from dotenv import load_dotenv
 
+from shared.batch_report import CityResult
+
 # Load environment variables (e.g., OpenAI API key) from .env file
 load_dotenv()
 
@@ -20,8 +25,8 @@ llm = ChatOpenAI(
     openai_api_key=OPENAI_API_KEY  # Explicitly pass API key for safety
 )
 
-# Register available tools the agent can choose from — here we use a weather tool
-tools = [get_weather]
+# Register available tools the agent can choose from — here we use the weather tools
+tools = [get_weather, get_weather_many]
 
 #Initialize the LangChain agent using the ReAct (Reasoning + Acting) pattern
 # This allows the LLM to reason step-by-step and decide when/how to use tools
@@ -34,6 +39,52 @@ agent_executor = initialize_agent(
 
 # Main function to run the agent with a user-defined city
 # Prompts the agent to suggest an outfit based on current weather in the given city
+def build_task(city: str) -> str:
+    return f"suggest an outfit the user should wear for {city}'s weather using current weather."
+
 def run_agent(city: str):
-    input_text = f"suggest an outfit the user should wear for {city}'s weather using current weather."
+    input_text = build_task(city)
     return agent_executor.invoke(input_text)
+
+class RunLatency(BaseCallbackHandler):
+    """Times one top-level agent run (the executor's own chain, not its sub-chains)"""
+
+    def __init__(self):
+        self.started = None
+        self.elapsed = None
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        if parent_run_id is None:
+            self.started = time.perf_counter()
+
+    def on_chain_end(self, outputs, *, run_id, parent_run_id=None, **kwargs):
+        if parent_run_id is None and self.started is not None:
+            self.elapsed = time.perf_counter() - self.started
+
+    def on_chain_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self.on_chain_end(None, run_id=run_id, parent_run_id=parent_run_id)
+
+async def run_agents(cities: List[str], max_concurrency: int = 4) -> List[CityResult]:
+    """
+    Run the agent for many cities concurrently with agent_executor.abatch.
+
+    All runs share the module's LLM client and the process-wide weather client;
+    at most `max_concurrency` runs are in flight. Failures are reported per city.
+    """
+    timers = [RunLatency() for _ in cities]
+    configs = [{"max_concurrency": max_concurrency, "callbacks": [timer], "run_name": city}
+               for city, timer in zip(cities, timers)]
+    outputs = await agent_executor.abatch(
+        [{"input": build_task(city)} for city in cities],
+        config=configs,
+        return_exceptions=True
+    )
+
+    results = []
+    for city, timer, output in zip(cities, timers, outputs):
+        latency = timer.elapsed or 0.0
+        if isinstance(output, Exception):
+            results.append(CityResult(city, None, latency, error=str(output)))
+        else:
+            results.append(CityResult(city, output.get("output"), latency))
+    return results
@@ -0,0 +1,93 @@
+"""
+News tool benchmark on a saved TechCrunch homepage (fixtures/techcrunch_home.html).
+
+Compares the original full html.parser parse with the SoupStrainer parse the tool
+now uses (html.parser and, if installed, lxml), and the tool's TTL result cache.
+Everything runs offline; the HTTP layer is replaced by the fixture.
+
+Usage: python benchmark_news.py [--runs 50] [--count 3] [--fixture fixtures/techcrunch_home.html]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Run as a script: the tools package also loads the weather tool, which imports the shared package
+sys.path.append(os.path.join(HERE, "..", ".."))
+
+from tools import news_tool
+
+def full_parse(html: str, count: int):
+    """The original implementation: build the whole tree, then select"""
+    soup = BeautifulSoup(html, 'html.parser')
+    return [(a.get_text(strip=True), a['href']) for a in soup.select("a.post-block__title__link", limit=count)]
+
+def strained_parse(parser: str):
+    strainer = SoupStrainer("a", class_=news_tool.HEADLINE_CLASS)
+
+    def parse(html: str, count: int):
+        soup = BeautifulSoup(html, parser, parse_only=strainer)
+        return [(a.get_text(strip=True), a['href']) for a in soup.find_all("a", limit=count)]
+    return parse
+
+class FixtureHttpCache:
+    """Serves the fixture in place of the network"""
+
+    def __init__(self, html: str):
+        self.html = html
+        self.requests = 0
+
+    def get(self, url: str) -> str:
+        self.requests += 1
+        return self.html
+
+def measure(name: str, runs: int, call) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    median = statistics.median(samples)
+    print(f"{name:<34} median {median * 1000:9.3f} ms   max {max(samples) * 1000:9.3f} ms")
+    return median
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark news headline parsing on a saved page")
+    parser.add_argument("--runs", type=int, default=50, help="Repetitions per mode")
+    parser.add_argument("--count", type=int, default=3, help="Headlines to extract")
+    parser.add_argument("--fixture", default=os.path.join(HERE, "fixtures", "techcrunch_home.html"))
+    args = parser.parse_args()
+
+    with open(args.fixture, 'r', encoding='utf-8') as f:
+        html = f.read()
+    print(f"{len(html) / 1024:.0f} KiB page, {args.count} headlines, {args.runs} runs\n")
+
+    expected = full_parse(html, args.count)
+    baseline = measure("full parse (html.parser + select)", args.runs, lambda: full_parse(html, args.count))
+
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        parsers.append("lxml")
+    except ImportError:
+        print(f"{'SoupStrainer (lxml)':<34} skipped: lxml is not installed")
+    for name in parsers:
+        parse = strained_parse(name)
+        assert parse(html, args.count) == expected, f"{name} parse disagrees with the full parse"
+        median = measure(f"SoupStrainer ({name})", args.runs, lambda: parse(html, args.count))
+        print(f"{'':<34} {baseline / median:5.1f}x faster than the full parse")
+
+    # The tool itself: the first call parses, the rest are TTL cache hits
+    fixture_cache = FixtureHttpCache(html)
+    news_tool._http_cache = fixture_cache
+    news_tool._results.clear()
+    measure(f"fetch_news() ({news_tool.HTML_PARSER}, TTL cache)", args.runs, lambda: news_tool.fetch_news(args.count))
+    print(f"{'':<34} {fixture_cache.requests} page load(s) for {args.runs} calls")
+
+if __name__ == "__main__":
+    main()
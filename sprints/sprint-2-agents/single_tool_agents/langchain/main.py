@@ -1,5 +1,27 @@
-from agent import run_agent
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# agent.py and tools/weather_tool.py import the sprint-level shared package
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from agent import run_agent, run_agents
+from shared.batch_report import read_cities, print_report
 
 if __name__ == "__main__":
-    city = input("📍 Enter your city: ")
-    run_agent(city)
+    parser = argparse.ArgumentParser(description="Outfit suggestions for one city (interactive) or many (batch)")
+    parser.add_argument("--cities", nargs="+", default=[], help="Cities to run concurrently")
+    parser.add_argument("--file", "-f", help="File with one city per line ('-' for stdin)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum agent runs in flight")
+    args = parser.parse_args()
+
+    cities = read_cities(args.cities, args.file)
+    if not cities:
+        city = input("📍 Enter your city: ")
+        run_agent(city)
+    else:
+        started = time.perf_counter()
+        results = asyncio.run(run_agents(cities, max_concurrency=args.concurrency))
+        print_report(results, time.perf_counter() - started)
@@ -0,0 +1,65 @@
+import datetime
+
+import pytest
+
+pytest.importorskip("langchain")
+
+from tools.calendar_tool import CalendarService, FakeCalendarService, _event_days
+
+
+def event(summary, start, end):
+    key = "date" if len(start) == 10 else "dateTime"
+    return {"summary": summary, "start": {key: start}, "end": {key: end}}
+
+
+def day(value):
+    return datetime.date.fromisoformat(value)
+
+
+def make_service(events):
+    fake = FakeCalendarService(events)
+    return CalendarService(factory=lambda: (fake, None), cache_ttl=60), fake
+
+
+def test_timed_events_are_bucketed_on_their_utc_day():
+    early = event("Early call", "2026-10-20T01:00:00+02:00", "2026-10-20T02:00:00+02:00")
+    assert _event_days(early) == [day("2026-10-19")]
+
+    until_midnight = event("Late shift", "2026-10-19T22:00:00Z", "2026-10-20T00:00:00Z")
+    assert _event_days(until_midnight) == [day("2026-10-19")]
+
+
+def test_all_day_end_dates_are_exclusive():
+    assert _event_days(event("Offsite", "2026-10-19", "2026-10-21")) == [day("2026-10-19"), day("2026-10-20")]
+
+
+def test_event_with_offset_appears_on_the_day_of_its_utc_window():
+    service, _ = make_service([event("Early call", "2026-10-20T01:00:00+02:00", "2026-10-20T02:00:00+02:00")])
+
+    events = service.events_between(day("2026-10-19"), day("2026-10-20"))
+
+    assert [e["summary"] for e in events[day("2026-10-19")]] == ["Early call"]
+    assert events[day("2026-10-20")] == []
+    assert service.events_on(day("2026-10-19"))[0]["summary"] == "Early call"
+
+
+def test_fake_service_filters_by_the_utc_window():
+    fake = FakeCalendarService([
+        event("Early call", "2026-10-20T01:00:00+02:00", "2026-10-20T02:00:00+02:00"),
+        event("Standup", "2026-10-20T09:00:00Z", "2026-10-20T09:15:00Z")
+    ])
+
+    items = fake.list(timeMin="2026-10-20T00:00:00Z", timeMax="2026-10-20T23:59:59.999999Z").execute()["items"]
+
+    assert [e["summary"] for e in items] == ["Standup"]
+
+
+def test_days_are_cached_and_only_missing_days_are_fetched():
+    service, fake = make_service([event("Standup", "2026-10-20T09:00:00Z", "2026-10-20T09:15:00Z")])
+
+    service.events_between(day("2026-10-19"), day("2026-10-21"))
+    service.events_on(day("2026-10-20"))
+    assert fake.list_calls == 1
+
+    service.events_between(day("2026-10-19"), day("2026-10-22"))
+    assert fake.list_calls == 2
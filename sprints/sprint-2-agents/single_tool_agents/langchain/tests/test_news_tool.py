@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("langchain")
+
+from tools import news_tool
+
+PAGE = "".join(
+    f'<div><a class="post-block__title__link" href="https://example.com/{index}">Headline {index}</a></div>'
+    for index in range(1, 11)
+)
+
+
+class SlowPage:
+    """Serves PAGE in place of the network after `delay` seconds and counts requests"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.requests = 0
+
+    def get(self, url):
+        self.requests += 1
+        time.sleep(self.delay)
+        return PAGE
+
+
+@pytest.fixture
+def page(monkeypatch):
+    page = SlowPage()
+    monkeypatch.setattr(news_tool, "_http_cache", page)
+    news_tool._results.clear()
+    yield page
+    news_tool._results.clear()
+
+
+@pytest.mark.parametrize("text, count", [
+    ("5", 5),
+    ("top 5 headlines", 5),
+    ("give me the first 2", 2),
+    ("7 latest stories", 7),
+    ("news about 2026 elections", news_tool.DEFAULT_HEADLINE_COUNT),
+    ("what happened in 2026", news_tool.DEFAULT_HEADLINE_COUNT),
+    ("", news_tool.DEFAULT_HEADLINE_COUNT),
+    ("top 500", news_tool.MAX_HEADLINE_COUNT),
+    ("0", 1)
+])
+def test_headline_count_reads_only_explicit_counts(text, count):
+    assert news_tool._headline_count(text) == count
+
+
+def test_smaller_requests_are_served_from_the_cache(page):
+    assert len(news_tool.get_headlines(5)) == 5
+    assert news_tool.get_headlines(2) == [("Headline 1", "https://example.com/1"), ("Headline 2", "https://example.com/2")]
+    assert page.requests == 1
+
+    news_tool.get_headlines(8)
+    assert page.requests == 2
+
+
+def test_concurrent_misses_share_one_fetch(page):
+    page.delay = 0.1
+    threads = [threading.Thread(target=news_tool.get_headlines, args=(3,)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert page.requests == 1
+
+
+def test_cache_hits_do_not_wait_for_a_fetch(page):
+    news_tool.get_headlines(3)
+    page.delay = 0.3
+    refresher = threading.Thread(target=news_tool.get_headlines, args=(8,))
+    refresher.start()
+    time.sleep(0.05)
+
+    started = time.perf_counter()
+    assert len(news_tool.get_headlines(3)) == 3
+    assert time.perf_counter() - started < 0.1
+    refresher.join()
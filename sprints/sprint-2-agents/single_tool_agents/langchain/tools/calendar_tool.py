@@ -1,14 +1,22 @@
 from langchain.tools import tool
 import os
+import time
 import datetime
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 
+# Events change rarely within a planning session; keep each day for a short while
+EVENTS_CACHE_TTL = float(os.getenv("CALENDAR_CACHE_TTL", "60"))
+MAX_EVENTS_PER_DAY = 10
+MAX_RANGE_DAYS = 31
+
 def authenticate_google_calendar():
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+
     creds = None
     if os.path.exists('token.json'):
         creds = Credentials.from_authorized_user_file('token.json', SCOPES)
@@ -22,34 +30,202 @@ def authenticate_google_calendar():
             token.write(creds.to_json())
     return creds
 
+def build_google_calendar() -> Tuple[Any, Any]:
+    """Authenticate and build the Calendar v3 service (the discovery build is the slow part)"""
+    from googleapiclient.discovery import build
+    creds = authenticate_google_calendar()
+    return build('calendar', 'v3', credentials=creds, cache_discovery=False), creds
+
+def _parse_time(value: str) -> datetime.datetime:
+    """An event or query time as an aware UTC datetime (all-day dates and naive times are read as UTC)"""
+    if len(value) == 10:
+        parsed = datetime.datetime.combine(datetime.date.fromisoformat(value), datetime.time.min)
+    else:
+        parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc)
+
+def _event_bounds(event: Dict[str, Any]) -> Tuple[datetime.datetime, datetime.datetime]:
+    """Start and exclusive end of an event in UTC, the time zone of the query window"""
+    start = event['start'].get('dateTime', event['start'].get('date'))
+    end = event.get('end', {}).get('dateTime', event.get('end', {}).get('date'))
+    first = _parse_time(start)
+    if end is not None:
+        return first, _parse_time(end)
+    # Without an end, an all-day event lasts its day and a timed one is an instant
+    return first, (first if 'dateTime' in event['start'] else first + datetime.timedelta(days=1))
+
+def _event_days(event: Dict[str, Any]) -> List[datetime.date]:
+    """UTC days an event overlaps (ends are exclusive, so an event ending at midnight stays on its day)"""
+    first, last = _event_bounds(event)
+    last_day = (last - datetime.timedelta(microseconds=1)).date() if last > first else first.date()
+    first_day = first.date()
+    return [first_day + datetime.timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+
+class CalendarService:
+    """
+    One authenticated Calendar API service per process, with a per-date events cache.
+
+    The service is built once and reused; its credentials are refreshed in
+    place when they expire (and saved back to token.json) instead of being
+    re-read and revalidated on every call. Events are fetched for a whole date
+    range in one API call and cached per day for `cache_ttl` seconds, so
+    planning several days costs one request.
+
+    Args:
+        factory: Returns (service, credentials); defaults to the Google API.
+            Pass e.g. lambda: (FakeCalendarService(events), None) to run offline.
+        calendar_id (str): Calendar to read
+        cache_ttl (float): Seconds a fetched day stays fresh
+    """
+
+    def __init__(self, factory: Optional[Callable[[], Tuple[Any, Any]]] = None,
+                 calendar_id: str = 'primary', cache_ttl: float = EVENTS_CACHE_TTL):
+        self.factory = factory or build_google_calendar
+        self.calendar_id = calendar_id
+        self.cache_ttl = cache_ttl
+        self._service = None
+        self._creds = None
+        self._events: Dict[datetime.date, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+        self.api_calls = 0
+
+    def _get_service(self):
+        if self._service is None:
+            self._service, self._creds = self.factory()
+        elif self._creds is not None and self._creds.expired and self._creds.refresh_token:
+            from google.auth.transport.requests import Request
+            self._creds.refresh(Request())
+            with open('token.json', 'w') as token:
+                token.write(self._creds.to_json())
+        return self._service
+
+    def _cached(self, date: datetime.date, now: float) -> Optional[List[Dict[str, Any]]]:
+        entry = self._events.get(date)
+        if entry is None or entry[0] <= now:
+            return None
+        return entry[1]
+
+    def events_between(self, start_date: datetime.date, end_date: datetime.date) -> Dict[datetime.date, List[Dict[str, Any]]]:
+        """
+        Events for every day from start_date to end_date (inclusive), keyed by day.
+
+        Days missing from the cache are fetched with a single list call covering them.
+        """
+        days = [start_date + datetime.timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        with self._lock:
+            now = time.monotonic()
+            missing = [day for day in days if self._cached(day, now) is None]
+            if missing:
+                fetched = self._fetch(missing[0], missing[-1])
+                expires = time.monotonic() + self.cache_ttl
+                for day in days[days.index(missing[0]):days.index(missing[-1]) + 1]:
+                    self._events[day] = (expires, fetched.get(day, []))
+            return {day: self._events[day][1] for day in days}
+
+    def events_on(self, date: datetime.date) -> List[Dict[str, Any]]:
+        return self.events_between(date, date)[date]
+
+    def _fetch(self, start_date: datetime.date, end_date: datetime.date) -> Dict[datetime.date, List[Dict[str, Any]]]:
+        """One (paginated) list call for the range, bucketed by the days each event overlaps"""
+        service = self._get_service()
+        start = datetime.datetime.combine(start_date, datetime.time.min).isoformat() + 'Z'
+        end = datetime.datetime.combine(end_date, datetime.time.max).isoformat() + 'Z'
+        by_day: Dict[datetime.date, List[Dict[str, Any]]] = {}
+        page_token = None
+        while True:
+            self.api_calls += 1
+            events_result = service.events().list(
+                calendarId=self.calendar_id, timeMin=start, timeMax=end, maxResults=250,
+                singleEvents=True, orderBy='startTime', pageToken=page_token).execute()
+            for event in events_result.get('items', []):
+                for day in _event_days(event):
+                    if start_date <= day <= end_date:
+                        by_day.setdefault(day, []).append(event)
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                return by_day
+
+    def clear_cache(self):
+        with self._lock:
+            self._events.clear()
+
+class FakeCalendarService:
+    """
+    Local stand-in for the Calendar v3 service: serves `events` through the same
+    events().list(...).execute() chain and counts the list calls.
+    """
+
+    def __init__(self, events: List[Dict[str, Any]]):
+        self.events_data = events
+        self.list_calls = 0
+
+    def events(self):
+        return self
+
+    def list(self, timeMin: str, timeMax: str, **kwargs):
+        self.list_calls += 1
+        # Like the API: events ending after timeMin and starting before timeMax
+        window_start, window_end = _parse_time(timeMin), _parse_time(timeMax)
+        items = []
+        for event in self.events_data:
+            first, last = _event_bounds(event)
+            if first < window_end and (last > window_start or (last == first and first >= window_start)):
+                items.append(event)
+        items.sort(key=lambda event: _event_bounds(event)[0])
+        return _FakeRequest({"items": items})
+
+class _FakeRequest:
+    def __init__(self, result: Dict[str, Any]):
+        self.result = result
+
+    def execute(self) -> Dict[str, Any]:
+        return self.result
+
+_calendar_service: Optional[CalendarService] = None
+
+def get_calendar_service() -> CalendarService:
+    """The process-wide calendar service (built on first use)"""
+    global _calendar_service
+    if _calendar_service is None:
+        _calendar_service = CalendarService()
+    return _calendar_service
+
+def set_calendar_service(service: Optional[CalendarService]) -> None:
+    """Replace the process-wide calendar service (e.g. with one backed by FakeCalendarService)"""
+    global _calendar_service
+    _calendar_service = service
+
+def _format_day(date: datetime.date, events: List[Dict[str, Any]]) -> str:
+    if not events:
+        return f"No events found on {date.isoformat()}."
+
+    output = f"📅 Events on {date.isoformat()}:\n"
+    for event in events[:MAX_EVENTS_PER_DAY]:
+        start = event['start'].get('dateTime', event['start'].get('date'))
+        summary = event.get('summary', 'No Title')
+        output += f"- {summary} at {start}\n"
+    return output.strip()
+
 @tool
 def get_calendar(input: str) -> str:
-    """Fetch events from your Google Calendar for a given city and date (format: 'City, YYYY-MM-DD')."""
+    """Fetch events from your Google Calendar for a given city and date (format: 'City, YYYY-MM-DD') or date range (format: 'City, YYYY-MM-DD, YYYY-MM-DD')."""
     try:
-        city, date_str = map(str.strip, input.split(","))
-        creds = authenticate_google_calendar()
-        service = build('calendar', 'v3', credentials=creds)
-
-        date = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
-        start = datetime.datetime.combine(date, datetime.time.min).isoformat() + 'Z'
-        end = datetime.datetime.combine(date, datetime.time.max).isoformat() + 'Z'
-
-        events_result = service.events().list(
-            calendarId='primary', timeMin=start, timeMax=end,
-            maxResults=10, singleEvents=True, orderBy='startTime').execute()
-        
-        events = events_result.get('items', [])
-
-        if not events:
-            return f"No events found on {date_str}."
-
-        output = f"📅 Events on {date_str}:\n"
-        for event in events:
-            start = event['start'].get('dateTime', event['start'].get('date'))
-            summary = event.get('summary', 'No Title')
-            output += f"- {summary} at {start}\n"
-
-        return output.strip()
+        # The leading city is part of the input format but does not filter the calendar
+        date_strs = [part.strip() for part in input.split(",")][1:]
+        if len(date_strs) not in (1, 2):
+            raise ValueError("expected 'City, YYYY-MM-DD' or 'City, YYYY-MM-DD, YYYY-MM-DD'")
+
+        start_date = datetime.datetime.strptime(date_strs[0], "%Y-%m-%d").date()
+        end_date = datetime.datetime.strptime(date_strs[-1], "%Y-%m-%d").date()
+        if end_date < start_date:
+            raise ValueError("the end date is before the start date")
+        if (end_date - start_date).days >= MAX_RANGE_DAYS:
+            raise ValueError(f"date ranges are limited to {MAX_RANGE_DAYS} days")
+
+        events_by_day = get_calendar_service().events_between(start_date, end_date)
+        return "\n\n".join(_format_day(day, events) for day, events in events_by_day.items())
 
     except Exception as e:
         return f"❌ Error: {e}"
@@ -1,26 +1,166 @@
 # news_tool.py
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from langchain.tools import Tool
 
-def fetch_news() -> str:
-    """Scrape top 3 latest tech headlines with links."""
+NEWS_URL = "https://techcrunch.com"
+HEADLINE_CLASS = "post-block__title__link"
+
+DEFAULT_HEADLINE_COUNT = int(os.getenv("NEWS_HEADLINE_COUNT", "3"))
+MAX_HEADLINE_COUNT = 20
+# Parsed headlines are reused for this long without touching the network
+NEWS_CACHE_TTL = float(os.getenv("NEWS_CACHE_TTL", "300"))
+NEWS_CACHE_DIR = os.getenv("NEWS_CACHE_DIR", "cache")
+
+# (connect, read) timeout in seconds so a hung site cannot stall the agent
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Only the headline anchors are turned into tree nodes; everything else is skipped
+HEADLINE_STRAINER = SoupStrainer("a", class_=HEADLINE_CLASS)
+
+def _html_parser() -> str:
+    """lxml when installed (several times faster), else the stdlib parser"""
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+HTML_PARSER = _html_parser()
+
+def parse_headlines(html: str, count: int) -> List[Tuple[str, str]]:
+    """(title, link) for the first `count` headlines on the page"""
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=HEADLINE_STRAINER)
+    return [(article.get_text(strip=True), article['href']) for article in soup.find_all("a", limit=count)]
+
+class ConditionalGetCache:
+    """
+    Disk cache for HTTP conditional GETs.
+
+    Stores each page with its ETag / Last-Modified validators and revalidates
+    with If-None-Match / If-Modified-Since, so an unchanged page costs a 304
+    with no body. Requests share one keep-alive session.
+    """
+
+    def __init__(self, cache_dir: str = NEWS_CACHE_DIR, session: Optional[requests.Session] = None):
+        self.cache_dir = cache_dir
+        self.session = session or requests.Session()
+        self.stats = {"fetched": 0, "not_modified": 0}
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, f"http_{hashlib.sha1(url.encode()).hexdigest()}.json")
+
+    def _load(self, url: str) -> Optional[Dict[str, str]]:
+        try:
+            with open(self._path(url), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, url: str, entry: Dict[str, str]):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{self._path(url)}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(temp_path, self._path(url))
+
+    def get(self, url: str) -> str:
+        """
+        Page body, from the disk cache if the server says it is unchanged.
+
+        Raises:
+            requests.RequestException: On network or HTTP errors
+        """
+        entry = self._load(url)
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304 and entry:
+            self.stats["not_modified"] += 1
+            return entry["body"]
+        response.raise_for_status()
+        self.stats["fetched"] += 1
+
+        if response.headers.get("ETag") or response.headers.get("Last-Modified"):
+            self._save(url, {
+                "etag": response.headers.get("ETag", ""),
+                "last_modified": response.headers.get("Last-Modified", ""),
+                "body": response.text
+            })
+        return response.text
+
+_http_cache = ConditionalGetCache()
+# Parsed headlines (as many as were last requested) with their expiry time
+_results: Dict[str, Tuple[float, List[Tuple[str, str]]]] = {}
+_results_lock = threading.Lock()
+# Serialises page fetches so concurrent misses share one request; cache hits never wait on it
+_fetch_lock = threading.Lock()
+
+def _cached_headlines(count: int) -> Tuple[Optional[List[Tuple[str, str]]], int]:
+    """(the first `count` cached headlines or None if stale or too few, number of headlines cached)"""
+    with _results_lock:
+        cached = _results.get(NEWS_URL)
+        if cached and cached[0] > time.monotonic() and len(cached[1]) >= count:
+            return cached[1][:count], len(cached[1])
+        return None, len(cached[1]) if cached else 0
+
+def get_headlines(count: int = DEFAULT_HEADLINE_COUNT) -> List[Tuple[str, str]]:
+    """(title, link) for the top `count` headlines, cached for NEWS_CACHE_TTL seconds"""
+    headlines, _ = _cached_headlines(count)
+    if headlines is not None:
+        return headlines
+    with _fetch_lock:
+        # Another caller may have refreshed the cache while this one waited
+        headlines, cached_count = _cached_headlines(count)
+        if headlines is not None:
+            return headlines
+        # Parse the largest count asked for so far, so smaller requests stay cache hits
+        headlines = parse_headlines(_http_cache.get(NEWS_URL), max(count, cached_count))
+        with _results_lock:
+            _results[NEWS_URL] = (time.monotonic() + NEWS_CACHE_TTL, headlines)
+        return headlines[:count]
+
+def fetch_news(count: int = DEFAULT_HEADLINE_COUNT) -> str:
+    """Scrape the top `count` latest tech headlines with links."""
     try:
-        response = requests.get("https://techcrunch.com")
-        soup = BeautifulSoup(response.text, 'html.parser')
-        articles = soup.select("a.post-block__title__link", limit=3)
         headlines = []
-        for i, article in enumerate(articles):
-            title = article.get_text(strip=True)
-            link = article['href']
+        for i, (title, link) in enumerate(get_headlines(count)):
             headlines.append(f"{i+1}. {title} → {link}")
         return "\n".join(headlines)
     except Exception as e:
         return f"Error fetching news: {e}"
 
-# Wrap fetch_news in a Tool object, ignoring the input string
+# Explicit counts only: "5", "top 5", "first 5", "5 headlines", "5 latest stories".
+# Other numbers in the input ("news about 2026 elections") are not counts.
+HEADLINE_COUNT_PATTERNS = [
+    re.compile(r"^\s*(\d+)\s*$"),
+    re.compile(r"\b(?:top|first|latest|last)\s+(\d{1,3})\b", re.IGNORECASE),
+    re.compile(r"\b(\d{1,3})\s+(?:\w+\s+)?(?:headlines?|stories|story|articles?|news)\b", re.IGNORECASE)
+]
+
+def _headline_count(text: str) -> int:
+    """A headline count asked for in the tool input ('5', 'top 5 headlines'), else the default"""
+    for pattern in HEADLINE_COUNT_PATTERNS:
+        match = pattern.search(text or "")
+        if match:
+            return max(1, min(MAX_HEADLINE_COUNT, int(match.group(1))))
+    return DEFAULT_HEADLINE_COUNT
+
+# Wrap fetch_news in a Tool object; the input may name how many headlines to return
 get_news = Tool(
     name="get_news",
-    func=lambda x: fetch_news(),
-    description="Scrape top 3 latest tech headlines with links."
+    func=lambda x: fetch_news(_headline_count(x)),
+    description=f"Scrape the latest tech headlines with links. Input: how many headlines to return (default {DEFAULT_HEADLINE_COUNT})."
 )
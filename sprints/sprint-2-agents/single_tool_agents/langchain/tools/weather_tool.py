@@ -1,20 +1,56 @@
-from langchain.tools import tool
+from langchain.tools import StructuredTool
 import os
-import requests
 
-@tool
-def get_weather(city: str) -> str:
-    """Get the current weather for a city."""
-    API_KEY = os.getenv("OPENWEATHER_API_KEY")
-    if not API_KEY:
-        return "OpenWeather API key is not set in environment variables."
+from shared.weather_client import get_weather_client, describe, is_found, WeatherRequestError
 
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={API_KEY}&units=metric"
+API_KEY_MISSING = "OpenWeather API key is not set in environment variables."
 
-    response = requests.get(url).json()
-    if response.get("cod") != 200:
+def _format_weather(city: str, response: dict) -> str:
+    if not is_found(response):
         return "Weather not found."
 
-    weather = response["weather"][0]["description"]
-    temp = response["main"]["temp"]
+    weather, temp = describe(response)
     return f"The weather in {city} is {weather} with a temperature of {temp}°C."
+
+def _get_weather(city: str) -> str:
+    """Get the current weather for a city."""
+    if not os.getenv("OPENWEATHER_API_KEY"):
+        return API_KEY_MISSING
+    try:
+        return _format_weather(city, get_weather_client().get_current(city))
+    except WeatherRequestError as e:
+        return f"Error fetching weather: {e}"
+
+async def _aget_weather(city: str) -> str:
+    """Get the current weather for a city."""
+    if not os.getenv("OPENWEATHER_API_KEY"):
+        return API_KEY_MISSING
+    try:
+        return _format_weather(city, await get_weather_client().aget_current(city))
+    except WeatherRequestError as e:
+        return f"Error fetching weather: {e}"
+
+def _get_weather_many(cities: str) -> str:
+    """Get the current weather for several cities at once; pass the city names separated by semicolons."""
+    if not os.getenv("OPENWEATHER_API_KEY"):
+        return API_KEY_MISSING
+    names = [city.strip() for city in cities.split(";") if city.strip()]
+    return "\n".join(
+        f"Error fetching weather for {city}: {result}" if isinstance(result, WeatherRequestError)
+        else _format_weather(city, result)
+        for city, result in zip(names, get_weather_client().get_many(names))
+    )
+
+# Sync runs reuse the shared requests session and async runs (ainvoke/abatch) the shared httpx pool
+get_weather = StructuredTool.from_function(
+    func=_get_weather,
+    coroutine=_aget_weather,
+    name="get_weather",
+    description="Get the current weather for a city."
+)
+
+get_weather_many = StructuredTool.from_function(
+    func=_get_weather_many,
+    name="get_weather_many",
+    description="Get the current weather for several cities at once; pass the city names separated by semicolons."
+)